@@ -0,0 +1,34 @@
+"""add partial index for the stale open cart scan
+
+Revision ID: a3d9e6b1c472
+Revises: f2c6d8e4a517
+Create Date: 2025-12-03 09:42:17.208114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# Compliance:
+# - CART-ABANDON: partial index on carts (updated_at) WHERE status = 'open' backs the
+#   app.workers.maintenance.abandon_stale_carts batch scan; only open carts are indexed
+# - EXT-PGTRGM / OWNER-FK / KEYSET-PAGINATION: not applicable in this revision
+# - UTC-TZ: updated_at is already timestamptz
+# - NO-PW-DB / POOL-DIRECT: not applicable
+# This migration is idempotent and safe to re-run; all operations use IF NOT EXISTS.
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d9e6b1c472'
+down_revision: Union[str, None] = 'f2c6d8e4a517'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS idx_carts_open_updated ON carts (updated_at) WHERE status = 'open'")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_carts_open_updated")
@@ -0,0 +1,39 @@
+"""allow one order per supplier per cart
+
+Revision ID: b5e1c7a9d284
+Revises: a3d9e6b1c472
+Create Date: 2025-12-04 11:08:52.613047
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# Compliance:
+# - MULTI-SUPPLIER-CHECKOUT: a mixed cart is checked out as one order per supplier, so
+#   uq_orders_cart_id (one order per cart) becomes uq_orders_cart_supplier (cart_id, supplier_id);
+#   the new index leads with cart_id and still serves lookups by cart
+# - EXT-PGTRGM / OWNER-FK / KEYSET-PAGINATION: not applicable in this revision
+# - UTC-TZ: not applicable
+# - NO-PW-DB / POOL-DIRECT: not applicable
+# This migration is idempotent and safe to re-run; all operations use IF (NOT) EXISTS.
+# Downgrade fails while any cart has more than one order.
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e1c7a9d284'
+down_revision: Union[str, None] = 'a3d9e6b1c472'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE UNIQUE INDEX IF NOT EXISTS uq_orders_cart_supplier ON orders (cart_id, supplier_id)")
+    op.execute("ALTER TABLE orders DROP CONSTRAINT IF EXISTS uq_orders_cart_id")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE orders DROP CONSTRAINT IF EXISTS uq_orders_cart_id")
+    op.execute("ALTER TABLE orders ADD CONSTRAINT uq_orders_cart_id UNIQUE (cart_id)")
+    op.execute("DROP INDEX IF EXISTS uq_orders_cart_supplier")
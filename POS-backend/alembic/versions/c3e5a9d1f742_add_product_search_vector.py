@@ -0,0 +1,47 @@
+"""add weighted tsvector and lower(sku) indexes for product search
+
+Revision ID: c3e5a9d1f742
+Revises: 4b1c2d8e7f30
+Create Date: 2025-11-10 09:41:27.530114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# Compliance:
+# - PRODUCT-SEARCH: generated tsvector (name weight A, sku weight B) + GIN index for word-prefix search,
+#   lower(sku) index for exact-SKU lookups; complements the existing trigram index (idx_products_search)
+# - EXT-PGTRGM / OWNER-FK / KEYSET-PAGINATION: not applicable in this revision
+# - UTC-TZ / NO-PW-DB / POOL-DIRECT: not applicable
+# This migration is idempotent and safe to re-run; all operations use IF NOT EXISTS.
+# Requires PostgreSQL 12+ (stored generated columns).
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e5a9d1f742'
+down_revision: Union[str, None] = '4b1c2d8e7f30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 'simple' config: no stemming or stop words, so SKUs and brand names index verbatim
+    op.execute(
+        """
+        ALTER TABLE products ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(sku, '')), 'B')
+        ) STORED
+        """
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS idx_products_search_vector ON products USING gin (search_vector)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_products_sku_lower ON products (lower(sku))")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_products_sku_lower")
+    op.execute("DROP INDEX IF EXISTS idx_products_search_vector")
+    op.execute("ALTER TABLE products DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,33 @@
+"""add (updated_at, id) index for incremental product export
+
+Revision ID: d7a2f4c8b913
+Revises: c3e5a9d1f742
+Create Date: 2025-11-17 14:05:52.402816
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# Compliance:
+# - PRODUCT-EXPORT: (updated_at, id) index backs /products/export?updated_since=... range scans in stream order
+# - EXT-PGTRGM / OWNER-FK / KEYSET-PAGINATION: not applicable in this revision
+# - UTC-TZ / NO-PW-DB / POOL-DIRECT: not applicable
+# This migration is idempotent and safe to re-run; all operations use IF NOT EXISTS.
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a2f4c8b913'
+down_revision: Union[str, None] = 'c3e5a9d1f742'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # updated_at >= :since ORDER BY updated_at, id reads this index forwards, no sort
+    op.execute("CREATE INDEX IF NOT EXISTS idx_products_updated_id ON products (updated_at, id)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_products_updated_id")
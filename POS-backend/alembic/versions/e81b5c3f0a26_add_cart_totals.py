@@ -0,0 +1,64 @@
+"""add denormalized subtotal/tax/line count to carts
+
+Revision ID: e81b5c3f0a26
+Revises: d7a2f4c8b913
+Create Date: 2025-11-24 11:32:08.915047
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# Compliance:
+# - CART-TOTALS: subtotal_cents / tax_cents / line_count kept current by cart item mutations;
+#   backfilled here with the same half-up rounding as app.domain.carts.totals.line_amounts
+# - EXT-PGTRGM / OWNER-FK / KEYSET-PAGINATION: not applicable in this revision
+# - UTC-TZ / NO-PW-DB / POOL-DIRECT: not applicable
+# This migration is idempotent and safe to re-run; all operations use IF NOT EXISTS.
+
+# revision identifiers, used by Alembic.
+revision: str = 'e81b5c3f0a26'
+down_revision: Union[str, None] = 'd7a2f4c8b913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE carts ADD COLUMN IF NOT EXISTS subtotal_cents bigint NOT NULL DEFAULT 0")
+    op.execute("ALTER TABLE carts ADD COLUMN IF NOT EXISTS tax_cents bigint NOT NULL DEFAULT 0")
+    op.execute("ALTER TABLE carts ADD COLUMN IF NOT EXISTS line_count integer NOT NULL DEFAULT 0")
+    op.execute(
+        """
+        DO $$ BEGIN
+            ALTER TABLE carts ADD CONSTRAINT ck_carts_line_count CHECK (line_count >= 0);
+        EXCEPTION WHEN duplicate_object THEN NULL;
+        END $$
+        """
+    )
+    # numeric round() is half away from zero, i.e. half up for these non-negative amounts
+    op.execute(
+        """
+        UPDATE carts SET subtotal_cents = lines.subtotal_cents,
+                         tax_cents = lines.tax_cents,
+                         line_count = lines.line_count
+        FROM (
+            SELECT cart_id,
+                   sum(round(unit_price_cents * qty)) AS subtotal_cents,
+                   sum(round(unit_price_cents * qty * tax_rate / 100)) AS tax_cents,
+                   count(*) AS line_count
+            FROM cart_items
+            WHERE deleted_at IS NULL
+            GROUP BY cart_id
+        ) AS lines
+        WHERE carts.id = lines.cart_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE carts DROP CONSTRAINT IF EXISTS ck_carts_line_count")
+    op.execute("ALTER TABLE carts DROP COLUMN IF EXISTS line_count")
+    op.execute("ALTER TABLE carts DROP COLUMN IF EXISTS tax_cents")
+    op.execute("ALTER TABLE carts DROP COLUMN IF EXISTS subtotal_cents")
@@ -0,0 +1,40 @@
+"""add fingerprint, stored response and expiry to idempotency_keys
+
+Revision ID: f2c6d8e4a517
+Revises: e81b5c3f0a26
+Create Date: 2025-12-01 16:20:43.771930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# Compliance:
+# - IDEMPOTENCY-STORE: columns for app.core.idempotency.PostgresIdempotencyStore (request fingerprint,
+#   replayable response, expiry); expires_at index backs expiry scans
+# - EXT-PGTRGM / OWNER-FK / KEYSET-PAGINATION: not applicable in this revision
+# - UTC-TZ: expires_at is timestamptz
+# - NO-PW-DB / POOL-DIRECT: not applicable
+# This migration is idempotent and safe to re-run; all operations use IF NOT EXISTS.
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c6d8e4a517'
+down_revision: Union[str, None] = 'e81b5c3f0a26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE idempotency_keys ADD COLUMN IF NOT EXISTS fingerprint varchar(64)")
+    op.execute("ALTER TABLE idempotency_keys ADD COLUMN IF NOT EXISTS response bytea")
+    op.execute("ALTER TABLE idempotency_keys ADD COLUMN IF NOT EXISTS expires_at timestamptz")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires ON idempotency_keys (expires_at)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_idempotency_keys_expires")
+    op.execute("ALTER TABLE idempotency_keys DROP COLUMN IF EXISTS expires_at")
+    op.execute("ALTER TABLE idempotency_keys DROP COLUMN IF EXISTS response")
+    op.execute("ALTER TABLE idempotency_keys DROP COLUMN IF EXISTS fingerprint")
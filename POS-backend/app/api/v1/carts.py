@@ -6,7 +6,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.security import require_role
-from app.domain.carts.schemas import CartCreate, CartItemCreate, CartItemResponse, CartItemUpdate, CartResponse
+from app.domain.carts.schemas import (
+    CartCreate,
+    CartItemCreate,
+    CartItemResponse,
+    CartItemsBatch,
+    CartItemsBatchResponse,
+    CartItemUpdate,
+    CartResponse,
+)
 from app.domain.carts.service import CartService
 
 
@@ -25,8 +33,7 @@ async def create_cart(
 ):
     cart = await service.create_cart(
         restaurant_id=data.restaurant_id,
-        current_account_id=current_user.get("account_id") or current_user.get("sub"),
-        current_role=current_user.get("role", ""),
+        authz=current_user["authz"],
     )
     return CartResponse.model_validate(cart)
 
@@ -39,8 +46,7 @@ async def get_cart(
 ):
     cart = await service.get_cart(
         cart_id=cart_id,
-        current_account_id=current_user.get("account_id") or current_user.get("sub"),
-        current_role=current_user.get("role", ""),
+        authz=current_user["authz"],
     )
     return CartResponse.model_validate(cart)
 
@@ -56,12 +62,33 @@ async def add_item(
         cart_id=cart_id,
         product_id=data.product_id,
         qty=data.qty,
-        current_account_id=current_user.get("account_id") or current_user.get("sub"),
-        current_role=current_user.get("role", ""),
+        authz=current_user["authz"],
     )
     return CartItemResponse.model_validate(item)
 
 
+@router.patch("/{cart_id}/items:batch", response_model=CartItemsBatchResponse)
+async def apply_item_batch(
+    cart_id: UUID,
+    data: CartItemsBatch,
+    service: CartService = Depends(get_cart_service),
+    current_user: dict = Depends(require_role("RESTAURANT", "ADMIN")),
+):
+    # A whole cart in one request and one transaction instead of a call per line
+    cart, items = await service.apply_item_batch(
+        cart_id=cart_id,
+        operations=data.operations,
+        authz=current_user["authz"],
+    )
+    return CartItemsBatchResponse(
+        cart_id=cart_id,
+        subtotal_cents=cart.subtotal_cents,
+        tax_cents=cart.tax_cents,
+        line_count=cart.line_count,
+        items=[CartItemResponse.model_validate(item) for item in items],
+    )
+
+
 @router.patch("/{cart_id}/items/{item_id}", response_model=CartItemResponse)
 async def update_item(
     cart_id: UUID,
@@ -74,8 +101,7 @@ async def update_item(
         cart_id=cart_id,
         item_id=item_id,
         data=data,
-        current_account_id=current_user.get("account_id") or current_user.get("sub"),
-        current_role=current_user.get("role", ""),
+        authz=current_user["authz"],
     )
     return CartItemResponse.model_validate(item)
 
@@ -90,8 +116,7 @@ async def delete_item(
     await service.delete_item(
         cart_id=cart_id,
         item_id=item_id,
-        current_account_id=current_user.get("account_id") or current_user.get("sub"),
-        current_role=current_user.get("role", ""),
+        authz=current_user["authz"],
     )
 
 
@@ -2,13 +2,32 @@
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Header, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.conditional import (
+    has_if_none_match,
+    has_validators,
+    is_not_modified,
+    make_etag,
+    not_modified,
+    validator_headers,
+)
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.events import dispatch_order_placed
+from app.core.idempotency import IdempotencyGuard, idempotent
+from app.core.responses import ModelJSONResponse
 from app.core.security import require_role
-from app.domain.orders.schemas import InvoiceResponse, OrderCreate, OrderListResponse, OrderResponse, ReceiptResponse
+from app.domain.orders.schemas import (
+    CheckoutCreate,
+    CheckoutResponse,
+    InvoiceResponse,
+    OrderCreate,
+    OrderListResponse,
+    OrderResponse,
+    ReceiptResponse,
+)
 from app.domain.orders.service import OrderService
 
 
@@ -25,55 +44,116 @@ async def create_order(
     idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
     service: OrderService = Depends(get_order_service),
     current_user: dict = Depends(require_role("RESTAURANT", "ADMIN")),
+    idempotency: IdempotencyGuard = Depends(idempotent("orders.create", required=True)),
 ):
+    # Retries are answered from the idempotency store; the order transaction keeps its own key check
     order = await service.create_order(
         data=data,
         idempotency_key=idempotency_key or "",
-        current_account_id=current_user.get("account_id") or current_user.get("sub"),
-        current_role=current_user.get("role", ""),
+        authz=current_user["authz"],
+    )
+    return await idempotency.save(
+        ModelJSONResponse(OrderResponse.model_validate(order), status_code=status.HTTP_201_CREATED)
     )
-    return OrderResponse.model_validate(order)
+
+
+@router.post("/checkout", response_model=CheckoutResponse, status_code=status.HTTP_201_CREATED)
+async def checkout(
+    data: CheckoutCreate,
+    background_tasks: BackgroundTasks,
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
+    service: OrderService = Depends(get_order_service),
+    current_user: dict = Depends(require_role("RESTAURANT", "ADMIN")),
+    idempotency: IdempotencyGuard = Depends(idempotent("orders.checkout", required=True)),
+):
+    """Check out a cart with products from several suppliers as one order per supplier."""
+    orders, placed = await service.checkout(
+        data=data,
+        idempotency_key=idempotency_key or "",
+        authz=current_user["authz"],
+    )
+    if placed:
+        # One OrderPlaced event per supplier order, sent after the transaction has committed
+        for order in orders:
+            background_tasks.add_task(dispatch_order_placed, str(order.id))
+    return await idempotency.save(ModelJSONResponse(
+        CheckoutResponse(
+            cart_id=data.cart_id,
+            orders=[OrderResponse.model_validate(order) for order in orders],
+            total_cents=sum(order.total_cents for order in orders),
+            tax_cents=sum(order.tax_cents for order in orders),
+        ),
+        status_code=status.HTTP_201_CREATED,
+    ))
 
 
 @router.get("", response_model=OrderListResponse)
 async def list_orders(
+    request: Request,
     limit: int = Query(default=settings.PAGE_LIMIT_DEFAULT, ge=1, le=settings.MAX_PAGE_LIMIT),
     offset: int = Query(default=0, ge=0),
     restaurant_id: Optional[UUID] = Query(None),
     supplier_id: Optional[UUID] = Query(None),
     status: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    include_total: bool = Query(True, description="Compute the exact total count"),
     service: OrderService = Depends(get_order_service),
     current_user: dict = Depends(require_role("ADMIN", "SUPPLIER", "RESTAURANT")),
 ):
-    orders, total = await service.list_orders(
+    authz = current_user["authz"]
+    # The version aggregate scans the caller's whole visible set: run it only to answer
+    # If-None-Match (a match skips the page query) or when the total is wanted anyway, as its
+    # count is the total. The listing depends on who is asking, so the caller is part of the ETag.
+    count, etag = None, None
+    if include_total or has_if_none_match(request):
+        count, last_updated = await service.list_orders_version(
+            restaurant_id=restaurant_id, supplier_id=supplier_id, status=status, authz=authz
+        )
+        etag = make_etag(request.url.path, request.url.query, authz.user_id, count, last_updated)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+
+    orders, _, next_cursor = await service.list_orders(
         limit=limit,
         offset=offset,
         restaurant_id=restaurant_id,
         supplier_id=supplier_id,
         status=status,
-        current_user_id=current_user.get("account_id") or current_user.get("sub"),
-        current_role=current_user.get("role", ""),
+        authz=authz,
+        cursor=cursor,
+        include_total=False,
     )
-    return OrderListResponse(
+    return ModelJSONResponse(OrderListResponse(
         data=[OrderResponse.model_validate(o) for o in orders],
-        total=total,
+        total=count if include_total else None,
         limit=limit,
         offset=offset,
-    )
+        next_cursor=next_cursor,
+    ), headers=validator_headers(etag) if etag else None)
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
 async def get_order(
     order_id: UUID,
+    request: Request,
     service: OrderService = Depends(get_order_service),
     current_user: dict = Depends(require_role("ADMIN", "SUPPLIER", "RESTAURANT")),
 ):
+    if has_validators(request):
+        # Authorized version lookup; a match answers 304 without loading the order
+        updated_at = await service.get_order_version(order_id=order_id, authz=current_user["authz"])
+        etag = make_etag("order", order_id, updated_at)
+        if is_not_modified(request, etag, updated_at):
+            return not_modified(etag, updated_at)
+
     order = await service.get_order(
         order_id=order_id,
-        current_user_id=current_user.get("account_id") or current_user.get("sub"),
-        current_role=current_user.get("role", ""),
+        authz=current_user["authz"],
+    )
+    return ModelJSONResponse(
+        OrderResponse.model_validate(order),
+        headers=validator_headers(make_etag("order", order_id, order.updated_at), order.updated_at),
     )
-    return OrderResponse.model_validate(order)
 
 
 @router.post("/{order_id}/confirm", response_model=OrderResponse)
@@ -84,8 +164,7 @@ async def confirm_order(
 ):
     order = await service.confirm_order(
         order_id=order_id,
-        current_user_id=current_user.get("account_id") or current_user.get("sub"),
-        current_role=current_user.get("role", ""),
+        authz=current_user["authz"],
     )
     return OrderResponse.model_validate(order)
 
@@ -98,8 +177,7 @@ async def deliver_order(
 ):
     order = await service.deliver_order(
         order_id=order_id,
-        current_user_id=current_user.get("account_id") or current_user.get("sub"),
-        current_role=current_user.get("role", ""),
+        authz=current_user["authz"],
     )
     return OrderResponse.model_validate(order)
 
@@ -112,8 +190,7 @@ async def get_receipt(
 ):
     data = await service.get_receipt_json(
         order_id=order_id,
-        current_user_id=current_user.get("account_id") or current_user.get("sub"),
-        current_role=current_user.get("role", ""),
+        authz=current_user["authz"],
     )
     return data
 
@@ -126,8 +203,7 @@ async def get_invoice(
 ):
     data = await service.get_invoice_json(
         order_id=order_id,
-        current_user_id=current_user.get("account_id") or current_user.get("sub"),
-        current_role=current_user.get("role", ""),
+        authz=current_user["authz"],
     )
     return data
 
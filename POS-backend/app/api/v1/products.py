@@ -1,17 +1,33 @@
-"""Product API endpoints with trigram search and ownership guards."""
-from typing import Optional
+"""Product API endpoints with ranked search and ownership guards."""
+from datetime import datetime
+from typing import Literal, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.conditional import (
+    as_utc,
+    has_if_none_match,
+    has_validators,
+    is_not_modified,
+    make_etag,
+    not_modified,
+    validator_headers,
+)
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.responses import ORJSONResponse
 from app.core.security import get_current_user, require_role
+from app.domain.products.export import EXPORT_FORMATS
 from app.domain.products.schemas import (
     ProductCreate,
+    ProductBulkResponse,
     ProductListResponse,
     ProductResponse,
+    ProductSearchResponse,
+    ProductSuggestResponse,
     ProductUpdate,
 )
 from app.domain.products.service import ProductService
@@ -24,8 +40,13 @@ def get_product_service(db: AsyncSession = Depends(get_db)) -> ProductService:
     return ProductService(db)
 
 
+def get_product_read_service(db: AsyncSession = Depends(get_read_db)) -> ProductService:
+    return ProductService(db)
+
+
 @router.get("", response_model=ProductListResponse)
 async def list_products(
+    request: Request,
     limit: int = Query(
         default=settings.PAGE_LIMIT_DEFAULT,
         ge=1,
@@ -35,17 +56,102 @@ async def list_products(
     offset: int = Query(default=0, ge=0, description="Number of items to skip"),
     supplier_id: Optional[UUID] = Query(None, description="Filter by supplier ID"),
     active: Optional[bool] = Query(None, description="Filter by active status"),
-    q: Optional[str] = Query(None, description="Trigram search on name and SKU"),
-    service: ProductService = Depends(get_product_service),
+    q: Optional[str] = Query(None, description="Search on name and SKU (word prefix or trigram)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    include_total: bool = Query(True, description="Compute the exact total count"),
+    service: ProductService = Depends(get_product_read_service),
 ):
-    products, total = await service.list_products(
-        limit=limit, offset=offset, supplier_id=supplier_id, active=active, q=q
-    )
-    return ProductListResponse(
-        data=[ProductResponse.model_validate(p) for p in products],
-        total=total,
+    # The version aggregate scans the whole filtered set: run it only to answer If-None-Match
+    # (a match skips the page query) or when the total is wanted anyway, as its count is the total
+    count, etag = None, None
+    if include_total or has_if_none_match(request):
+        count, last_updated = await service.list_products_version(supplier_id=supplier_id, active=active, q=q)
+        etag = make_etag(request.url.path, request.url.query, count, last_updated)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+
+    # Rows are already response-shaped; skip ORM objects and response_model validation
+    products, _, next_cursor = await service.list_product_rows(
         limit=limit,
         offset=offset,
+        supplier_id=supplier_id,
+        active=active,
+        q=q,
+        cursor=cursor,
+        include_total=False,
+    )
+    return ORJSONResponse({
+        "data": products,
+        "total": count if include_total else None,
+        "limit": limit,
+        "offset": offset,
+        "next_cursor": next_cursor,
+    }, headers=validator_headers(etag) if etag else None)
+
+
+@router.get("/search", response_model=ProductSearchResponse)
+async def search_products(
+    q: str = Query(..., min_length=1, max_length=255, description="Words (prefix matched), a SKU, or a misspelling"),
+    limit: int = Query(
+        default=settings.SEARCH_LIMIT_DEFAULT,
+        ge=1,
+        le=settings.SEARCH_MAX_LIMIT,
+        description="Number of top-ranked results",
+    ),
+    supplier_id: Optional[UUID] = Query(None, description="Filter by supplier ID"),
+    active: Optional[bool] = Query(None, description="Filter by active status"),
+    service: ProductService = Depends(get_product_read_service),
+):
+    # Exact SKU first, then word-prefix / trigram matches by rank; capped, no count
+    hits = await service.search_products(q=q, limit=limit, supplier_id=supplier_id, active=active)
+    return ORJSONResponse({"data": hits, "q": q, "limit": limit})
+
+
+@router.get("/suggest", response_model=ProductSuggestResponse)
+async def suggest_products(
+    q: str = Query(..., min_length=1, max_length=100, description="Typed prefix of name words or SKU"),
+    limit: int = Query(
+        default=settings.SUGGEST_LIMIT_DEFAULT,
+        ge=1,
+        le=settings.SUGGEST_MAX_LIMIT,
+        description="Number of suggestions",
+    ),
+    supplier_id: Optional[UUID] = Query(None, description="Filter by supplier ID"),
+    service: ProductService = Depends(get_product_read_service),
+):
+    # Served from the in-process prefix index; meant to be called per keystroke
+    suggestions = await service.suggest_products(q=q, limit=limit, supplier_id=supplier_id)
+    return ORJSONResponse({"data": suggestions, "q": q, "limit": limit})
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Every matching product, one per line (CSV: after a header row)",
+            "content": {media_type: {} for media_type, _ in EXPORT_FORMATS.values()},
+        }
+    },
+)
+async def export_products(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="ndjson (one ProductResponse per line) or csv"),
+    supplier_id: Optional[UUID] = Query(None, description="Filter by supplier ID"),
+    active: Optional[bool] = Query(None, description="Filter by active status"),
+    updated_since: Optional[datetime] = Query(
+        None,
+        description="Only products with updated_at >= this instant; pass the last exported updated_at to sync",
+    ),
+    service: ProductService = Depends(get_product_read_service),
+    current_user: dict = Depends(require_role("ADMIN", "SUPPLIER")),
+):
+    # Streamed from a server-side cursor in (updated_at, id) order; the session dependency
+    # is closed only after the response body has been sent
+    media_type, extension = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        service.export_products(fmt=format, supplier_id=supplier_id, active=active, updated_since=updated_since),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="products.{extension}"'},
     )
 
 
@@ -57,19 +163,57 @@ async def create_product(
 ):
     created = await service.create_product(
         data=data,
-        current_account_id=current_user.get("account_id") or current_user.get("sub"),
-        current_role=current_user.get("role", ""),
+        authz=current_user["authz"],
     )
     return ProductResponse.model_validate(created)
 
 
+@router.post(
+    "/bulk",
+    response_model=ProductBulkResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-ndjson": {"schema": {"type": "string", "description": "One ProductCreate per line"}},
+                "text/csv": {"schema": {"type": "string", "description": "Header row of ProductCreate fields"}},
+            },
+        }
+    },
+)
+async def bulk_upsert_products(
+    request: Request,
+    supplier_id: Optional[UUID] = Query(None, description="Supplier for rows that omit supplier_id"),
+    service: ProductService = Depends(get_product_service),
+    current_user: dict = Depends(require_role("ADMIN", "SUPPLIER")),
+):
+    # The body is parsed as it streams in; rows are upserted by SKU in chunks
+    report = await service.bulk_upsert_products(
+        chunks=request.stream(),
+        content_type=request.headers.get("content-type", ""),
+        authz=current_user["authz"],
+        supplier_id=supplier_id,
+    )
+    return ORJSONResponse(report)
+
+
 @router.get("/{product_id}", response_model=ProductResponse)
 async def get_product(
     product_id: UUID,
-    service: ProductService = Depends(get_product_service),
+    request: Request,
+    service: ProductService = Depends(get_product_read_service),
 ):
-    product = await service.get_product(product_id)
-    return ProductResponse.model_validate(product)
+    if has_validators(request):
+        updated_at = await service.get_product_version(product_id)
+        etag = make_etag("product", product_id, updated_at)
+        if is_not_modified(request, etag, updated_at):
+            return not_modified(etag, updated_at)
+
+    product = await service.get_product_data(product_id)
+    updated_at = as_utc(product["updated_at"])
+    return ORJSONResponse(
+        product, headers=validator_headers(make_etag("product", product_id, updated_at), updated_at)
+    )
 
 
 @router.patch("/{product_id}", response_model=ProductResponse)
@@ -82,8 +226,7 @@ async def update_product(
     updated = await service.update_product(
         product_id=product_id,
         data=data,
-        current_account_id=current_user.get("account_id") or current_user.get("sub"),
-        current_role=current_user.get("role", ""),
+        authz=current_user["authz"],
     )
     return ProductResponse.model_validate(updated)
 
@@ -96,8 +239,7 @@ async def delete_product(
 ):
     await service.delete_product(
         product_id=product_id,
-        current_account_id=current_user.get("account_id") or current_user.get("sub"),
-        current_role=current_user.get("role", ""),
+        authz=current_user["authz"],
     )
 
 
@@ -2,11 +2,20 @@
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.conditional import (
+    has_if_none_match,
+    has_validators,
+    is_not_modified,
+    make_etag,
+    not_modified,
+    validator_headers,
+)
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.responses import ModelJSONResponse, ORJSONResponse
 from app.core.security import require_role
 from app.domain.restaurants.schemas import (
     RestaurantCreate,
@@ -25,6 +34,11 @@ def get_restaurant_service(db: AsyncSession = Depends(get_db)) -> RestaurantServ
     return RestaurantService(db)
 
 
+def get_restaurant_read_service(db: AsyncSession = Depends(get_read_db)) -> RestaurantService:
+    """Dependency to get restaurant service on the read replica (GET endpoints)."""
+    return RestaurantService(db)
+
+
 @router.post("", response_model=RestaurantResponse, status_code=status.HTTP_201_CREATED)
 async def create_restaurant(
     data: RestaurantCreate,
@@ -40,6 +54,7 @@ async def create_restaurant(
 
 @router.get("", response_model=RestaurantListResponse)
 async def list_restaurants(
+    request: Request,
     limit: int = Query(
         default=settings.PAGE_LIMIT_DEFAULT,
         ge=1,
@@ -49,28 +64,51 @@ async def list_restaurants(
     offset: int = Query(default=0, ge=0, description="Number of items to skip"),
     active: Optional[bool] = Query(None, description="Filter by active status"),
     city: Optional[str] = Query(None, description="Filter by exact city"),
-    service: RestaurantService = Depends(get_restaurant_service),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    include_total: bool = Query(True, description="Compute the exact total count"),
+    service: RestaurantService = Depends(get_restaurant_read_service),
 ):
-    """List restaurants with pagination and optional filters."""
-    restaurants, total = await service.list_restaurants(
-        limit=limit, offset=offset, active=active, city=city
-    )
-    return RestaurantListResponse(
-        data=[RestaurantResponse.model_validate(r) for r in restaurants],
-        total=total,
-        limit=limit,
-        offset=offset,
+    """List restaurants with offset or cursor pagination and optional filters."""
+    # The version aggregate scans the whole filtered set: run it only to answer If-None-Match
+    # (a match skips the page query) or when the total is wanted anyway, as its count is the total
+    count, etag = None, None
+    if include_total or has_if_none_match(request):
+        count, last_updated = await service.list_restaurants_version(active=active, city=city)
+        etag = make_etag(request.url.path, request.url.query, count, last_updated)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+
+    # Rows are already response-shaped; skip ORM objects and response_model validation
+    restaurants, _, next_cursor = await service.list_restaurant_rows(
+        limit=limit, offset=offset, active=active, city=city, cursor=cursor, include_total=False
     )
+    return ORJSONResponse({
+        "data": restaurants,
+        "total": count if include_total else None,
+        "limit": limit,
+        "offset": offset,
+        "next_cursor": next_cursor,
+    }, headers=validator_headers(etag) if etag else None)
 
 
 @router.get("/{restaurant_id}", response_model=RestaurantResponse)
 async def get_restaurant(
     restaurant_id: UUID,
-    service: RestaurantService = Depends(get_restaurant_service),
+    request: Request,
+    service: RestaurantService = Depends(get_restaurant_read_service),
 ):
-    """Get a restaurant by ID."""
+    """Get a restaurant by ID; conditional requests get a 304 from a version lookup."""
+    if has_validators(request):
+        updated_at = await service.get_restaurant_version(restaurant_id)
+        etag = make_etag("restaurant", restaurant_id, updated_at)
+        if is_not_modified(request, etag, updated_at):
+            return not_modified(etag, updated_at)
+
     restaurant = await service.get_restaurant(restaurant_id)
-    return RestaurantResponse.model_validate(restaurant)
+    return ModelJSONResponse(
+        RestaurantResponse.model_validate(restaurant),
+        headers=validator_headers(make_etag("restaurant", restaurant_id, restaurant.updated_at), restaurant.updated_at),
+    )
 
 
 @router.patch("/{restaurant_id}", response_model=RestaurantResponse)
@@ -2,11 +2,20 @@
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.conditional import (
+    has_if_none_match,
+    has_validators,
+    is_not_modified,
+    make_etag,
+    not_modified,
+    validator_headers,
+)
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.responses import ModelJSONResponse, ORJSONResponse
 from app.core.security import require_role
 from app.domain.suppliers.service import SupplierService
 from app.domain.suppliers.schemas import (
@@ -24,6 +33,11 @@ def get_supplier_service(db: AsyncSession = Depends(get_db)) -> SupplierService:
     return SupplierService(db)
 
 
+def get_supplier_read_service(db: AsyncSession = Depends(get_read_db)) -> SupplierService:
+    """Dependency to get supplier service on the read replica (GET endpoints)."""
+    return SupplierService(db)
+
+
 @router.post("", response_model=SupplierResponse, status_code=status.HTTP_201_CREATED)
 async def create_supplier(
     data: SupplierCreate,
@@ -47,6 +61,7 @@ async def create_supplier(
 
 @router.get("", response_model=SupplierListResponse)
 async def list_suppliers(
+    request: Request,
     limit: int = Query(
         default=settings.PAGE_LIMIT_DEFAULT,
         ge=1,
@@ -55,40 +70,62 @@ async def list_suppliers(
     ),
     offset: int = Query(default=0, ge=0, description="Number of items to skip"),
     active: Optional[bool] = Query(None, description="Filter by active status"),
-    service: SupplierService = Depends(get_supplier_service),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    include_total: bool = Query(True, description="Compute the exact total count"),
+    service: SupplierService = Depends(get_supplier_read_service),
 ):
     """
     List all suppliers with pagination.
     
     Args:
         limit: Number of items per page
-        offset: Number of items to skip
+        offset: Number of items to skip (ignored when cursor is given)
         active: Filter by active status
+        cursor: Opaque keyset cursor returned as next_cursor by the previous page
+        include_total: Whether to run the count query
         service: Supplier service
     
     Returns:
         Paginated list of suppliers
     """
-    suppliers, total = await service.list_suppliers(limit=limit, offset=offset, active=active)
+    # The version aggregate scans the whole filtered set: run it only to answer If-None-Match
+    # (a match skips the page query) or when the total is wanted anyway, as its count is the total
+    count, etag = None, None
+    if include_total or has_if_none_match(request):
+        count, last_updated = await service.list_suppliers_version(active=active)
+        etag = make_etag(request.url.path, request.url.query, count, last_updated)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
     
-    return SupplierListResponse(
-        data=[SupplierResponse.model_validate(s) for s in suppliers],
-        total=total,
-        limit=limit,
-        offset=offset,
+    # Rows are already response-shaped; skip ORM objects and response_model validation
+    suppliers, _, next_cursor = await service.list_supplier_rows(
+        limit=limit, offset=offset, active=active, cursor=cursor, include_total=False
     )
+    
+    return ORJSONResponse({
+        "data": suppliers,
+        "total": count if include_total else None,
+        "limit": limit,
+        "offset": offset,
+        "next_cursor": next_cursor,
+    }, headers=validator_headers(etag) if etag else None)
 
 
 @router.get("/{supplier_id}", response_model=SupplierResponse)
 async def get_supplier(
     supplier_id: UUID,
-    service: SupplierService = Depends(get_supplier_service),
+    request: Request,
+    service: SupplierService = Depends(get_supplier_read_service),
 ):
     """
     Get supplier by ID.
     
+    Conditional requests (If-None-Match / If-Modified-Since) are answered
+    with 304 from a version lookup, without loading the supplier.
+    
     Args:
         supplier_id: Supplier UUID
+        request: Incoming request (validators)
         service: Supplier service
     
     Returns:
@@ -97,8 +134,17 @@ async def get_supplier(
     Raises:
         404: If supplier not found
     """
+    if has_validators(request):
+        updated_at = await service.get_supplier_version(supplier_id)
+        etag = make_etag("supplier", supplier_id, updated_at)
+        if is_not_modified(request, etag, updated_at):
+            return not_modified(etag, updated_at)
+    
     supplier = await service.get_supplier(supplier_id)
-    return SupplierResponse.model_validate(supplier)
+    return ModelJSONResponse(
+        SupplierResponse.model_validate(supplier),
+        headers=validator_headers(make_etag("supplier", supplier_id, supplier.updated_at), supplier.updated_at),
+    )
 
 
 @router.patch("/{supplier_id}", response_model=SupplierResponse)
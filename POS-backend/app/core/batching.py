@@ -0,0 +1,25 @@
+"""Bounded-batch helpers for maintenance DELETE/UPDATE statements."""
+from typing import Any
+
+from sqlalchemy import ColumnElement, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def batch_of(session: AsyncSession, model: Any, *criteria: ColumnElement[bool], limit: int) -> ColumnElement[bool]:
+    """
+    WHERE clause selecting at most `limit` rows of `model` matching `criteria`.
+
+    On PostgreSQL this is `ctid IN (SELECT ctid ... LIMIT n FOR UPDATE SKIP
+    LOCKED)`: rows are addressed by physical location (TID scan, no primary
+    key index lookups), and rows locked by a concurrent transaction are
+    skipped rather than waited on. Other dialects fall back to the primary key.
+
+    Usage:
+        delete(Model).where(batch_of(session, Model, Model.expires_at < now, limit=1000))
+    """
+    if session.bind.dialect.name == "postgresql":
+        ctid = literal_column("ctid")
+        victims = select(ctid).select_from(model).where(*criteria).limit(limit).with_for_update(skip_locked=True)
+        return ctid.in_(victims.scalar_subquery())
+    victims = select(model.id).where(*criteria).limit(limit)
+    return model.id.in_(victims.scalar_subquery())
@@ -0,0 +1,140 @@
+"""Bounded in-process caches with TTL expiry and LRU eviction, and shared cache backends."""
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Size-bounded mapping whose entries expire after a TTL.
+
+    The least recently used entry is evicted once max_entries is reached.
+    Intended for use from a single event loop; it does no locking.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a live entry (marking it recently used) or default."""
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return default
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store a value; ttl_seconds overrides the cache-wide TTL for this entry."""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry if present."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class MemoryCacheBackend:
+    """
+    Async key/value backend kept in process memory (TTLCache).
+
+    Used when REDIS_URL is not configured. Entries and counters are local to
+    the process, so invalidation does not reach other workers.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._entries = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._counters: dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._entries.set(key, value, ttl_seconds=ttl_seconds)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    async def incr_many(self, keys: list[str]) -> None:
+        for key in keys:
+            self._counters[key] = self._counters.get(key, 0) + 1
+
+    async def get_counters(self, keys: list[str]) -> list[int]:
+        return [self._counters.get(key, 0) for key in keys]
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisCacheBackend:
+    """
+    Async key/value backend on Redis, shared by all workers.
+
+    Redis errors are logged and treated as cache misses so an unavailable
+    cache degrades to uncached reads instead of failing requests.
+    """
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url)
+        self._errors = (redis.RedisError, OSError)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            return await self._redis.get(key)
+        except self._errors:
+            logger.warning("Redis cache get failed", exc_info=True)
+            return None
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        try:
+            await self._redis.set(key, value, px=max(1, int(ttl_seconds * 1000)))
+        except self._errors:
+            logger.warning("Redis cache set failed", exc_info=True)
+
+    async def incr(self, key: str) -> int:
+        # Not swallowed: a failed invalidation must not go unnoticed
+        return await self._redis.incr(key)
+
+    async def incr_many(self, keys: list[str]) -> None:
+        """Increment several counters in one round trip (not swallowed, like incr)."""
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.incr(key)
+            await pipe.execute()
+
+    async def get_counters(self, keys: list[str]) -> Optional[list[int]]:
+        """Return the counter values (MGET), or None when Redis cannot be reached."""
+        try:
+            values = await self._redis.mget(keys)
+        except self._errors:
+            logger.warning("Redis cache get failed", exc_info=True)
+            return None
+        return [int(value) if value is not None else 0 for value in values]
+
+    async def close(self) -> None:
+        await self._redis.aclose()
@@ -0,0 +1,82 @@
+"""HTTP conditional GET helpers: ETag / Last-Modified validators and 304 responses."""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional, Union
+
+from fastapi import Request, Response
+
+
+def as_utc(value: Union[datetime, str]) -> datetime:
+    """
+    Normalize an updated_at value to an aware UTC datetime.
+
+    Cached payloads carry ISO strings, database rows carry datetimes; naive
+    values (SQLite) are taken as UTC.
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a weak ETag from version parts (resource kind, id, updated_at, count...).
+
+    Weak because the same version may be rendered by different serializers.
+    """
+    raw = "|".join(
+        as_utc(part).isoformat() if isinstance(part, datetime) else ("" if part is None else str(part))
+        for part in parts
+    )
+    return f'W/"{hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]}"'
+
+
+def has_validators(request: Request) -> bool:
+    """Whether the request is conditional (worth a version query before the full read)."""
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def has_if_none_match(request: Request) -> bool:
+    """Whether the request carries If-None-Match, the only validator list ETags are checked against."""
+    return "if-none-match" in request.headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    Evaluate If-None-Match (weak comparison) and, only when it is absent,
+    If-Modified-Since against the current validators.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        opaque = etag.removeprefix("W/")
+        return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP dates have second precision
+        return as_utc(last_modified).replace(microsecond=0) <= since
+    return False
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> dict[str, str]:
+    """ETag and (when known) Last-Modified response headers."""
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(as_utc(last_modified), usegmt=True)
+    return headers
+
+
+def not_modified(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    """Empty 304 response carrying the current validators."""
+    return Response(status_code=304, headers=validator_headers(etag, last_modified))
@@ -15,6 +15,22 @@ class Settings(BaseSettings):
     # ALEMBIC_DATABASE_URL: Preferred direct connection for Alembic (takes precedence over DATABASE_URL_DIRECT)
     ALEMBIC_DATABASE_URL: str | None = None
     
+    # DATABASE_URL_READ: optional read replica used by GET endpoints that opt into get_read_db
+    DATABASE_URL_READ: str | None = None
+    
+    # Connection pool
+    # DB_POOL_MODE: "pgbouncer" (no local pool, prepared statement caches off) or "direct" (sized local pool)
+    DB_POOL_MODE: str = "direct"
+    DB_POOL_SIZE: int = 5  # Persistent connections kept in direct mode
+    DB_MAX_OVERFLOW: int = 10  # Extra connections allowed during bursts in direct mode
+    DB_POOL_TIMEOUT_SECONDS: float = 10  # Max wait for a free connection in direct mode
+    DB_POOL_RECYCLE_SECONDS: int = 300  # Replace connections older than this (time-based liveness)
+    DB_POOL_PRE_PING: bool = False  # Ping on every checkout; only needed if recycling is not enough
+    DB_READ_POOL_SIZE: int = 10  # Persistent replica connections in direct mode
+    DB_READ_MAX_OVERFLOW: int = 20  # Extra replica connections allowed during bursts in direct mode
+    READ_YOUR_WRITES_SECONDS: float = 5  # Reads stay on the primary this long after a client's write
+    READ_YOUR_WRITES_MAX_CLIENTS: int = 10000  # LRU bound for pinned clients without REDIS_URL (pins are per process)
+    
     # Development
     DEV_MODE: bool = False
     DEV_DATABASE_URL: str | None = None
@@ -24,16 +40,68 @@ class Settings(BaseSettings):
     APP_SECRET: str | None = None  # Secret key for local JWT signing (HS256)
     DEV_USERS: str = ""  # Comma-separated list of "email:$2b$hash" pairs for local auth
     CLERK_API_KEY: str | None = None  # Clerk API key (only needed when AUTH_PROVIDER=clerk)
+    AUTH_USER_CACHE_TTL_SECONDS: int = 60  # How long an email -> (user_id, role) lookup is reused
+    AUTH_USER_CACHE_MAX_ENTRIES: int = 10000  # LRU bound for the user lookup cache (0 disables it)
+    AUTH_TOKEN_CACHE_MAX_ENTRIES: int = 10000  # LRU bound for verified JWT claims, cached until exp (0 disables it)
+    CLERK_JWKS_URL: str = "https://api.clerk.com/v1/jwks"  # Clerk Backend API JWKS endpoint
+    CLERK_JWKS_REFRESH_SECONDS: int = 300  # Background refresh interval for Clerk signing keys
+    CLERK_ISSUER: str | None = None  # Expected "iss" of Clerk session tokens (the Frontend API URL); required for clerk
+    CLERK_AUTHORIZED_PARTIES: str = ""  # Comma-separated origins accepted in the "azp" claim (empty skips the check)
     
     # Pagination
     PAGE_LIMIT_DEFAULT: int = 50
     MAX_PAGE_LIMIT: int = 100
     
+    # Product search
+    SEARCH_LIMIT_DEFAULT: int = 20
+    SEARCH_MAX_LIMIT: int = 50  # Cap on top-K results for /products/search
+    SUGGEST_INDEX_ENABLED: bool = True  # Build the in-process autocomplete index at startup
+    SUGGEST_INDEX_REFRESH_SECONDS: int = 300  # Full rebuild interval (picks up writes from other processes)
+    SUGGEST_MAX_SCAN: int = 2000  # Index entries examined per /products/suggest call
+    SUGGEST_LIMIT_DEFAULT: int = 10
+    SUGGEST_MAX_LIMIT: int = 20
+    
+    # Bulk product import (POST /products/bulk)
+    BULK_IMPORT_BATCH_SIZE: int = 1000  # Rows per INSERT ... ON CONFLICT statement (and commit)
+    BULK_IMPORT_MAX_ROWS: int = 200000  # Rows accepted per request
+    BULK_IMPORT_MAX_ERRORS: int = 1000  # Row errors listed in the report (all are counted)
+    
+    # Cart item batches (PATCH /carts/{cart_id}/items:batch)
+    CART_BATCH_MAX_OPERATIONS: int = 200
+    
+    # Catalog export (GET /products/export)
+    EXPORT_BATCH_SIZE: int = 1000  # Rows fetched per server-side cursor round trip (and per response chunk)
+    
+    # Metrics
+    METRICS_MAX_ENDPOINT_LABELS: int = 200  # Distinct endpoint label values before new ones collapse into "other"
+    
+    # Access logging
+    ACCESS_LOG_SAMPLE_RATE_2XX: float = 1.0  # Fraction of 2xx requests logged (4xx/5xx are always logged)
+    ACCESS_LOG_QUEUE_SIZE: int = 10000  # Records buffered for the log writer thread before new ones are dropped
+    ACCESS_LOG_BATCH_SIZE: int = 256  # Max records written per flush
+    
     # CORS
     CORS_ORIGINS: str = "*"
     
     # Celery/Redis
-    REDIS_URL: str | None = None  # Redis URL for Celery broker and result backend
+    REDIS_URL: str | None = None  # Redis URL for Celery broker and result backend, and shared caches
+    
+    # Product catalog cache (Redis when REDIS_URL is set, otherwise in-process)
+    CATALOG_CACHE_TTL_SECONDS: int = 30  # Lifetime of cached listings and products (0 disables the cache)
+    CATALOG_CACHE_MAX_ENTRIES: int = 5000  # LRU bound for the in-process fallback
+    
+    # Idempotency-Key handling for mutating endpoints (see app.core.idempotency)
+    IDEMPOTENCY_BACKEND: str = "auto"  # auto (redis when REDIS_URL is set, else postgres), redis, postgres or memory
+    IDEMPOTENCY_TTL_SECONDS: int = 86400  # How long a completed response is replayed for its key
+    IDEMPOTENCY_LOCK_SECONDS: int = 60  # Lifetime of an in-progress reservation (covers a crashed worker)
+    IDEMPOTENCY_WAIT_SECONDS: float = 10.0  # How long a concurrent duplicate waits for the first response
+    IDEMPOTENCY_MEMORY_MAX_ENTRIES: int = 10000  # LRU bound for the in-process backend
+    IDEMPOTENCY_KEY_RETENTION_DAYS: int = 30  # Order-creation keys (no expires_at) are purged after this
+    
+    # Table maintenance jobs (app.workers.maintenance)
+    CART_ABANDON_AFTER_DAYS: int = 30  # Open carts untouched this long are marked abandoned
+    MAINTENANCE_BATCH_SIZE: int = 5000  # Rows deleted/updated per statement (and commit)
+    MAINTENANCE_MAX_BATCHES: int = 100  # Batches per job run; the next scheduled run continues the backlog
     
     class Config:
         env_file = ".env"
@@ -1,63 +1,270 @@
 """Database connection and session management for Neon."""
+import hashlib
+import time
+from typing import Any, Optional
 from urllib.parse import urlparse, urlencode, parse_qs
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from uuid import uuid4
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from sqlalchemy.util import await_only
+
+from app.core.cache import MemoryCacheBackend, RedisCacheBackend
 from app.core.config import settings
+from app.core.metrics import (
+    iris_db_pool_checked_out,
+    iris_db_pool_overflow,
+    iris_db_pool_size,
+    iris_db_pool_wait_seconds,
+)
+
 
-# Ensure DATABASE_URL uses async driver (postgresql+asyncpg://)
-# If user provided postgresql://, convert it to postgresql+asyncpg://
-db_url = settings.DATABASE_URL
-if db_url.startswith("postgresql://") and not db_url.startswith("postgresql+asyncpg://"):
-    db_url = db_url.replace("postgresql://", "postgresql+asyncpg://", 1)
-
-# Fix query parameters for asyncpg: convert sslmode to ssl
-parsed = urlparse(db_url)
-if parsed.query:
-    params = parse_qs(parsed.query)
-    # Remove unsupported parameters (asyncpg doesn't support these)
-    for unsupported in ['channel_binding']:
-        if unsupported in params:
-            del params[unsupported]
-    # Convert sslmode=require to ssl=require (asyncpg format)
-    if 'sslmode' in params:
-        sslmode_val = params.pop('sslmode')[0]
-        # If sslmode was "require", convert to ssl=require
-        if sslmode_val == 'require':
+def normalize_db_url(url: str) -> str:
+    """Adapt a Neon/Postgres URL for asyncpg (driver prefix and SSL query parameters)."""
+    # Ensure the URL uses the async driver (postgresql+asyncpg://)
+    # If user provided postgresql://, convert it to postgresql+asyncpg://
+    if url.startswith("postgresql://") and not url.startswith("postgresql+asyncpg://"):
+        url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    # Fix query parameters for asyncpg: convert sslmode to ssl
+    parsed = urlparse(url)
+    if parsed.query:
+        params = parse_qs(parsed.query)
+        # Remove unsupported parameters (asyncpg doesn't support these)
+        for unsupported in ['channel_binding']:
+            if unsupported in params:
+                del params[unsupported]
+        # Convert sslmode=require to ssl=require (asyncpg format)
+        if 'sslmode' in params:
+            sslmode_val = params.pop('sslmode')[0]
+            # If sslmode was "require", convert to ssl=require
+            if sslmode_val == 'require':
+                params['ssl'] = ['require']
+        # Add ssl=require if not already present (we need SSL for Neon)
+        if 'ssl' not in params:
             params['ssl'] = ['require']
-    # Add ssl=require if not already present (we need SSL for Neon)
-    if 'ssl' not in params:
-        params['ssl'] = ['require']
-    # Rebuild query string
-    query = urlencode(params, doseq=True)
-    db_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}?{query}"
-
-# Create async engine for Neon using pooled connection
-# Note: Neon's PgBouncer already handles connection pooling, so we use a small local pool
-# to avoid double pooling. This minimizes connection overhead and cold-start impact.
+        # Rebuild query string
+        query = urlencode(params, doseq=True)
+        url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}?{query}"
+    return url
+
+
+db_url = normalize_db_url(settings.DATABASE_URL)
+
+# Pool names, used as the "pool" label of the pool metrics
+PRIMARY_POOL = "primary"
+READ_POOL = "read"
+
+
+class _AcquireTimingMixin:
+    """Record how long callers wait to get a connection from the pool."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            iris_db_pool_wait_seconds.labels(pool=self.logging_name or PRIMARY_POOL).observe(
+                time.perf_counter() - start
+            )
+
+
+class InstrumentedQueuePool(_AcquireTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class InstrumentedNullPool(_AcquireTimingMixin, NullPool):
+    pass
+
+
+def engine_options(url: str, pool_name: str, pool_size: int, max_overflow: int) -> dict[str, Any]:
+    """
+    Build create_async_engine pool options for settings.DB_POOL_MODE.
+
+    - pgbouncer: the URL points at a transaction-mode PgBouncer (Neon pooler),
+      which already pools server connections. No local pool is kept, and
+      asyncpg's prepared statement caches are disabled because statements
+      cannot outlive a transaction there.
+    - direct: the URL points straight at Postgres. A sized local pool is kept;
+      connections are recycled after DB_POOL_RECYCLE_SECONDS rather than
+      pinged on every checkout.
+    """
+    mode = settings.DB_POOL_MODE.lower()
+    if mode == "pgbouncer":
+        options: dict[str, Any] = {"poolclass": InstrumentedNullPool}
+        if url.startswith("postgresql+asyncpg://"):
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                # Unique names avoid clashes between clients sharing a server connection
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+    elif mode == "direct":
+        options = {
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+            "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        }
+    else:
+        raise ValueError(f"Unknown DB_POOL_MODE {settings.DB_POOL_MODE!r}; expected 'pgbouncer' or 'direct'")
+    options["pool_pre_ping"] = settings.DB_POOL_PRE_PING
+    # Survives pool recreation and labels the pool metrics
+    options["pool_logging_name"] = pool_name
+    return options
+
+
+def instrument_pool(async_engine: AsyncEngine, pool_name: str) -> None:
+    """Export pool size, overflow and checked-out connections as Prometheus gauges."""
+    sync_engine = async_engine.sync_engine
+    size = iris_db_pool_size.labels(pool=pool_name)
+    overflow = iris_db_pool_overflow.labels(pool=pool_name)
+    checked_out = iris_db_pool_checked_out.labels(pool=pool_name)
+    if isinstance(sync_engine.pool, AsyncAdaptedQueuePool):
+        # Read through the engine so a recreated pool (after dispose) is reported
+        size.set_function(lambda: sync_engine.pool.size())
+        overflow.set_function(lambda: max(sync_engine.pool.overflow(), 0))
+        checked_out.set_function(lambda: sync_engine.pool.checkedout())
+        return
+
+    # NullPool keeps no bookkeeping; count checkouts from pool events instead
+    size.set(0)
+    overflow.set(0)
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_out.inc()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        checked_out.dec()
+
+
+class PrimarySession(Session):
+    """Session bound to the primary; records whether it wrote anything."""
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _mark_flush_write(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(PrimarySession, "do_orm_execute")
+def _mark_statement_write(orm_execute_state):
+    # Bulk UPDATE/DELETE/INSERT statements bypass the unit of work
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _pin_writer_to_primary(session):
+    client = session.info.get("client")
+    if session.info.pop("wrote", False) and client:
+        # Commits run inside the AsyncSession's greenlet, so the pin store can be awaited
+        # here: the pin is stored before the route returns, whichever way it committed
+        await_only(pin_to_primary(client))
+
+
+@event.listens_for(PrimarySession, "after_rollback")
+def _forget_rolled_back_write(session):
+    session.info.pop("wrote", None)
+
+
+# Clients that committed a write recently; their reads stay on the primary
+# for READ_YOUR_WRITES_SECONDS so they never observe replica lag. Pins live
+# in Redis when REDIS_URL is set, so they hold whichever worker serves the
+# client's next read; the in-process fallback only covers a single worker.
+PIN_KEY_PREFIX = "ryw:"
+primary_pins = (
+    RedisCacheBackend(settings.REDIS_URL)
+    if settings.REDIS_URL
+    else MemoryCacheBackend(settings.READ_YOUR_WRITES_MAX_CLIENTS, settings.READ_YOUR_WRITES_SECONDS)
+)
+
+
+async def pin_to_primary(client: str) -> None:
+    """Send the client's reads to the primary for the next READ_YOUR_WRITES_SECONDS."""
+    await primary_pins.set(f"{PIN_KEY_PREFIX}{client}", b"1", settings.READ_YOUR_WRITES_SECONDS)
+
+
+async def is_pinned_to_primary(client: Optional[str]) -> bool:
+    """Whether the client committed a write recently (an unreachable pin store counts as no)."""
+    return client is not None and await primary_pins.get(f"{PIN_KEY_PREFIX}{client}") is not None
+
+
+def client_key(request: Request) -> Optional[str]:
+    """Identify the caller for read-your-writes pinning (bearer token, else client address)."""
+    authorization = request.headers.get("authorization")
+    if authorization:
+        return hashlib.sha256(authorization.encode("utf-8")).hexdigest()
+    return request.client.host if request.client else None
+
+
+# Create async engine for Neon (pool profile selected by DB_POOL_MODE)
 engine = create_async_engine(
     db_url,
-    pool_size=5,              # Small pool since PgBouncer manages concurrency
-    max_overflow=0,           # No overflow connections needed
-    pool_timeout=30,          # Connection timeout in seconds
-    pool_pre_ping=True,       # Verify connections before use (prevents stale connections)
-    future=True,              # Use async engine
+    future=True,
+    **engine_options(db_url, PRIMARY_POOL, settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW),
 )
+instrument_pool(engine, PRIMARY_POOL)
+
+# Optional read-replica engine with its own pool; falls back to the primary
+if settings.DATABASE_URL_READ:
+    read_db_url = normalize_db_url(settings.DATABASE_URL_READ)
+    read_engine = create_async_engine(
+        read_db_url,
+        future=True,
+        **engine_options(read_db_url, READ_POOL, settings.DB_READ_POOL_SIZE, settings.DB_READ_MAX_OVERFLOW),
+    )
+    instrument_pool(read_engine, READ_POOL)
+else:
+    read_engine = engine
 
 # Async session maker
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
+    sync_session_class=PrimarySession,
     expire_on_commit=False,   # Keep objects after commit for queries
 )
 
+ReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
 
-async def get_db() -> AsyncSession:
+
+async def get_db(request: Request) -> AsyncSession:
     """
     Dependency for FastAPI routes to get database session.
     Automatically closes session after request completes.
     """
     async with AsyncSessionLocal() as session:
+        session.info["client"] = client_key(request)
         try:
             yield session
         finally:
             await session.close()
 
+
+async def get_read_db(request: Request) -> AsyncSession:
+    """
+    Dependency for read-only routes: a session on the read replica.
+
+    Uses the primary when no replica is configured or when the caller
+    committed a write within the last READ_YOUR_WRITES_SECONDS.
+    """
+    if read_engine is engine or await is_pinned_to_primary(client_key(request)):
+        session_factory = AsyncSessionLocal
+    else:
+        session_factory = ReadSessionLocal
+    async with session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
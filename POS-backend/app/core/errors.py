@@ -36,6 +36,13 @@ class ConflictError(AppError):
         super().__init__(message, status_code=409, error_type="ConflictError")
 
 
+class UnsupportedMediaTypeError(AppError):
+    """Request body in a format the endpoint does not accept."""
+    
+    def __init__(self, message: str):
+        super().__init__(message, status_code=415, error_type="UnsupportedMediaTypeError")
+
+
 async def app_error_handler(request: Request, exc: AppError) -> JSONResponse:
     """
     Global error handler for custom application errors.
@@ -0,0 +1,386 @@
+"""
+Idempotency-Key handling for mutating endpoints.
+
+A request carrying an Idempotency-Key reserves the key in a shared store
+before the endpoint runs, and the endpoint's response is stored under it
+afterwards. A retry with the same key and the same request replays the
+stored response (with an Idempotent-Replayed header) without running the
+endpoint again; a concurrent duplicate waits for the first request to
+finish and then replays its response; a key reused for a different request
+is rejected with 422. Keys are scoped per endpoint and caller, and expire
+after IDEMPOTENCY_TTL_SECONDS.
+
+Usage:
+
+    @router.post("")
+    async def create_thing(..., idempotency: IdempotencyGuard = Depends(idempotent("things.create"))):
+        ...
+        return await idempotency.save(ModelJSONResponse(thing, status_code=201))
+
+Stores: Redis (shared, TTL native), Postgres (the idempotency_keys table)
+or process memory (single worker, tests). If the store cannot be reached
+the request runs unguarded; endpoints that must never run twice keep their
+own transactional check as well (see OrderRepository.create_order_transactional).
+"""
+import asyncio
+import base64
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Callable, Optional
+from uuid import uuid4
+
+import orjson
+from fastapi import Depends, Header, Request
+from fastapi.responses import Response
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.errors import ConflictError, ValidationError
+from app.core.metrics import iris_idempotency_requests_total
+from app.core.security import get_current_user
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+# Poll interval while waiting on a concurrent duplicate (doubles up to the max)
+_POLL_SECONDS = 0.05
+_MAX_POLL_SECONDS = 0.5
+
+
+@dataclass
+class IdempotencyRecord:
+    """State stored under a key: in progress until status_code is set."""
+
+    fingerprint: str
+    status_code: Optional[int] = None
+    content_type: Optional[str] = None
+    body: bytes = b""
+
+    @property
+    def completed(self) -> bool:
+        return self.status_code is not None
+
+    def dumps(self) -> bytes:
+        return orjson.dumps({
+            "fingerprint": self.fingerprint,
+            "status_code": self.status_code,
+            "content_type": self.content_type,
+            "body": base64.b64encode(self.body).decode("ascii"),
+        })
+
+    @classmethod
+    def loads(cls, raw: bytes) -> "IdempotencyRecord":
+        data = orjson.loads(raw)
+        return cls(
+            fingerprint=data["fingerprint"],
+            status_code=data["status_code"],
+            content_type=data["content_type"],
+            body=base64.b64decode(data["body"]),
+        )
+
+    def to_response(self) -> Response:
+        return Response(
+            content=self.body,
+            status_code=self.status_code,
+            media_type=self.content_type,
+            headers={REPLAYED_HEADER: "true"},
+        )
+
+
+class MemoryIdempotencyStore:
+    """
+    Keys kept in process memory (TTLCache).
+
+    Reservations are atomic within one event loop, but nothing is shared
+    between workers; meant for single-process deployments and tests.
+    """
+
+    def __init__(self, max_entries: int):
+        self._entries = TTLCache(max_entries=max_entries, ttl_seconds=0)
+
+    async def reserve(self, key: str, fingerprint: str, lock_seconds: float) -> Optional[IdempotencyRecord]:
+        existing = self._entries.get(key)
+        if existing is not None:
+            return existing
+        self._entries.set(key, IdempotencyRecord(fingerprint), ttl_seconds=lock_seconds)
+        return None
+
+    async def complete(self, key: str, record: IdempotencyRecord, ttl_seconds: float) -> None:
+        self._entries.set(key, record, ttl_seconds=ttl_seconds)
+
+    async def release(self, key: str) -> None:
+        self._entries.invalidate(key)
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisIdempotencyStore:
+    """Keys on Redis: SET NX PX reserves a key, expiry is Redis' own TTL."""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url)
+
+    async def reserve(self, key: str, fingerprint: str, lock_seconds: float) -> Optional[IdempotencyRecord]:
+        placeholder = IdempotencyRecord(fingerprint).dumps()
+        while True:
+            if await self._redis.set(key, placeholder, nx=True, px=max(1, int(lock_seconds * 1000))):
+                return None
+            raw = await self._redis.get(key)
+            if raw is not None:
+                return IdempotencyRecord.loads(raw)
+            # Expired or released between SET and GET: try to reserve again
+
+    async def complete(self, key: str, record: IdempotencyRecord, ttl_seconds: float) -> None:
+        await self._redis.set(key, record.dumps(), px=max(1, int(ttl_seconds * 1000)))
+
+    async def release(self, key: str) -> None:
+        await self._redis.delete(key)
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+class PostgresIdempotencyStore:
+    """
+    Keys in the idempotency_keys table, each operation in its own short transaction.
+
+    A reservation is an INSERT ... ON CONFLICT (key) DO UPDATE that only
+    takes over a row whose expires_at has passed, so the row lock is held
+    for one statement rather than for the whole request.
+    """
+
+    def __init__(self, session_factory: Callable[[], Any]):
+        self._session_factory = session_factory
+
+    async def reserve(self, key: str, fingerprint: str, lock_seconds: float) -> Optional[IdempotencyRecord]:
+        from app.domain.orders.models import IdempotencyKey
+
+        now = datetime.now(timezone.utc)
+        values = {
+            "fingerprint": fingerprint,
+            "response": None,
+            "order_id": None,
+            "created_at": now,
+            "expires_at": now + timedelta(seconds=lock_seconds),
+        }
+        async with self._session_factory() as session:
+            insert = sqlite_insert if session.bind.dialect.name == "sqlite" else pg_insert
+            stmt = insert(IdempotencyKey).values(id=uuid4(), key=key, **values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[IdempotencyKey.key],
+                set_=values,
+                where=IdempotencyKey.expires_at < now,
+            ).returning(IdempotencyKey.id)
+            while True:
+                reserved = (await session.execute(stmt)).first() is not None
+                row = None
+                if not reserved:
+                    row = (await session.execute(
+                        select(IdempotencyKey.fingerprint, IdempotencyKey.response).where(IdempotencyKey.key == key)
+                    )).first()
+                await session.commit()
+                if reserved:
+                    return None
+                if row is not None:
+                    if row.response is not None:
+                        return IdempotencyRecord.loads(row.response)
+                    return IdempotencyRecord(row.fingerprint or "")
+                # Released between the INSERT and the SELECT: try to reserve again
+
+    async def complete(self, key: str, record: IdempotencyRecord, ttl_seconds: float) -> None:
+        from app.domain.orders.models import IdempotencyKey
+
+        async with self._session_factory() as session:
+            await session.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.key == key)
+                .values(
+                    response=record.dumps(),
+                    expires_at=datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds),
+                )
+            )
+            await session.commit()
+
+    async def release(self, key: str) -> None:
+        from app.domain.orders.models import IdempotencyKey
+
+        async with self._session_factory() as session:
+            await session.execute(
+                delete(IdempotencyKey).where(IdempotencyKey.key == key, IdempotencyKey.response.is_(None))
+            )
+            await session.commit()
+
+    async def close(self) -> None:
+        pass
+
+
+class IdempotentReplay(Exception):
+    """Raised by the idempotent() dependency to answer with a stored response."""
+
+    def __init__(self, response: Response):
+        self.response = response
+
+
+async def idempotent_replay_handler(request: Request, exc: IdempotentReplay) -> Response:
+    return exc.response
+
+
+class IdempotencyGuard:
+    """
+    Per-request handle from the idempotent() dependency.
+
+    Endpoints pass their response through save(); without a key (or when
+    the store is unavailable) save() just returns the response.
+    """
+
+    def __init__(self, store: Any, scope: str, key: Optional[str] = None, fingerprint: str = ""):
+        self.store = store
+        self.scope = scope
+        self.key = key
+        self.fingerprint = fingerprint
+        self.reserved = False
+
+    async def acquire(self, lock_seconds: float, wait_seconds: float) -> None:
+        """
+        Reserve the key, or raise IdempotentReplay / ValidationError / ConflictError.
+
+        While another request holds the key with the same fingerprint, poll
+        until it completes (replay) or is released (take over), for at most
+        wait_seconds.
+        """
+        deadline = time.monotonic() + wait_seconds
+        delay = _POLL_SECONDS
+        waited = False
+        while True:
+            try:
+                existing = await self.store.reserve(self.key, self.fingerprint, lock_seconds)
+            except Exception:
+                logger.warning("Idempotency store unavailable; running %s unguarded", self.scope, exc_info=True)
+                self._count("unavailable")
+                return
+            if existing is None:
+                self.reserved = True
+                self._count("new")
+                return
+            if existing.fingerprint != self.fingerprint:
+                self._count("mismatch")
+                raise ValidationError(f"{IDEMPOTENCY_HEADER} has already been used for a different request")
+            if existing.completed:
+                self._count("waited" if waited else "replayed")
+                raise IdempotentReplay(existing.to_response())
+            if time.monotonic() >= deadline:
+                self._count("timeout")
+                raise ConflictError(f"A request with this {IDEMPOTENCY_HEADER} is still in progress")
+            waited = True
+            await asyncio.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+            delay = min(delay * 2, _MAX_POLL_SECONDS)
+
+    async def save(self, response: Response) -> Response:
+        """Store a successful response for replay and return it."""
+        if self.reserved:
+            record = IdempotencyRecord(
+                fingerprint=self.fingerprint,
+                status_code=response.status_code,
+                content_type=response.headers.get("content-type"),
+                body=bytes(response.body),
+            )
+            try:
+                await self.store.complete(self.key, record, settings.IDEMPOTENCY_TTL_SECONDS)
+            except Exception:
+                logger.warning("Idempotency store unavailable; %s response not stored", self.scope, exc_info=True)
+            self.reserved = False
+        return response
+
+    async def release(self) -> None:
+        """Give the key up (the request failed) so a retry runs the endpoint again."""
+        if not self.reserved:
+            return
+        self.reserved = False
+        try:
+            await self.store.release(self.key)
+        except Exception:
+            logger.warning("Idempotency store unavailable; %s reservation expires on its own", self.scope, exc_info=True)
+
+    def _count(self, result: str) -> None:
+        iris_idempotency_requests_total.labels(scope=self.scope, result=result).inc()
+
+
+def _digest(*parts: Any) -> str:
+    hasher = hashlib.sha256()
+    for part in parts:
+        hasher.update(part if isinstance(part, bytes) else str(part).encode("utf-8"))
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+def idempotent(scope: str, required: bool = False) -> Callable[..., AsyncIterator[IdempotencyGuard]]:
+    """
+    Dependency factory guarding an endpoint with the Idempotency-Key header.
+
+    scope names the operation (keys of different endpoints never collide);
+    keys are also scoped to the authenticated caller. With required=True a
+    missing header is rejected with 409. Exceptions from the endpoint
+    release the key, so only successful responses passed to save() replay.
+    """
+
+    async def dependency(
+        request: Request,
+        idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
+        current_user: dict = Depends(get_current_user),
+    ) -> AsyncIterator[IdempotencyGuard]:
+        if not idempotency_key:
+            if required:
+                raise ConflictError(f"Missing {IDEMPOTENCY_HEADER} header")
+            yield IdempotencyGuard(idempotency_store, scope)
+            return
+        if len(idempotency_key) > MAX_KEY_LENGTH:
+            raise ValidationError(f"{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} characters")
+
+        authz = current_user.get("authz")
+        caller = (authz.user_id if authz is not None else None) or current_user.get("sub") or "anonymous"
+        guard = IdempotencyGuard(
+            idempotency_store,
+            scope,
+            key="idem:" + _digest(scope, caller, idempotency_key),
+            fingerprint=_digest(request.method, request.url.path, request.url.query, await request.body()),
+        )
+        await guard.acquire(settings.IDEMPOTENCY_LOCK_SECONDS, settings.IDEMPOTENCY_WAIT_SECONDS)
+        try:
+            yield guard
+        finally:
+            # Saved responses are kept; anything else (an exception included) frees the key
+            await guard.release()
+
+    return dependency
+
+
+def create_idempotency_store() -> Any:
+    backend = settings.IDEMPOTENCY_BACKEND.lower()
+    if backend == "auto":
+        backend = "redis" if settings.REDIS_URL else "postgres"
+    if backend == "redis":
+        if not settings.REDIS_URL:
+            raise ValueError("IDEMPOTENCY_BACKEND=redis requires REDIS_URL")
+        return RedisIdempotencyStore(settings.REDIS_URL)
+    if backend == "postgres":
+        from app.core.database import AsyncSessionLocal
+
+        return PostgresIdempotencyStore(AsyncSessionLocal)
+    if backend == "memory":
+        return MemoryIdempotencyStore(settings.IDEMPOTENCY_MEMORY_MAX_ENTRIES)
+    raise ValueError(f"Unknown IDEMPOTENCY_BACKEND {settings.IDEMPOTENCY_BACKEND!r}")
+
+
+idempotency_store = create_idempotency_store()
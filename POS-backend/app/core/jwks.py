@@ -0,0 +1,92 @@
+"""Clerk JWKS cache with background refresh for networkless token verification."""
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Optional
+
+import httpx
+from jwt.algorithms import RSAAlgorithm
+
+logger = logging.getLogger(__name__)
+
+
+class JWKSCache:
+    """
+    In-memory map of key id -> public key for the Clerk instance.
+
+    Keys are refreshed periodically by a background task so request-time
+    verification never waits on the network. A token signed with an unknown
+    kid triggers an on-demand refresh, rate limited by min_refetch_seconds.
+    """
+
+    def __init__(
+        self,
+        jwks_url: str,
+        api_key: Optional[str],
+        refresh_seconds: float = 300,
+        min_refetch_seconds: float = 30,
+    ):
+        self.jwks_url = jwks_url
+        self.api_key = api_key
+        self.refresh_seconds = refresh_seconds
+        self.min_refetch_seconds = min_refetch_seconds
+        self._keys: dict[str, Any] = {}
+        self._fetched_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self) -> None:
+        """Fetch the JWKS and replace the cached keys."""
+        async with httpx.AsyncClient(timeout=10) as client:
+            resp = await client.get(
+                self.jwks_url,
+                headers={"Accept": "application/json", "Authorization": f"Bearer {self.api_key}"},
+            )
+            resp.raise_for_status()
+        keys = {}
+        for jwk in resp.json().get("keys", []):
+            if jwk.get("kid"):
+                keys[jwk["kid"]] = RSAAlgorithm.from_jwk(json.dumps(jwk))
+        self._keys = keys
+        self._fetched_at = time.monotonic()
+
+    async def get_key(self, kid: Optional[str]) -> Optional[Any]:
+        """Return the public key for kid, refreshing once if it is not known yet."""
+        key = self._keys.get(kid)
+        if key is not None or kid is None:
+            return key
+        async with self._lock:
+            key = self._keys.get(kid)
+            recently_fetched = (
+                self._fetched_at is not None
+                and time.monotonic() - self._fetched_at < self.min_refetch_seconds
+            )
+            if key is None and not recently_fetched:
+                await self.refresh()
+                key = self._keys.get(kid)
+        return key
+
+    def start(self) -> None:
+        """Start the background refresh loop on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Cancel the background refresh loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                # Keep serving the previous keys; retry on the next tick
+                logger.warning("Clerk JWKS refresh failed", exc_info=True)
+            await asyncio.sleep(self.refresh_seconds)
@@ -1,6 +1,18 @@
 """Prometheus metrics definitions and instrumentation for Iris API."""
-import time
-from prometheus_client import Counter, Histogram
+from typing import Any, Optional
+
+from prometheus_client import Counter, Gauge, Histogram
+from starlette.routing import Match
+from starlette.types import Scope
+
+from app.core.config import settings
+
+# Endpoint label values for requests without a matching route / beyond the label cap
+UNMATCHED_ENDPOINT = "unmatched"
+OVERFLOW_ENDPOINT = "other"
+
+# Methods outside this set are labelled "OTHER" so clients cannot mint new series
+KNOWN_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
 
 # API request metrics (per MASTER_PROMPT_BACKEND.md §13)
 iris_api_requests_total = Counter(
@@ -22,39 +34,141 @@ iris_api_latency_seconds = Histogram(
     buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
 )
 
+iris_access_log_dropped_total = Counter(
+    "iris_access_log_dropped_total",
+    "Access log records dropped because the log queue was full"
+)
+
+# Database pool metrics
+iris_db_pool_wait_seconds = Histogram(
+    "iris_db_pool_wait_seconds",
+    "Time spent acquiring a database connection from the pool",
+    ["pool"],
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+)
+
+iris_db_pool_checked_out = Gauge(
+    "iris_db_pool_checked_out",
+    "Database connections currently checked out of the pool",
+    ["pool"]  # pool: primary or read
+)
+
+iris_db_pool_overflow = Gauge(
+    "iris_db_pool_overflow",
+    "Database connections open beyond the configured pool size",
+    ["pool"]  # pool: primary or read
+)
+
+iris_db_pool_size = Gauge(
+    "iris_db_pool_size",
+    "Configured database pool size (0 when no local pool is kept)",
+    ["pool"]  # pool: primary or read
+)
+
+# Auth metrics
+iris_auth_user_cache_total = Counter(
+    "iris_auth_user_cache_total",
+    "JWT user resolution cache lookups",
+    ["result"]  # result: hit or miss
+)
+
+# Catalog cache metrics
+iris_catalog_cache_total = Counter(
+    "iris_catalog_cache_total",
+    "Product catalog cache lookups",
+    ["kind", "result"]  # kind: list, search or product; result: hit or miss
+)
+
+# Idempotency metrics
+iris_idempotency_requests_total = Counter(
+    "iris_idempotency_requests_total",
+    "Requests carrying an Idempotency-Key",
+    ["scope", "result"]  # result: new, replayed, waited, mismatch, timeout or unavailable
+)
+
 # Connector metrics (per MASTER_PROMPT_BACKEND.md §11)
 # Note: These are defined here for documentation but implemented in workers/connectors.py
 # Connector metrics are collected by Celery workers during task execution
 
 
-async def metrics_middleware(request, call_next):
+class EndpointLabeler:
     """
-    FastAPI middleware to instrument API requests with Prometheus metrics.
+    Map requests to bounded endpoint label values.
+
+    Requests are labelled with the template of the route that served them
+    (e.g. /api/v1/orders/{order_id}) rather than the raw path, so IDs in URLs
+    do not create new time series. Requests no route matched share one
+    "unmatched" label, and once max_labels distinct templates have been seen
+    any further ones are collapsed into "other".
+    """
+
+    def __init__(self, max_labels: int):
+        self.max_labels = max_labels
+        self._labels: set[str] = set()
+        self._routes_by_endpoint: Optional[dict[Any, list]] = None
+
+    def label(self, scope: Scope) -> str:
+        """Return the endpoint label for a request whose routing has completed."""
+        template = self._route_template(scope)
+        if template is None:
+            return UNMATCHED_ENDPOINT
+        if template in self._labels:
+            return template
+        if len(self._labels) >= self.max_labels:
+            return OVERFLOW_ENDPOINT
+        self._labels.add(template)
+        return template
+
+    def _route_template(self, scope: Scope) -> Optional[str]:
+        # The router records the handler it dispatched to in scope["endpoint"]
+        endpoint = scope.get("endpoint")
+        app = scope.get("app")
+        if endpoint is None or app is None:
+            return None
+        if self._routes_by_endpoint is None:
+            self._routes_by_endpoint = self._index_routes(app)
+        routes = self._routes_by_endpoint.get(endpoint, [])
+        if len(routes) == 1:
+            return routes[0].path
+        # Same handler registered under several paths: re-match to pick one
+        for route in routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+        return None
+
+    @staticmethod
+    def _index_routes(app: Any) -> dict[Any, list]:
+        index: dict[Any, list] = {}
+        for route in getattr(app, "routes", []):
+            handler = getattr(route, "endpoint", None) or getattr(route, "app", None)
+            if handler is not None and hasattr(route, "path"):
+                index.setdefault(handler, []).append(route)
+        return index
+
+
+def method_label(method: str) -> str:
+    """Return the method label, folding non-standard methods into "OTHER"."""
+    return method if method in KNOWN_METHODS else "OTHER"
+
+
+endpoint_labeler = EndpointLabeler(settings.METRICS_MAX_ENDPOINT_LABELS)
+
+
+def record_request(method: str, endpoint: str, status: int, duration: float) -> None:
+    """
+    Record Prometheus metrics for one API request.
     
     Tracks:
     - Request count (iris_api_requests_total)
     - Request latency (iris_api_latency_seconds)
     - Error count (iris_api_errors_total)
     
+    Called by ObservabilityMiddleware once the response has been sent, with
+    endpoint already reduced to a bounded label by EndpointLabeler.
     All timestamps are in UTC per MASTER_PROMPT_BACKEND.md invariants.
     """
-    start_time = time.time()
-    
-    # Get endpoint path (remove query params for cleaner metrics)
-    endpoint = request.url.path
-    
-    # Process request
-    response = await call_next(request)
-    
-    # Calculate duration
-    duration = time.time() - start_time
-    
-    # Extract labels
-    method = request.method
-    status = response.status_code
-    status_class = f"{status // 100}xx"
-    
-    # Record metrics
+    method = method_label(method)
     iris_api_requests_total.labels(
         method=method,
         endpoint=endpoint,
@@ -69,10 +183,7 @@ async def metrics_middleware(request, call_next):
     # Record errors (4xx/5xx)
     if status >= 400:
         iris_api_errors_total.labels(
-            status=status_class,
+            status=f"{status // 100}xx",
             endpoint=endpoint,
             error_type="http_error"
         ).inc()
-    
-    return response
-
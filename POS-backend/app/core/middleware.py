@@ -1,53 +1,191 @@
-"""Middleware: request ID and JSON access logging."""
-import json
+"""Middleware: request ID, Prometheus metrics and JSON access logging."""
+import atexit
 import logging
+import queue
+import random
+import sys
 import time
 import uuid
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+import orjson
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.core.config import settings
+from app.core.metrics import endpoint_labeler, iris_access_log_dropped_total, record_request
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    """Attach a unique X-Request-ID to each request and response."""
 
-    async def dispatch(self, request: Request, call_next):
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = request_id
-        return response
-
-
-class JSONAccessLogMiddleware(BaseHTTPMiddleware):
-    """Log requests in structured JSON with latency and request ID."""
-
-    def __init__(self, app):
-        super().__init__(app)
-        self.logger = logging.getLogger("access")
-        if not self.logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter("%(message)s")
-            handler.setFormatter(formatter)
-            self.logger.addHandler(handler)
-        self.logger.setLevel(logging.INFO)
-
-    async def dispatch(self, request: Request, call_next):
-        start = time.time()
-        response = await call_next(request)
-        duration = time.time() - start
-        payload = {
-            "ts": int(time.time()),
-            "level": "INFO",
-            "message": "request",
-            "method": request.method,
-            "path": request.url.path,
-            "status": response.status_code,
-            "duration_ms": int(duration * 1000),
-            "request_id": getattr(request.state, "request_id", None),
-        }
-        self.logger.info(json.dumps(payload))
-        return response
+class JSONLineFormatter(logging.Formatter):
+    """Serialize dict log messages as one JSON object per line with orjson."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        if isinstance(record.msg, dict):
+            return orjson.dumps(record.msg).decode("utf-8")
+        return record.getMessage()
+
+
+class DeferredFlushStreamHandler(logging.StreamHandler):
+    """StreamHandler that leaves flushing to the caller so writes can be batched."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        # A closed or broken stream must not kill the listener thread
+        try:
+            super().flush()
+        except (OSError, ValueError):
+            pass
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Enqueue access log records without formatting or blocking.
+
+    Serialization happens on the listener thread. When the queue is full the
+    record is dropped and counted rather than stalling the event loop.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            iris_access_log_dropped_total.inc()
+
+
+class BatchingQueueListener(QueueListener):
+    """
+    QueueListener that drains everything already queued (up to batch_size)
+    before flushing its handlers once, so a burst costs one write syscall.
+    """
+
+    def __init__(self, log_queue: queue.Queue, *handlers: logging.Handler, batch_size: int = 256):
+        super().__init__(log_queue, *handlers)
+        self.batch_size = max(1, batch_size)
+
+    def _monitor(self) -> None:
+        q = self.queue
+        while True:
+            batch = [self.dequeue(True)]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.dequeue(False))
+                except queue.Empty:
+                    break
+            stop = False
+            for record in batch:
+                if record is self._sentinel:
+                    stop = True
+                else:
+                    self.handle(record)
+                q.task_done()
+            for handler in self.handlers:
+                handler.flush()
+            if stop:
+                return
+
+    def enqueue_sentinel(self) -> None:
+        # Block rather than fail if the queue is full at shutdown
+        self.queue.put(self._sentinel)
 
 
+_access_listener: Optional[BatchingQueueListener] = None
+
+
+def get_access_logger() -> logging.Logger:
+    """
+    Return the structured access logger.
+
+    The first call wires the logger to a bounded queue drained by a background
+    listener thread, which formats and writes records to stdout in batches.
+    """
+    global _access_listener
+    logger = logging.getLogger("access")
+    if not logger.handlers:
+        log_queue: queue.Queue = queue.Queue(maxsize=settings.ACCESS_LOG_QUEUE_SIZE)
+        stream_handler = DeferredFlushStreamHandler(sys.stdout)
+        stream_handler.setFormatter(JSONLineFormatter())
+        _access_listener = BatchingQueueListener(
+            log_queue, stream_handler, batch_size=settings.ACCESS_LOG_BATCH_SIZE
+        )
+        _access_listener.start()
+        atexit.register(stop_access_logger)
+        logger.addHandler(NonBlockingQueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def stop_access_logger() -> None:
+    """Flush queued access log records and stop the listener thread."""
+    global _access_listener
+    if _access_listener is not None:
+        _access_listener.stop()
+        _access_listener = None
+
+
+def should_log_access(status_code: int) -> bool:
+    """Apply ACCESS_LOG_SAMPLE_RATE_2XX to successful requests; others are always logged."""
+    rate = settings.ACCESS_LOG_SAMPLE_RATE_2XX
+    if 200 <= status_code < 300 and rate < 1.0:
+        return random.random() < rate
+    return True
+
+
+class ObservabilityMiddleware:
+    """
+    Pure ASGI middleware handling request observability in a single pass.
+
+    - Attaches a unique X-Request-ID to the request state and response headers
+    - Records Prometheus request, latency and error metrics by route template
+    - Logs the request in structured JSON with latency and request ID
+      (queued; 2xx responses optionally sampled)
+
+    Unlike BaseHTTPMiddleware it does not wrap the response in an extra
+    streaming task, so streaming responses pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.logger = get_access_logger()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = str(uuid.uuid4())
+        scope.setdefault("state", {})["request_id"] = request_id
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            await send(message)
 
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            duration = time.perf_counter() - start
+            record_request(scope["method"], endpoint_labeler.label(scope), status_code, duration)
+            if should_log_access(status_code):
+                self.logger.info({
+                    "ts": int(time.time()),
+                    "level": "INFO",
+                    "message": "request",
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status_code,
+                    "duration_ms": int(duration * 1000),
+                    "request_id": request_id,
+                })
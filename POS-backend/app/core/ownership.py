@@ -1,8 +1,9 @@
 """Ownership helpers for supplier and restaurant resources."""
+from dataclasses import dataclass, field
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import literal, select, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.users.models import UserRole
@@ -10,48 +11,57 @@ from app.domain.restaurants.models import RestaurantMember
 from app.domain.suppliers.models import SupplierMember
 
 
-async def check_supplier_ownership(
-    session: AsyncSession,
-    user_role: str,
-    user_id: UUID,
-    supplier_id: UUID,
-) -> bool:
+@dataclass(frozen=True)
+class AuthzContext:
     """
-    Check if the account owns or belongs to the supplier.
-    Admins bypass ownership checks.
+    Request-scoped view of what the current user may access.
+
+    Memberships are loaded once per request by the auth dependency, so
+    ownership checks are answered from memory. Admins bypass ownership checks.
     """
-    if user_role and user_role.lower() == UserRole.ADMIN:
-        return True
+    user_id: Optional[UUID]
+    role: str = ""
+    supplier_ids: frozenset[UUID] = field(default_factory=frozenset)
+    restaurant_ids: frozenset[UUID] = field(default_factory=frozenset)
 
-    stmt = select(SupplierMember).where(
-        SupplierMember.user_id == user_id,
-        SupplierMember.supplier_id == supplier_id,
-    )
-    result = await session.execute(stmt)
-    membership = result.scalar_one_or_none()
-    return membership is not None
+    @property
+    def is_admin(self) -> bool:
+        return bool(self.role) and self.role.lower() == UserRole.ADMIN
+
+    def owns_supplier(self, supplier_id: UUID) -> bool:
+        """Check if the user owns or belongs to the supplier."""
+        return self.is_admin or supplier_id in self.supplier_ids
 
+    def owns_restaurant(self, restaurant_id: UUID) -> bool:
+        """Check if the user owns or belongs to the restaurant."""
+        return self.is_admin or restaurant_id in self.restaurant_ids
 
-async def check_restaurant_ownership(
+
+async def load_authz_context(
     session: AsyncSession,
+    user_id: Optional[UUID],
     user_role: str,
-    user_id: UUID,
-    restaurant_id: UUID,
-) -> bool:
+) -> AuthzContext:
     """
-    Check if the account owns or belongs to the restaurant.
-    Admins bypass ownership checks.
+    Load all supplier and restaurant memberships of a user with one query.
+    Admins and unresolved users need no membership lookup.
     """
-    if user_role and user_role.lower() == UserRole.ADMIN:
-        return True
+    context = AuthzContext(user_id=user_id, role=user_role or "")
+    if user_id is None or context.is_admin:
+        return context
 
-    stmt = select(RestaurantMember).where(
-        RestaurantMember.user_id == user_id,
-        RestaurantMember.restaurant_id == restaurant_id,
+    stmt = union_all(
+        select(literal("supplier").label("kind"), SupplierMember.supplier_id.label("org_id")).where(
+            SupplierMember.user_id == user_id
+        ),
+        select(literal("restaurant").label("kind"), RestaurantMember.restaurant_id.label("org_id")).where(
+            RestaurantMember.user_id == user_id
+        ),
+    )
+    rows = (await session.execute(stmt)).all()
+    return AuthzContext(
+        user_id=user_id,
+        role=context.role,
+        supplier_ids=frozenset(org_id for kind, org_id in rows if kind == "supplier"),
+        restaurant_ids=frozenset(org_id for kind, org_id in rows if kind == "restaurant"),
     )
-    result = await session.execute(stmt)
-    membership = result.scalar_one_or_none()
-    return membership is not None
-
-
-
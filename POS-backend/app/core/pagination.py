@@ -0,0 +1,82 @@
+"""Keyset (cursor) pagination helpers for list endpoints."""
+import base64
+from datetime import datetime
+from typing import Any, Optional
+from uuid import UUID
+
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.errors import ValidationError
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    """Encode a (created_at, id) position as an opaque URL-safe cursor."""
+    raw = f"{created_at.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """
+    Decode an opaque cursor back into its (created_at, id) position.
+
+    Raises:
+        ValidationError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        created_at, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except (ValueError, UnicodeError):
+        raise ValidationError("Invalid pagination cursor")
+
+
+def keyset_page(
+    stmt: Select,
+    model: Any,
+    limit: int,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+) -> Select:
+    """
+    Order a list query by (created_at, id) DESC and position it.
+
+    With a cursor the page starts strictly after the encoded row, so deep
+    pages cost the same as the first one; otherwise offset is applied.
+    One extra row is fetched so split_page can tell whether a next page exists.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+    elif offset:
+        stmt = stmt.offset(offset)
+    return stmt.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+
+def split_page(items: list, limit: int) -> tuple[list, Optional[str]]:
+    """Trim the look-ahead row and build the cursor for the next page (None on the last page)."""
+    if len(items) <= limit:
+        return items, None
+    items = items[:limit]
+    last = items[-1]
+    return items, encode_cursor(last.created_at, last.id)
+
+
+async def count_rows(session: AsyncSession, stmt: Select) -> int:
+    """Exact count(*) over a filtered (unpaginated) list query."""
+    return (await session.execute(select(func.count()).select_from(stmt.subquery()))).scalar_one()
+
+
+async def listing_version(session: AsyncSession, stmt: Select, model: Any) -> tuple[int, Optional[datetime]]:
+    """
+    count(*) and max(updated_at) over a filtered (unpaginated) list query.
+
+    The pair changes whenever a row in the set is added, removed or updated,
+    so it versions the whole listing for ETag purposes.
+    """
+    subquery = stmt.with_only_columns(model.id, model.updated_at).subquery()
+    row = (
+        await session.execute(select(func.count(), func.max(subquery.c.updated_at)).select_from(subquery))
+    ).one()
+    return row[0], row[1]
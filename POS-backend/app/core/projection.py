@@ -0,0 +1,46 @@
+"""Column-projected read path: response columns as plain rows, no ORM objects."""
+import typing
+from typing import Any, Callable, Iterable, Optional
+
+from pydantic import BaseModel
+
+
+def _converter_for(annotation: Any) -> Optional[Callable[[Any], Any]]:
+    """Coerce DB values whose Python type differs from the schema type (e.g. Numeric -> float)."""
+    args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+    if typing.get_origin(annotation) is typing.Union and len(args) == 1:
+        annotation = args[0]
+    if annotation is float:
+        return float
+    if annotation is int:
+        return int
+    return None
+
+
+class RowProjection:
+    """
+    The columns of a model that make up a response schema, plus a converter
+    from result rows to JSON-ready dicts.
+
+    Selecting these columns instead of the entity skips identity-map
+    bookkeeping and object construction, and to_dicts skips Pydantic
+    validation; UUIDs and datetimes are left for the JSON encoder.
+    """
+
+    def __init__(self, model: Any, schema: type[BaseModel]):
+        self.fields = tuple(schema.model_fields)
+        self.columns = tuple(getattr(model, name) for name in self.fields)
+        self._converters = tuple(_converter_for(field.annotation) for field in schema.model_fields.values())
+
+    def to_dicts(self, rows: Iterable[Any]) -> list[dict[str, Any]]:
+        fields = self.fields
+        if not any(self._converters):
+            return [dict(zip(fields, row)) for row in rows]
+        converters = self._converters
+        return [
+            {
+                name: convert(value) if convert is not None and value is not None else value
+                for name, convert, value in zip(fields, converters, row)
+            }
+            for row in rows
+        ]
@@ -0,0 +1,41 @@
+"""JSON response classes rendered without the stdlib json encoder."""
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSONResponse encoded with orjson.
+
+    UUIDs, datetimes and enums are handled natively, and UTC datetimes end in
+    "Z", so the output matches Pydantic's JSON for the same values.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
+
+
+class ModelJSONResponse(Response):
+    """
+    Response for an already validated Pydantic model.
+
+    The model's precompiled pydantic-core serializer writes the JSON bytes
+    directly, skipping FastAPI's response_model re-validation and
+    jsonable_encoder pass. Declare response_model on the route so the
+    OpenAPI schema still describes the body.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.__pydantic_serializer__.to_json(content)
@@ -1,32 +1,75 @@
 """Security and authentication helpers for local and Clerk JWT validation."""
+import hashlib
+import time
+
 import bcrypt
 import jwt
 from datetime import datetime, timedelta
 from functools import wraps
 from typing import Callable, Optional
 
-from clerk_backend_api import Clerk
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.core.database import AsyncSessionLocal
+from app.core.database import get_db
+from app.core.jwks import JWKSCache
+from app.core.metrics import iris_auth_user_cache_total
+from app.core.ownership import AuthzContext, load_authz_context
 from app.domain.users.models import User
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
 
-# Clerk client for JWT validation (only used when AUTH_PROVIDER=clerk)
-clerk_client: Optional[Clerk] = None
-if settings.AUTH_PROVIDER == "clerk" and settings.CLERK_API_KEY:
-    clerk_client = Clerk(api_key=settings.CLERK_API_KEY)
+# email -> (user_id, role) for authenticated requests; invalidated by UserService
+user_cache = TTLCache(
+    max_entries=settings.AUTH_USER_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AUTH_USER_CACHE_TTL_SECONDS,
+)
+
+# sha256(token) -> verified claims, each entry valid until the token's exp
+token_cache = TTLCache(
+    max_entries=settings.AUTH_TOKEN_CACHE_MAX_ENTRIES,
+    ttl_seconds=0,
+)
+
+# Clerk signing keys, refreshed in the background (only used when AUTH_PROVIDER=clerk)
+clerk_jwks = JWKSCache(
+    jwks_url=settings.CLERK_JWKS_URL,
+    api_key=settings.CLERK_API_KEY,
+    refresh_seconds=settings.CLERK_JWKS_REFRESH_SECONDS,
+)
+
+
+def _token_cache_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+def _get_cached_claims(token: str) -> Optional[dict]:
+    claims = token_cache.get(_token_cache_key(token))
+    # Callers add request-specific keys to the payload, so hand out a copy
+    return dict(claims) if claims is not None else None
+
+
+def _cache_claims(token: str, claims: dict) -> None:
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        token_cache.set(_token_cache_key(token), dict(claims), ttl_seconds=exp - time.time())
+
+
+def _clerk_authorized_parties() -> set[str]:
+    return {p.strip() for p in settings.CLERK_AUTHORIZED_PARTIES.split(",") if p.strip()}
 
 
 def validate_local_jwt(token: str) -> dict:
     """
     Validate local JWT token signed with APP_SECRET.
     
+    Verified claims are cached by token hash until the token expires.
+    
     Args:
         token: JWT token from Authorization header
     
@@ -42,19 +85,29 @@ def validate_local_jwt(token: str) -> dict:
             detail="APP_SECRET not configured for local authentication"
         )
     
+    cached = _get_cached_claims(token)
+    if cached is not None:
+        return cached
+    
     try:
         decoded = jwt.decode(token, settings.APP_SECRET, algorithms=["HS256"])
-        return decoded
     except jwt.InvalidTokenError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Invalid authentication token: {str(e)}"
         )
+    _cache_claims(token, decoded)
+    return decoded
 
 
-def validate_clerk_jwt(token: str) -> dict:
+async def validate_clerk_jwt(token: str) -> dict:
     """
-    Validate Clerk JWT token (placeholder for future Clerk integration).
+    Validate a Clerk session JWT against the cached Clerk JWKS.
+    
+    Verified claims are cached by token hash until the token expires, and
+    signing keys come from clerk_jwks, so no network call is made per request.
+    The issuer must be CLERK_ISSUER and, when CLERK_AUTHORIZED_PARTIES is
+    set, the azp claim must name one of those origins.
     
     Args:
         token: JWT token from Authorization header
@@ -65,64 +118,112 @@ def validate_clerk_jwt(token: str) -> dict:
     Raises:
         HTTPException: If token is invalid or Clerk is not configured
     """
-    if not clerk_client:
+    if not settings.CLERK_API_KEY or not settings.CLERK_ISSUER:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Clerk authentication is not configured"
         )
+    
+    cached = _get_cached_claims(token)
+    if cached is not None:
+        return cached
+    
     try:
-        decoded = clerk_client.verify_token(token)
-        return decoded
+        kid = jwt.get_unverified_header(token).get("kid")
+        public_key = await clerk_jwks.get_key(kid)
+        if public_key is None:
+            raise jwt.InvalidTokenError("Unknown signing key")
+        decoded = jwt.decode(
+            token,
+            public_key,
+            algorithms=["RS256"],
+            issuer=settings.CLERK_ISSUER,
+            options={"require": ["exp", "iss", "sub"]},
+            leeway=5,
+        )
+        authorized_parties = _clerk_authorized_parties()
+        if authorized_parties and decoded.get("azp") not in authorized_parties:
+            raise jwt.InvalidTokenError("Invalid authorized party")
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Invalid authentication token: {str(e)}"
         )
+    _cache_claims(token, decoded)
+    return decoded
 
 
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db),
 ) -> dict:
     """
     Dependency to extract current user from JWT token.
     Uses AUTH_PROVIDER to determine which validation method to use.
     
+    The email -> (user_id, role) lookup is served from user_cache; on a
+    miss it runs on the request's own DB session, whose read transaction
+    is closed again before the route runs.
+    
     Args:
         credentials: HTTP Bearer credentials from request
+        db: Request-scoped database session
     
     Returns:
-        User information from decoded JWT token
+        User information from decoded JWT token, with the request's
+        AuthzContext under "authz"
     """
     token = credentials.credentials
     if settings.AUTH_PROVIDER == "local":
         payload = validate_local_jwt(token)
     else:
-        payload = validate_clerk_jwt(token)
+        payload = await validate_clerk_jwt(token)
 
     # Resolve email -> user_id and inject into payload for ownership checks
     email = payload.get("email") or payload.get("sub")
+    authz = AuthzContext(user_id=None, role=payload.get("role", ""))
     if email:
         try:
-            async with AsyncSessionLocal() as session:
-                res = await session.execute(
+            row = user_cache.get(email)
+            if row is not None:
+                iris_auth_user_cache_total.labels(result="hit").inc()
+            else:
+                iris_auth_user_cache_total.labels(result="miss").inc()
+                res = await db.execute(
                     select(User.id, User.role).where(User.email == email, User.deleted_at.is_(None))
                 )
                 row = res.first()
                 if row:
-                    user_id, user_role = row
-                    payload["user_id"] = user_id
-                    # Backward-compatible alias expected by existing services
-                    payload["account_id"] = user_id
-                    # Prefer DB role if present
-                    if user_role:
-                        payload["role"] = str(user_role).upper()
+                    row = tuple(row)
+                    user_cache.set(email, row)
+            if row:
+                user_id, user_role = row
+                payload["user_id"] = user_id
+                # Backward-compatible alias expected by existing services
+                payload["account_id"] = user_id
+                # Prefer DB role if present
+                if user_role:
+                    payload["role"] = str(user_role).upper()
+                # Load memberships once; services answer ownership checks from memory
+                authz = await load_authz_context(db, user_id, payload.get("role", ""))
         except Exception:
             # Non-fatal if lookup fails
             pass
+        finally:
+            # End the lookup's read transaction: services that open their own
+            # (session.begin()) get the request session without one in progress
+            if db.in_transaction():
+                await db.rollback()
 
+    payload["authz"] = authz
     return payload
 
 
+def invalidate_cached_user(email: str) -> None:
+    """Drop a cached email -> (user_id, role) lookup after the user changes."""
+    user_cache.invalidate(email)
+
+
 def require_role(*roles: str):
     """
     Dependency to enforce role-based access control (RBAC).
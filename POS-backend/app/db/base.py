@@ -22,6 +22,10 @@ class BaseModel(Base):
     - Consistent timestamp handling (created_at, updated_at)
     - Soft delete support (deleted_at for GDPR compliance)
     - Timezone-aware timestamps (Europe/Stockholm)
+    
+    Relationships are declared with lazy="raise": nothing is loaded implicitly,
+    and repository methods that need related rows say so in their query
+    (selectinload/joinedload options).
     """
     __abstract__ = True
     
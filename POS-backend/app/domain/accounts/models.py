@@ -55,10 +55,10 @@ class Account(BaseModel):
     
     # Relationships
     supplier_memberships: Mapped[list["SupplierMember"]] = relationship(
-        "SupplierMember", back_populates="account", lazy="selectin"
+        "SupplierMember", back_populates="account", lazy="raise"
     )
     restaurant_memberships: Mapped[list["RestaurantMember"]] = relationship(
-        "RestaurantMember", back_populates="account", lazy="selectin"
+        "RestaurantMember", back_populates="account", lazy="raise"
     )
     
     # Indexes for efficient queries
@@ -1,9 +1,8 @@
 """Cart and cart item models."""
 from datetime import datetime
-from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import CheckConstraint, ForeignKey, Index, Integer, Numeric, String
+from sqlalchemy import BigInteger, CheckConstraint, ForeignKey, Index, Integer, Numeric, String, text
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -14,6 +13,7 @@ class CartStatus(str):
     """Cart status enumeration."""
     OPEN = "open"
     CONVERTED = "converted"
+    ABANDONED = "abandoned"
 
 
 class Cart(BaseModel):
@@ -21,7 +21,9 @@ class Cart(BaseModel):
     Shopping cart model for restaurants.
     
     A cart can contain multiple items and is linked to a restaurant.
-    Status is 'open' while building, 'converted' after order creation.
+    Status is 'open' while building, 'converted' after order creation,
+    'abandoned' once left untouched for CART_ABANDON_AFTER_DAYS (see
+    app.workers.maintenance).
     """
     __tablename__ = "carts"
     
@@ -34,14 +36,21 @@ class Cart(BaseModel):
     # Status
     status: Mapped[str] = mapped_column(String(20), nullable=False, default=CartStatus.OPEN, index=True)
     
+    # Totals over live items (in cents), maintained by every item mutation; see carts.totals
+    subtotal_cents: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    tax_cents: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    line_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    
     # Relationships
-    restaurant: Mapped["Restaurant"] = relationship("Restaurant", back_populates="carts", lazy="selectin")
-    items: Mapped[list["CartItem"]] = relationship("CartItem", back_populates="cart", lazy="selectin", cascade="all, delete-orphan")
-    order: Mapped[Optional["Order"]] = relationship("Order", back_populates="cart", uselist=False, lazy="selectin")
+    restaurant: Mapped["Restaurant"] = relationship("Restaurant", back_populates="carts", lazy="raise")
+    items: Mapped[list["CartItem"]] = relationship("CartItem", back_populates="cart", lazy="raise", cascade="all, delete-orphan")
+    orders: Mapped[list["Order"]] = relationship("Order", back_populates="cart", lazy="raise")
     
     # Indexes
     __table_args__ = (
         Index("idx_carts_restaurant_status", "restaurant_id", "status"),
+        Index("idx_carts_open_updated", "updated_at", postgresql_where=text("status = 'open'")),
+        CheckConstraint("line_count >= 0", name="ck_carts_line_count"),
     )
     
     def __repr__(self):
@@ -67,8 +76,8 @@ class CartItem(BaseModel):
     tax_rate: Mapped[float] = mapped_column(Numeric(5, 2), nullable=False)  # 0-100%
     
     # Relationships
-    cart: Mapped["Cart"] = relationship("Cart", back_populates="items", lazy="selectin")
-    product: Mapped["Product"] = relationship("Product", back_populates="cart_items", lazy="selectin")
+    cart: Mapped["Cart"] = relationship("Cart", back_populates="items", lazy="raise")
+    product: Mapped["Product"] = relationship("Product", back_populates="cart_items", lazy="raise")
     
     # Indexes and constraints
     __table_args__ = (
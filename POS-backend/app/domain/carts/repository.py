@@ -1,11 +1,14 @@
 """Cart repository: carts and cart items data access and mutations."""
-from typing import Optional
+from datetime import datetime
+from typing import Iterable, Optional
 from uuid import UUID
 
 from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.batching import batch_of
 from app.domain.carts.models import Cart, CartItem, CartStatus
+from app.domain.carts.totals import line_amounts
 from app.domain.products.models import Product
 
 
@@ -16,17 +19,33 @@ class CartRepository:
         self.session = session
 
     async def create_cart(self, restaurant_id: UUID, created_by_account_id: UUID) -> Cart:
-        cart = Cart(restaurant_id=restaurant_id, created_by_account_id=created_by_account_id, status=CartStatus.OPEN)
+        cart = Cart(restaurant_id=restaurant_id, created_by_user_id=created_by_account_id, status=CartStatus.OPEN)
         self.session.add(cart)
         await self.session.commit()
         await self.session.refresh(cart)
         return cart
 
-    async def get_cart(self, cart_id: UUID) -> Optional[Cart]:
+    async def get_cart(self, cart_id: UUID, for_update: bool = False) -> Optional[Cart]:
         stmt = select(Cart).where(Cart.id == cart_id, Cart.deleted_at.is_(None))
+        if for_update:
+            # Serializes with order creation, which locks the cart the same way
+            stmt = stmt.with_for_update()
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
+    @staticmethod
+    def adjust_totals(cart: Cart, item: CartItem, sign: int) -> None:
+        """
+        Add (sign=1) or subtract (sign=-1) an item's line amounts to the cart totals.
+
+        The cart must have been loaded with for_update=True: the new absolute
+        values are written with the next flush.
+        """
+        subtotal_cents, tax_cents = line_amounts(item.unit_price_cents, item.qty, item.tax_rate)
+        cart.subtotal_cents += sign * subtotal_cents
+        cart.tax_cents += sign * tax_cents
+        cart.line_count += sign
+
     async def add_item(self, cart: Cart, product: Product, qty: float) -> CartItem:
         item = CartItem(
             cart_id=cart.id,
@@ -36,6 +55,7 @@ class CartRepository:
             tax_rate=product.tax_rate,
         )
         self.session.add(item)
+        self.adjust_totals(cart, item, 1)
         await self.session.commit()
         await self.session.refresh(item)
         return item
@@ -45,21 +65,88 @@ class CartRepository:
         res = await self.session.execute(stmt)
         return res.scalar_one_or_none()
 
-    async def update_item_qty(self, item: CartItem, qty: float) -> CartItem:
-        item.qty = qty
-        await self.session.execute(
-            update(CartItem).where(CartItem.id == item.id).values(qty=qty)
+    async def get_items(self, cart_id: UUID, item_ids: Iterable[UUID]) -> dict[UUID, CartItem]:
+        """Live items of a cart by ID, in one SELECT; unknown IDs are left out."""
+        stmt = select(CartItem).where(
+            CartItem.id.in_(list(item_ids)), CartItem.cart_id == cart_id, CartItem.deleted_at.is_(None)
         )
+        return {item.id: item for item in (await self.session.execute(stmt)).scalars().all()}
+
+    async def list_items(self, cart_id: UUID) -> list[CartItem]:
+        stmt = (
+            select(CartItem)
+            .where(CartItem.cart_id == cart_id, CartItem.deleted_at.is_(None))
+            .order_by(CartItem.created_at, CartItem.id)
+        )
+        return list((await self.session.execute(stmt)).scalars().all())
+
+    @staticmethod
+    def set_totals(cart: Cart, items: Iterable[CartItem]) -> None:
+        """
+        Set the cart totals to the sum of the given live items' line amounts.
+
+        Like adjust_totals, the cart must have been loaded with for_update=True.
+        """
+        subtotal_cents = tax_cents = line_count = 0
+        for item in items:
+            line_subtotal, line_tax = line_amounts(item.unit_price_cents, item.qty, item.tax_rate)
+            subtotal_cents += line_subtotal
+            tax_cents += line_tax
+            line_count += 1
+        cart.subtotal_cents = subtotal_cents
+        cart.tax_cents = tax_cents
+        cart.line_count = line_count
+
+    async def apply_batch(self, cart: Cart, new_items: list[CartItem]) -> list[CartItem]:
+        """
+        Commit a batch and return the cart's live items afterwards.
+
+        new_items are inserted and the item changes already made in this
+        session (qty, deleted_at) are flushed first; the totals are then set
+        once from the resulting live lines, which are read anyway for the
+        response, so the cart row is written once per batch.
+        """
+        self.session.add_all(new_items)
+        await self.session.flush()
+        items = await self.list_items(cart.id)
+        self.set_totals(cart, items)
+        await self.session.commit()
+        return items
+
+    async def update_item_qty(self, cart: Cart, item: CartItem, qty: float) -> CartItem:
+        self.adjust_totals(cart, item, -1)
+        item.qty = qty
+        self.adjust_totals(cart, item, 1)
+        # One flush writes the item and the cart totals
         await self.session.commit()
         await self.session.refresh(item)
         return item
 
-    async def delete_item(self, item: CartItem) -> None:
+    async def delete_item(self, cart: Cart, item: CartItem) -> None:
         from datetime import datetime, timezone
+        self.adjust_totals(cart, item, -1)
         await self.session.execute(
             update(CartItem).where(CartItem.id == item.id).values(deleted_at=datetime.now(timezone.utc))
         )
         await self.session.commit()
 
+    async def abandon_stale(self, idle_before: datetime, limit: int) -> int:
+        """
+        Mark up to `limit` open carts untouched since `idle_before` as abandoned.
 
-
+        Item mutations bump the cart's updated_at (through the totals update)
+        and hold its row lock, so carts in active use are skipped. Returns the
+        number of carts marked; the caller commits.
+        """
+        stale = batch_of(
+            self.session,
+            Cart,
+            Cart.status == CartStatus.OPEN,
+            Cart.updated_at < idle_before,
+            Cart.deleted_at.is_(None),
+            limit=limit,
+        )
+        result = await self.session.execute(
+            update(Cart).where(stale).values(status=CartStatus.ABANDONED).execution_options(synchronize_session=False)
+        )
+        return result.rowcount
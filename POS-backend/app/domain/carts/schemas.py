@@ -1,9 +1,11 @@
 """Pydantic schemas for carts and cart items."""
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, Literal, Optional, Union
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, Field
+
+from app.core.config import settings
 
 
 class CartCreate(BaseModel):
@@ -14,8 +16,12 @@ class CartCreate(BaseModel):
 class CartResponse(BaseModel):
     id: UUID
     restaurant_id: UUID
-    created_by_account_id: UUID
+    # Read from Cart.created_by_user_id; the API keeps the account_id name
+    created_by_account_id: UUID = Field(validation_alias=AliasChoices("created_by_account_id", "created_by_user_id"))
     status: str
+    subtotal_cents: int
+    tax_cents: int
+    line_count: int
     created_at: datetime
     updated_at: datetime
 
@@ -46,4 +52,38 @@ class CartItemResponse(BaseModel):
         from_attributes = True
 
 
+class CartItemAdd(BaseModel):
+    """Batch operation: add a product line (priced at the current product price)."""
+    op: Literal["add"]
+    product_id: UUID
+    qty: float = Field(..., gt=0)
+
+
+class CartItemSetQty(BaseModel):
+    """Batch operation: change the quantity of an existing line."""
+    op: Literal["update"]
+    item_id: UUID
+    qty: float = Field(..., gt=0)
+
+
+class CartItemRemove(BaseModel):
+    """Batch operation: remove an existing line."""
+    op: Literal["remove"]
+    item_id: UUID
+
+
+CartItemOperation = Annotated[Union[CartItemAdd, CartItemSetQty, CartItemRemove], Field(discriminator="op")]
+
 
+class CartItemsBatch(BaseModel):
+    """Add/update/remove operations applied in order, all or nothing."""
+    operations: list[CartItemOperation] = Field(..., min_length=1, max_length=settings.CART_BATCH_MAX_OPERATIONS)
+
+
+class CartItemsBatchResponse(BaseModel):
+    """The cart's totals and items after the batch."""
+    cart_id: UUID
+    subtotal_cents: int
+    tax_cents: int
+    line_count: int
+    items: list[CartItemResponse]
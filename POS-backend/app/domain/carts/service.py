@@ -1,13 +1,15 @@
 """Cart service with ownership checks and item operations."""
+from datetime import datetime, timezone
+from typing import Sequence
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.errors import NotFoundError, ConflictError
-from app.core.ownership import check_restaurant_ownership
-from app.domain.carts.models import CartStatus
+from app.core.ownership import AuthzContext
+from app.domain.carts.models import CartItem, CartStatus
 from app.domain.carts.repository import CartRepository
-from app.domain.carts.schemas import CartItemUpdate
+from app.domain.carts.schemas import CartItemAdd, CartItemOperation, CartItemRemove, CartItemUpdate
 from app.domain.products.repository import ProductRepository
 
 
@@ -19,27 +21,26 @@ class CartService:
         self.repo = CartRepository(session)
         self.product_repo = ProductRepository(session)
 
-    async def create_cart(self, restaurant_id: UUID, current_account_id: UUID, current_role: str):
-        owns = await check_restaurant_ownership(self.session, current_role, current_account_id, restaurant_id)
-        if not owns:
+    async def create_cart(self, restaurant_id: UUID, authz: AuthzContext):
+        if not authz.owns_restaurant(restaurant_id):
             from fastapi import HTTPException, status
 
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden: not owner of restaurant")
-        return await self.repo.create_cart(restaurant_id=restaurant_id, created_by_account_id=current_account_id)
+        return await self.repo.create_cart(restaurant_id=restaurant_id, created_by_account_id=authz.user_id)
 
-    async def get_cart(self, cart_id: UUID, current_account_id: UUID, current_role: str):
-        cart = await self.repo.get_cart(cart_id)
+    async def get_cart(self, cart_id: UUID, authz: AuthzContext, for_update: bool = False):
+        cart = await self.repo.get_cart(cart_id, for_update=for_update)
         if not cart:
             raise NotFoundError(f"Cart {cart_id} not found")
-        owns = await check_restaurant_ownership(self.session, current_role, current_account_id, cart.restaurant_id)
-        if not owns:
+        if not authz.owns_restaurant(cart.restaurant_id):
             from fastapi import HTTPException, status
 
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden: not owner of restaurant")
         return cart
 
-    async def add_item(self, cart_id: UUID, product_id: UUID, qty: float, current_account_id: UUID, current_role: str):
-        cart = await self.get_cart(cart_id, current_account_id, current_role)
+    async def add_item(self, cart_id: UUID, product_id: UUID, qty: float, authz: AuthzContext):
+        # Item mutations lock the cart first: its totals change in the same transaction
+        cart = await self.get_cart(cart_id, authz, for_update=True)
         if cart.status != CartStatus.OPEN:
             raise ConflictError("Cart is not open")
 
@@ -49,23 +50,66 @@ class CartService:
 
         return await self.repo.add_item(cart, product, qty)
 
-    async def update_item(self, cart_id: UUID, item_id: UUID, data: CartItemUpdate, current_account_id: UUID, current_role: str):
-        cart = await self.get_cart(cart_id, current_account_id, current_role)
+    async def update_item(self, cart_id: UUID, item_id: UUID, data: CartItemUpdate, authz: AuthzContext):
+        cart = await self.get_cart(cart_id, authz, for_update=True)
         if cart.status != CartStatus.OPEN:
             raise ConflictError("Cart is not open")
         item = await self.repo.get_item(cart_id, item_id)
         if not item:
             raise NotFoundError(f"Cart item {item_id} not found")
-        return await self.repo.update_item_qty(item, data.qty)
+        return await self.repo.update_item_qty(cart, item, data.qty)
 
-    async def delete_item(self, cart_id: UUID, item_id: UUID, current_account_id: UUID, current_role: str):
-        cart = await self.get_cart(cart_id, current_account_id, current_role)
+    async def delete_item(self, cart_id: UUID, item_id: UUID, authz: AuthzContext):
+        cart = await self.get_cart(cart_id, authz, for_update=True)
         if cart.status != CartStatus.OPEN:
             raise ConflictError("Cart is not open")
         item = await self.repo.get_item(cart_id, item_id)
         if not item:
             raise NotFoundError(f"Cart item {item_id} not found")
-        await self.repo.delete_item(item)
-
-
+        await self.repo.delete_item(cart, item)
+
+    async def apply_item_batch(self, cart_id: UUID, operations: Sequence[CartItemOperation], authz: AuthzContext):
+        """
+        Apply add/update/remove operations in order, in one transaction.
+
+        The cart is locked and ownership checked once; all product prices are
+        read in one SELECT and all referenced items in another, however many
+        operations there are. Item operations are applied first and the cart
+        totals are recomputed once afterwards. Any invalid operation rejects
+        the whole batch. Returns the cart (with its updated totals) and its
+        items afterwards.
+        """
+        cart = await self.get_cart(cart_id, authz, for_update=True)
+        if cart.status != CartStatus.OPEN:
+            raise ConflictError("Cart is not open")
 
+        product_ids = {op.product_id for op in operations if isinstance(op, CartItemAdd)}
+        item_ids = {op.item_id for op in operations if not isinstance(op, CartItemAdd)}
+        prices = await self.product_repo.get_prices(list(product_ids)) if product_ids else {}
+        items = await self.repo.get_items(cart_id, item_ids) if item_ids else {}
+
+        now = datetime.now(timezone.utc)
+        new_items: list[CartItem] = []
+        for index, op in enumerate(operations):
+            if isinstance(op, CartItemAdd):
+                price = prices.get(op.product_id)
+                if price is None:
+                    raise NotFoundError(f"operations[{index}]: Product {op.product_id} not found")
+                item = CartItem(
+                    cart_id=cart.id,
+                    product_id=op.product_id,
+                    qty=op.qty,
+                    unit_price_cents=price.price_cents,
+                    tax_rate=price.tax_rate,
+                )
+                new_items.append(item)
+                continue
+            item = items.get(op.item_id)
+            if item is None or item.deleted_at is not None:
+                raise NotFoundError(f"operations[{index}]: Cart item {op.item_id} not found")
+            if isinstance(op, CartItemRemove):
+                item.deleted_at = now
+            else:
+                item.qty = op.qty
+
+        return cart, await self.repo.apply_batch(cart, new_items)
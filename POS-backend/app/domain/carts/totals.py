@@ -0,0 +1,25 @@
+"""Cart line amounts in integer cents, shared by cart maintenance and order placement."""
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any
+
+_ONE = Decimal(1)
+_HUNDRED = Decimal(100)
+
+
+def _decimal(value: Any) -> Decimal:
+    # str() keeps float inputs (API qty, SQLite Numeric) at their printed value
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def line_amounts(unit_price_cents: int, qty: Any, tax_rate: Any) -> tuple[int, int]:
+    """
+    (subtotal_cents, tax_cents) of one cart line.
+
+    Tax is taken on the unrounded line amount and both are rounded half up,
+    the same as round() on PostgreSQL numerics, so totals summed line by
+    line in SQL agree with the stored cart totals.
+    """
+    amount = unit_price_cents * _decimal(qty)
+    subtotal = int(amount.quantize(_ONE, rounding=ROUND_HALF_UP))
+    tax = int((amount * _decimal(tax_rate) / _HUNDRED).quantize(_ONE, rounding=ROUND_HALF_UP))
+    return subtotal, tax
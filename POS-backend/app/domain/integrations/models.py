@@ -52,12 +52,12 @@ class SupplierConnection(BaseModel):
     )
     
     # Relationships
-    restaurant: Mapped["Restaurant"] = relationship("Restaurant", back_populates="supplier_connections")
+    restaurant: Mapped["Restaurant"] = relationship("Restaurant", back_populates="supplier_connections", lazy="raise")
     session_secret: Mapped[Optional["SupplierSessionSecret"]] = relationship(
-        "SupplierSessionSecret", back_populates="connection", uselist=False
+        "SupplierSessionSecret", back_populates="connection", uselist=False, lazy="raise"
     )
     catalog_cache: Mapped[list["SupplierCatalogCache"]] = relationship(
-        "SupplierCatalogCache", back_populates="connection", cascade="all, delete-orphan"
+        "SupplierCatalogCache", back_populates="connection", lazy="raise", cascade="all, delete-orphan"
     )
     
     # Indexes
@@ -99,7 +99,7 @@ class SupplierSessionSecret(BaseModel):
     )
     
     # Relationships
-    connection: Mapped["SupplierConnection"] = relationship("SupplierConnection", back_populates="session_secret")
+    connection: Mapped["SupplierConnection"] = relationship("SupplierConnection", back_populates="session_secret", lazy="raise")
     
     # Indexes
     __table_args__ = (
@@ -142,7 +142,7 @@ class SupplierCatalogCache(BaseModel):
     )
     
     # Relationships
-    connection: Mapped["SupplierConnection"] = relationship("SupplierConnection", back_populates="catalog_cache")
+    connection: Mapped["SupplierConnection"] = relationship("SupplierConnection", back_populates="catalog_cache", lazy="raise")
     
     # Indexes
     __table_args__ = (
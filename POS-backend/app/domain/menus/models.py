@@ -34,7 +34,7 @@ class RestaurantMenuItem(BaseModel):
     position: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # sorting within category
 
     # Relationships
-    restaurant: Mapped["Restaurant"] = relationship("Restaurant", back_populates="menu_items", lazy="selectin")
+    restaurant: Mapped["Restaurant"] = relationship("Restaurant", back_populates="menu_items", lazy="raise")
 
     __table_args__ = (
         Index("idx_menu_items_restaurant_category", "restaurant_id", "category"),
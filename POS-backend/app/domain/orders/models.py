@@ -3,7 +3,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import CheckConstraint, ForeignKey, Index, Integer, String
+from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Index, Integer, LargeBinary, String
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -30,13 +30,15 @@ class Order(BaseModel):
     Order model for B2B transactions.
     
     Represents a completed purchase from a restaurant to a supplier.
+    A cart checked out with products from several suppliers yields one
+    order per supplier (unique per cart and supplier).
     Includes state machine with valid transitions (placed → confirmed → delivered).
     All monetary values in minor units (cents).
     """
     __tablename__ = "orders"
     
     # Relationships
-    cart_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("carts.id"), nullable=False, unique=True, index=True)
+    cart_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("carts.id"), nullable=False)
     buyer_restaurant_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("restaurants.id"), nullable=False, index=True)
     supplier_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("suppliers.id"), nullable=False, index=True)
     created_by_account_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), nullable=False, index=True)
@@ -56,15 +58,17 @@ class Order(BaseModel):
     delivered_at: Mapped[Optional[datetime]] = mapped_column(nullable=True, default=None)
     
     # Relationships
-    cart: Mapped["Cart"] = relationship("Cart", back_populates="order", lazy="selectin")
-    restaurant: Mapped["Restaurant"] = relationship("Restaurant", back_populates="orders", lazy="selectin")
-    supplier: Mapped["Supplier"] = relationship("Supplier", back_populates="orders", lazy="selectin")
+    cart: Mapped["Cart"] = relationship("Cart", back_populates="orders", lazy="raise")
+    restaurant: Mapped["Restaurant"] = relationship("Restaurant", back_populates="orders", lazy="raise")
+    supplier: Mapped["Supplier"] = relationship("Supplier", back_populates="orders", lazy="raise")
     
     # Indexes and constraints
     __table_args__ = (
+        Index("uq_orders_cart_supplier", "cart_id", "supplier_id", unique=True),
         Index("idx_orders_restaurant_supplier_status", "buyer_restaurant_id", "supplier_id", "status", "created_at"),
         Index("idx_orders_status", "status"),
         Index("idx_orders_created_at", "created_at"),
+        Index("idx_orders_created_id", "created_at", "id"),
         CheckConstraint("total_cents >= tax_cents", name="ck_orders_total_cents"),
         CheckConstraint("tax_cents >= 0", name="ck_orders_tax_cents"),
     )
@@ -79,6 +83,10 @@ class IdempotencyKey(BaseModel):
     
     Stores key, order_id, and timestamp for deduplication.
     Used to return existing order response on retry with same key.
+    
+    Also backs PostgresIdempotencyStore (app.core.idempotency): those rows
+    carry a request fingerprint, the stored response once complete, and an
+    expires_at after which the key can be reused.
     """
     __tablename__ = "idempotency_keys"
     
@@ -91,13 +99,19 @@ class IdempotencyKey(BaseModel):
     # Timestamp (for cleanup)
     created_at: Mapped[datetime] = mapped_column(nullable=False, index=True)
     
+    # Generic idempotency store (null for keys written by order creation)
+    fingerprint: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    response: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+    expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    
     # Relationships
-    order: Mapped[Optional["Order"]] = relationship("Order", foreign_keys=[order_id], lazy="selectin")
+    order: Mapped[Optional["Order"]] = relationship("Order", foreign_keys=[order_id], lazy="raise")
     
     # Indexes
     __table_args__ = (
         Index("idx_idempotency_keys_key", "key", unique=True),
         Index("idx_idempotency_keys_order", "order_id"),
+        Index("idx_idempotency_keys_expires", "expires_at"),
     )
     
     def __repr__(self):
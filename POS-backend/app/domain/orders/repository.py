@@ -1,14 +1,39 @@
 """Order repository with transactional creation and state transitions."""
+import hashlib
 from datetime import datetime, timezone
-from typing import Optional
+from decimal import Decimal
+from typing import Any, Optional
 from uuid import UUID
 
-from sqlalchemy import Select, and_, func, select, text, update
+from sqlalchemy import Numeric, Select, and_, case, column, delete, exists, func, or_, select, text, update, values
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
+from app.core.batching import batch_of
+from app.core.pagination import count_rows, keyset_page, listing_version, split_page
 from app.domain.carts.models import Cart, CartItem, CartStatus
+from app.domain.carts.totals import line_amounts
 from app.domain.orders.models import IdempotencyKey, Order, OrderStatus
+from app.domain.products.cache import catalog_cache
 from app.domain.products.models import Product
+from app.domain.restaurants.models import RestaurantMember
+from app.domain.suppliers.models import SupplierMember
+
+# Idempotency key scopes, matching the endpoints' idempotent() scopes: the same
+# Idempotency-Key sent to POST /orders and POST /orders/checkout claims two keys
+CREATE_ORDER_SCOPE = "orders.create"
+CHECKOUT_SCOPE = "orders.checkout"
+
+_KEY_COLUMN_LENGTH = IdempotencyKey.__table__.c.key.type.length
+
+
+def scoped_idempotency_key(scope: str, key: str) -> str:
+    """`scope:key` as stored in idempotency_keys; keys too long for the column are digested."""
+    scoped = f"{scope}:{key}"
+    if len(scoped) <= _KEY_COLUMN_LENGTH:
+        return scoped
+    return f"{scope}:sha256:{hashlib.sha256(key.encode('utf-8')).hexdigest()}"
 
 
 class OrderRepository:
@@ -22,14 +47,21 @@ class OrderRepository:
         res = await self.session.execute(stmt)
         return res.scalar_one_or_none()
 
-    async def list_all(
+    async def get_version(self, order_id: UUID) -> Optional[Any]:
+        """(updated_at, buyer_restaurant_id, supplier_id) of an order: enough to authorize a conditional GET."""
+        stmt = select(Order.updated_at, Order.buyer_restaurant_id, Order.supplier_id).where(
+            Order.id == order_id, Order.deleted_at.is_(None)
+        )
+        return (await self.session.execute(stmt)).first()
+
+    def _filtered_query(
         self,
-        limit: int = 50,
-        offset: int = 0,
         restaurant_id: Optional[UUID] = None,
         supplier_id: Optional[UUID] = None,
         status: Optional[str] = None,
-    ) -> tuple[list[Order], int]:
+        member_user_id: Optional[UUID] = None,
+    ) -> Select:
+        """Unpaginated order listing query shared by list_all and list_version."""
         base = select(Order).where(Order.deleted_at.is_(None))
         if restaurant_id:
             base = base.where(Order.buyer_restaurant_id == restaurant_id)
@@ -37,16 +69,108 @@ class OrderRepository:
             base = base.where(Order.supplier_id == supplier_id)
         if status:
             base = base.where(Order.status == status)
+        if member_user_id is not None:
+            restaurant_member = exists().where(
+                RestaurantMember.restaurant_id == Order.buyer_restaurant_id,
+                RestaurantMember.user_id == member_user_id,
+            )
+            supplier_member = exists().where(
+                SupplierMember.supplier_id == Order.supplier_id,
+                SupplierMember.user_id == member_user_id,
+            )
+            base = base.where(or_(restaurant_member, supplier_member))
+        return base
+
+    async def list_version(
+        self,
+        restaurant_id: Optional[UUID] = None,
+        supplier_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        member_user_id: Optional[UUID] = None,
+    ) -> tuple[int, Optional[datetime]]:
+        """(count, max(updated_at)) of the filtered listing, for list ETags."""
+        return await listing_version(
+            self.session,
+            self._filtered_query(
+                restaurant_id=restaurant_id,
+                supplier_id=supplier_id,
+                status=status,
+                member_user_id=member_user_id,
+            ),
+            Order,
+        )
+
+    async def list_all(
+        self,
+        limit: int = 50,
+        offset: int = 0,
+        restaurant_id: Optional[UUID] = None,
+        supplier_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        member_user_id: Optional[UUID] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+    ) -> tuple[list[Order], Optional[int], Optional[str]]:
+        """
+        List orders with filters and offset or cursor pagination.
+
+        When member_user_id is given, only orders whose buyer restaurant or
+        supplier the user is a member of are returned. For offset pages the
+        permission filtering, counting and pagination happen in a single query.
+
+        Returns:
+            Tuple of (orders list, total count or None, next page cursor)
+        """
+        base = self._filtered_query(
+            restaurant_id=restaurant_id,
+            supplier_id=supplier_id,
+            status=status,
+            member_user_id=member_user_id,
+        )
 
-        count = (await self.session.execute(select(func.count()).select_from(base.subquery()))).scalar_one()
-        result = await self.session.execute(base.order_by(Order.created_at.desc()).limit(limit).offset(offset))
-        return list(result.scalars().all()), count
+        # The window count sees every filtered row, but a cursor predicate would hide
+        # earlier pages from it, so cursor pages count separately
+        windowed = include_total and not cursor
+        stmt = base.add_columns(func.count().over().label("total")) if windowed else base
+        rows = (await self.session.execute(keyset_page(stmt, Order, limit=limit, offset=offset, cursor=cursor))).all()
+        orders, next_cursor = split_page([row[0] for row in rows], limit)
+
+        total: Optional[int] = None
+        if windowed and rows:
+            total = rows[0].total
+        elif include_total:
+            # Cursor page, or offset page past the end with no row to carry the window count
+            total = await count_rows(self.session, base) if (cursor or offset) else 0
+        return orders, total, next_cursor
 
     async def get_idempotency(self, key: str) -> Optional[IdempotencyKey]:
         stmt = select(IdempotencyKey).where(IdempotencyKey.key == key)
         res = await self.session.execute(stmt)
         return res.scalar_one_or_none()
 
+    async def purge_idempotency_keys(self, expired_before: datetime, created_before: datetime, limit: int) -> int:
+        """
+        Delete up to `limit` idempotency keys that can no longer be replayed.
+
+        Store keys (app.core.idempotency) go once expires_at has passed; an
+        expired in-progress reservation is free for reuse anyway. Keys written
+        by order creation have no expiry and go once created before
+        `created_before`. Returns the number deleted; the caller commits.
+        """
+        expired = batch_of(
+            self.session,
+            IdempotencyKey,
+            or_(
+                IdempotencyKey.expires_at < expired_before,
+                and_(IdempotencyKey.expires_at.is_(None), IdempotencyKey.created_at < created_before),
+            ),
+            limit=limit,
+        )
+        result = await self.session.execute(
+            delete(IdempotencyKey).where(expired).execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
     async def create_order_transactional(
         self,
         *,
@@ -60,77 +184,41 @@ class OrderRepository:
         """
         Transactional order creation with SELECT ... FOR UPDATE and stock decrement.
         Enforces idempotency via idempotency_keys table.
+
+        Products are locked, checked and decremented set-wise, so the number of
+        round trips does not grow with the number of cart lines. Order totals
+        are the cart's stored totals once its line count, subtotal and tax
+        check out against the lines.
         """
+        claim_key = scoped_idempotency_key(CREATE_ORDER_SCOPE, idempotency_key)
         async with self.session.begin():
-            existing_key = await self.get_idempotency(idempotency_key)
-            if existing_key and existing_key.order_id:
+            existing_order_id = await self._claim_idempotency_key(claim_key)
+            if existing_order_id:
                 # Return existing order
-                order = await self.get_by_id(existing_key.order_id)
+                order = await self.get_by_id(existing_order_id)
                 if order:
                     return order
-            elif existing_key:
-                # In-progress duplicate
                 from app.core.errors import ConflictError
 
-                raise ConflictError("Duplicate idempotency key in progress")
+                raise ConflictError("Idempotency key already used")
 
-            # Insert idempotency key placeholder
-            new_key = IdempotencyKey(
-                key=idempotency_key,
-                order_id=None,
-                created_at=datetime.now(timezone.utc),
-            )
-            self.session.add(new_key)
+            cart = await self._lock_open_cart(cart_id)
 
-            # Lock cart and items
-            cart = (
-                await self.session.execute(
-                    select(Cart).where(Cart.id == cart_id, Cart.deleted_at.is_(None)).with_for_update()
-                )
-            ).scalar_one_or_none()
-            if not cart or cart.status != CartStatus.OPEN:
-                from app.core.errors import ConflictError
-
-                raise ConflictError("Cart not open or not found")
-
-            items = (
-                await self.session.execute(
-                    select(CartItem).where(CartItem.cart_id == cart_id, CartItem.deleted_at.is_(None)).with_for_update()
-                )
-            ).scalars().all()
-            if not items:
+            # Cart item mutations hold the cart lock taken above, so the stored
+            # totals are current; one grouped query gives the stock quantities
+            # and the line count, subtotal and tax to verify them against
+            requested_qty, summary = await self._cart_quantities(cart_id)
+            if not summary[0]:
                 from app.core.errors import ConflictError
 
                 raise ConflictError("Cart is empty")
+            if summary == (cart.line_count, cart.subtotal_cents, cart.tax_cents):
+                total_cents, tax_cents = cart.subtotal_cents, cart.tax_cents
+            else:
+                # Totals drifted (lines written outside CartRepository): recompute from the lines
+                total_cents, tax_cents = await self._cart_line_totals(cart_id)
 
-            total_cents = 0
-            tax_cents = 0
-
-            # Lock products and check stock
-            for item in items:
-                product = (
-                    await self.session.execute(
-                        select(Product).where(Product.id == item.product_id, Product.deleted_at.is_(None)).with_for_update()
-                    )
-                ).scalar_one_or_none()
-                if not product:
-                    from app.core.errors import ConflictError
-
-                    raise ConflictError("Product not found during order creation")
-                # Quantity is numeric; convert to int cents math using stored snapshot
-                line_total = int(item.unit_price_cents) * float(item.qty)
-                total_cents += int(round(line_total))
-                tax_cents += int(round(line_total * float(item.tax_rate) / 100.0))
-
-                if product.stock_qty is not None and product.stock_qty < float(item.qty):
-                    from app.core.errors import ConflictError
-
-                    raise ConflictError("Insufficient inventory")
-
-                # Decrement stock
-                await self.session.execute(
-                    update(Product).where(Product.id == product.id).values(stock_qty=Product.stock_qty - item.qty)
-                )
+            supplier_ids = await self._reserve_stock(requested_qty)
 
             # Create order
             order = Order(
@@ -153,13 +241,262 @@ class OrderRepository:
             await self.session.flush()
             # Link idempotency key
             await self.session.execute(
-                update(IdempotencyKey).where(IdempotencyKey.key == idempotency_key).values(order_id=order.id)
+                update(IdempotencyKey).where(IdempotencyKey.key == claim_key).values(order_id=order.id)
             )
 
+        # Stock levels are part of cached product data; only entries showing these products change
+        await catalog_cache.invalidate_stock(requested_qty, supplier_ids)
+
         # Outside transaction, refresh
         await self.session.refresh(order)
         return order
 
+    async def checkout_transactional(
+        self,
+        *,
+        idempotency_key: str,
+        cart_id: UUID,
+        buyer_restaurant_id: UUID,
+        created_by_account_id: UUID,
+        payment_method: str,
+    ) -> tuple[list[Order], bool]:
+        """
+        Check out a cart as one order per supplier in a single transaction.
+
+        Lines are grouped by Product.supplier_id. Stock for all lines is
+        reserved set-wise, as in create_order_transactional, and the orders
+        are inserted together, so the number of round trips grows with
+        neither the lines nor the suppliers of the cart.
+
+        Returns:
+            The orders (ordered by supplier_id) and whether they were placed
+            now; False when the idempotency key had already produced them
+        """
+        claim_key = scoped_idempotency_key(CHECKOUT_SCOPE, idempotency_key)
+        async with self.session.begin():
+            existing_order_id = await self._claim_idempotency_key(claim_key)
+            if existing_order_id:
+                orders = await self._sibling_orders(existing_order_id)
+                if orders:
+                    return orders, False
+                from app.core.errors import ConflictError
+
+                raise ConflictError("Idempotency key already used")
+
+            await self._lock_open_cart(cart_id, buyer_restaurant_id)
+
+            # One query gives every live line with its supplier; quantities per
+            # product and totals per supplier are summed from the same rows
+            lines = await self._cart_supplier_lines(cart_id)
+            if not lines:
+                from app.core.errors import ConflictError
+
+                raise ConflictError("Cart is empty")
+            requested_qty: dict[UUID, Decimal] = {}
+            totals: dict[UUID, tuple[int, int]] = {}
+            for product_id, supplier_id, unit_price_cents, qty, tax_rate in lines:
+                requested_qty[product_id] = requested_qty.get(product_id, Decimal(0)) + Decimal(str(qty))
+                subtotal, tax = line_amounts(unit_price_cents, qty, tax_rate)
+                supplier_subtotal, supplier_tax = totals.get(supplier_id, (0, 0))
+                totals[supplier_id] = (supplier_subtotal + subtotal, supplier_tax + tax)
+
+            supplier_ids = await self._reserve_stock(requested_qty)
+
+            orders = [
+                Order(
+                    cart_id=cart_id,
+                    buyer_restaurant_id=buyer_restaurant_id,
+                    supplier_id=supplier_id,
+                    created_by_account_id=created_by_account_id,
+                    status=OrderStatus.PLACED,
+                    total_cents=subtotal,
+                    tax_cents=tax,
+                    payment_method=payment_method,
+                )
+                for supplier_id, (subtotal, tax) in sorted(totals.items())
+            ]
+            self.session.add_all(orders)
+
+            await self.session.execute(
+                update(Cart).where(Cart.id == cart_id).values(status=CartStatus.CONVERTED)
+            )
+
+            # Orders are inserted in one batched INSERT ... RETURNING, which
+            # also loads their server defaults; a retry finds its siblings
+            # through the first order
+            await self.session.flush()
+            await self.session.execute(
+                update(IdempotencyKey).where(IdempotencyKey.key == claim_key).values(order_id=orders[0].id)
+            )
+
+        # Stock levels are part of cached product data; only entries showing these products change
+        await catalog_cache.invalidate_stock(requested_qty, supplier_ids)
+        return orders, True
+
+    async def _claim_idempotency_key(self, key: str) -> Optional[UUID]:
+        """
+        Insert a placeholder for `key` (already scoped to the endpoint), or
+        return the order it already produced.
+
+        Raises:
+            ConflictError: If another transaction holds the key without an order yet
+        """
+        existing_key = await self.get_idempotency(key)
+        if existing_key and existing_key.order_id:
+            return existing_key.order_id
+        if existing_key:
+            # In-progress duplicate
+            from app.core.errors import ConflictError
+
+            raise ConflictError("Duplicate idempotency key in progress")
+
+        # Insert idempotency key placeholder
+        self.session.add(IdempotencyKey(key=key, order_id=None, created_at=datetime.now(timezone.utc)))
+        return None
+
+    async def _lock_open_cart(self, cart_id: UUID, buyer_restaurant_id: Optional[UUID] = None) -> Cart:
+        """
+        Lock an open cart; item mutations take the same lock first.
+
+        Raises:
+            ConflictError: If the cart is missing, not open, or (when
+                buyer_restaurant_id is given) belongs to another restaurant
+        """
+        stmt = select(Cart).where(Cart.id == cart_id, Cart.deleted_at.is_(None)).with_for_update()
+        cart = (await self.session.execute(stmt)).scalar_one_or_none()
+        if (
+            not cart
+            or cart.status != CartStatus.OPEN
+            or (buyer_restaurant_id is not None and cart.restaurant_id != buyer_restaurant_id)
+        ):
+            from app.core.errors import ConflictError
+
+            raise ConflictError("Cart not open or not found")
+        return cart
+
+    async def _sibling_orders(self, order_id: UUID) -> list[Order]:
+        """All live orders placed from the same cart as `order_id`, by supplier_id."""
+        placed = aliased(Order)
+        cart_id = select(placed.cart_id).where(placed.id == order_id).scalar_subquery()
+        stmt = (
+            select(Order)
+            .where(Order.cart_id == cart_id, Order.deleted_at.is_(None))
+            .order_by(Order.supplier_id)
+        )
+        return list((await self.session.execute(stmt)).scalars().all())
+
+    async def _cart_supplier_lines(self, cart_id: UUID) -> list[Any]:
+        """(product_id, supplier_id, unit_price_cents, qty, tax_rate) for each live line of a cart."""
+        stmt = (
+            select(CartItem.product_id, Product.supplier_id, CartItem.unit_price_cents, CartItem.qty, CartItem.tax_rate)
+            .join(Product, Product.id == CartItem.product_id)
+            .where(CartItem.cart_id == cart_id, CartItem.deleted_at.is_(None))
+        )
+        return list((await self.session.execute(stmt)).all())
+
+    async def _reserve_stock(self, requested_qty: dict[UUID, Decimal]) -> set[UUID]:
+        """
+        Lock, check and decrement stock for all requested products at once.
+
+        Returns:
+            Supplier ids of the products
+
+        Raises:
+            ConflictError: If a product is missing or short of stock
+        """
+        # Lock all products in one statement and check stock for the whole cart
+        stock_by_product = await self._lock_products(list(requested_qty))
+        if len(stock_by_product) != len(requested_qty):
+            from app.core.errors import ConflictError
+
+            raise ConflictError("Product not found during order creation")
+        for product_id, qty in requested_qty.items():
+            stock_qty, _ = stock_by_product[product_id]
+            if stock_qty is not None and stock_qty < qty:
+                from app.core.errors import ConflictError
+
+                raise ConflictError("Insufficient inventory")
+
+        # Decrement stock for every line in a single UPDATE ... FROM (VALUES ...)
+        await self._decrement_stock(requested_qty)
+        return {supplier_id for _, supplier_id in stock_by_product.values()}
+
+    async def _cart_quantities(self, cart_id: UUID) -> tuple[dict[UUID, Decimal], tuple[int, int, int]]:
+        """
+        Requested quantity per product, and (line_count, subtotal_cents,
+        tax_cents) over the live lines of a cart.
+
+        Amounts are rounded per line in SQL like line_amounts (round() on
+        PostgreSQL numerics is half up), so they match the stored cart totals.
+        """
+        amount = CartItem.unit_price_cents * CartItem.qty
+        stmt = (
+            select(
+                CartItem.product_id,
+                func.sum(CartItem.qty),
+                func.count(),
+                func.sum(func.round(amount)),
+                func.sum(func.round(amount * CartItem.tax_rate / 100)),
+            )
+            .where(CartItem.cart_id == cart_id, CartItem.deleted_at.is_(None))
+            .group_by(CartItem.product_id)
+        )
+        rows = (await self.session.execute(stmt)).all()
+        requested_qty = {product_id: Decimal(str(qty)) for product_id, qty, _, _, _ in rows}
+        summary = (
+            sum(lines for _, _, lines, _, _ in rows),
+            sum(int(subtotal) for _, _, _, subtotal, _ in rows),
+            sum(int(tax) for _, _, _, _, tax in rows),
+        )
+        return requested_qty, summary
+
+    async def _cart_line_totals(self, cart_id: UUID) -> tuple[int, int]:
+        """(subtotal_cents, tax_cents) summed over the live lines of a cart."""
+        stmt = select(CartItem.unit_price_cents, CartItem.qty, CartItem.tax_rate).where(
+            CartItem.cart_id == cart_id, CartItem.deleted_at.is_(None)
+        )
+        amounts = [line_amounts(*row) for row in (await self.session.execute(stmt)).all()]
+        return sum(subtotal for subtotal, _ in amounts), sum(tax for _, tax in amounts)
+
+    async def _lock_products(self, product_ids: list[UUID]) -> dict[UUID, tuple[Optional[int], UUID]]:
+        """
+        Lock all products of a cart with one SELECT ... FOR UPDATE; returns (stock_qty, supplier_id) by id.
+        Rows are locked in primary key order so concurrent carts sharing
+        products acquire locks in the same order and cannot deadlock.
+        """
+        stmt = (
+            select(Product.id, Product.stock_qty, Product.supplier_id)
+            .where(Product.id.in_(product_ids), Product.deleted_at.is_(None))
+            .order_by(Product.id)
+            .with_for_update()
+        )
+        rows = (await self.session.execute(stmt)).all()
+        return {product_id: (stock_qty, supplier_id) for product_id, stock_qty, supplier_id in rows}
+
+    async def _decrement_stock(self, quantities: dict[UUID, Decimal]) -> None:
+        """Decrement stock for all products with a single bulk UPDATE ... FROM (VALUES ...)."""
+        if self.session.bind.dialect.name == "sqlite":
+            # SQLite cannot alias VALUES columns: the same single UPDATE with a CASE per product
+            qty = case({product_id: qty for product_id, qty in quantities.items()}, value=Product.id)
+            await self.session.execute(
+                update(Product)
+                .where(Product.id.in_(list(quantities)))
+                .values(stock_qty=Product.stock_qty - qty)
+                .execution_options(synchronize_session=False)
+            )
+            return
+        lines = values(
+            column("product_id", PGUUID(as_uuid=True)),
+            column("qty", Numeric(12, 3)),
+            name="lines",
+        ).data(sorted(quantities.items()))
+        await self.session.execute(
+            update(Product)
+            .where(Product.id == lines.c.product_id)
+            .values(stock_qty=Product.stock_qty - lines.c.qty)
+            .execution_options(synchronize_session=False)
+        )
+
     async def set_status(self, order: Order, status: str) -> Order:
         await self.session.execute(
             update(Order).where(Order.id == order.id).values(status=status)
@@ -33,11 +33,27 @@ class OrderResponse(BaseModel):
         from_attributes = True
 
 
+class CheckoutCreate(BaseModel):
+    """Check out a cart as one order per supplier (RESTAURANT owner)."""
+    cart_id: UUID
+    buyer_restaurant_id: UUID
+    payment_method: str = Field("mock")
+
+
+class CheckoutResponse(BaseModel):
+    """Orders placed by a checkout, one per supplier, with their combined totals."""
+    cart_id: UUID
+    orders: list[OrderResponse]
+    total_cents: int
+    tax_cents: int
+
+
 class OrderListResponse(BaseModel):
     data: list[OrderResponse]
-    total: int
+    total: Optional[int]
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
 
 class ReceiptResponse(BaseModel):
@@ -6,10 +6,24 @@ from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.errors import ConflictError, NotFoundError
-from app.core.ownership import check_restaurant_ownership, check_supplier_ownership
+from app.core.ownership import AuthzContext
 from app.domain.orders.models import Order, OrderStatus
 from app.domain.orders.repository import OrderRepository
-from app.domain.orders.schemas import OrderCreate
+from app.domain.orders.schemas import CheckoutCreate, OrderCreate
+
+
+# Sentinel from _member_filter: the caller can see no orders at all
+_NO_ORDERS = object()
+
+
+def _member_filter(authz: Optional[AuthzContext]):
+    """member_user_id for list queries: non-admin callers only see orders they participate in."""
+    if authz is None or authz.is_admin:
+        return None
+    if authz.user_id is None:
+        # Unresolved users participate in no orders
+        return _NO_ORDERS
+    return authz.user_id
 
 
 class OrderService:
@@ -21,12 +35,10 @@ class OrderService:
         self,
         data: OrderCreate,
         idempotency_key: str,
-        current_account_id: UUID,
-        current_role: str,
+        authz: AuthzContext,
     ) -> Order:
         # Ownership: requester must own the buyer restaurant (or admin)
-        owns = await check_restaurant_ownership(self.session, current_role, current_account_id, data.buyer_restaurant_id)
-        if not owns:
+        if not authz.owns_restaurant(data.buyer_restaurant_id):
             from fastapi import HTTPException, status
 
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden: not owner of restaurant")
@@ -39,23 +51,79 @@ class OrderService:
             cart_id=data.cart_id,
             buyer_restaurant_id=data.buyer_restaurant_id,
             supplier_id=data.supplier_id,
-            created_by_account_id=current_account_id,
+            created_by_account_id=authz.user_id,
+            payment_method=data.payment_method,
+        )
+
+    async def checkout(
+        self,
+        data: CheckoutCreate,
+        idempotency_key: str,
+        authz: AuthzContext,
+    ) -> tuple[list[Order], bool]:
+        """
+        Place one order per supplier for a cart.
+
+        Returns the orders and whether they were placed by this call (False
+        when the idempotency key already produced them); OrderPlaced events
+        are the caller's to dispatch once the transaction has committed.
+        """
+        if not authz.owns_restaurant(data.buyer_restaurant_id):
+            from fastapi import HTTPException, status
+
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden: not owner of restaurant")
+
+        if not idempotency_key:
+            raise ConflictError("Missing Idempotency-Key header")
+
+        return await self.repo.checkout_transactional(
+            idempotency_key=idempotency_key,
+            cart_id=data.cart_id,
+            buyer_restaurant_id=data.buyer_restaurant_id,
+            created_by_account_id=authz.user_id,
             payment_method=data.payment_method,
         )
 
-    async def get_order(self, order_id: UUID, current_user_id: UUID, current_role: str) -> Order:
+    async def get_order(self, order_id: UUID, authz: AuthzContext) -> Order:
         order = await self.repo.get_by_id(order_id)
         if not order:
             raise NotFoundError(f"Order {order_id} not found")
         # Access: restaurant members or supplier members (or admin)
-        owns_restaurant = await check_restaurant_ownership(self.session, current_role, current_user_id, order.buyer_restaurant_id)
-        owns_supplier = await check_supplier_ownership(self.session, current_role, current_user_id, order.supplier_id)
-        if not (owns_restaurant or owns_supplier):
+        if not (authz.owns_restaurant(order.buyer_restaurant_id) or authz.owns_supplier(order.supplier_id)):
             from fastapi import HTTPException, status
 
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden: not participant")
         return order
 
+    async def get_order_version(self, order_id: UUID, authz: AuthzContext) -> datetime:
+        """updated_at of an order the caller may read, without loading it (conditional GETs)."""
+        row = await self.repo.get_version(order_id)
+        if not row:
+            raise NotFoundError(f"Order {order_id} not found")
+        if not (authz.owns_restaurant(row.buyer_restaurant_id) or authz.owns_supplier(row.supplier_id)):
+            from fastapi import HTTPException, status
+
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden: not participant")
+        return row.updated_at
+
+    async def list_orders_version(
+        self,
+        restaurant_id: Optional[UUID] = None,
+        supplier_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        authz: Optional[AuthzContext] = None,
+    ) -> tuple[int, Optional[datetime]]:
+        """(count, max(updated_at)) of the orders visible to the caller, for list ETags."""
+        member_user_id = _member_filter(authz)
+        if member_user_id is _NO_ORDERS:
+            return 0, None
+        return await self.repo.list_version(
+            restaurant_id=restaurant_id,
+            supplier_id=supplier_id,
+            status=status,
+            member_user_id=member_user_id,
+        )
+
     async def list_orders(
         self,
         limit: int = 50,
@@ -63,28 +131,30 @@ class OrderService:
         restaurant_id: Optional[UUID] = None,
         supplier_id: Optional[UUID] = None,
         status: Optional[str] = None,
-        current_user_id: UUID | None = None,
-        current_role: str | None = None,
-    ) -> tuple[list[Order], int]:
-        # List, then filter down to only those the user participates in (if provided)
-        orders, total = await self.repo.list_all(limit=limit, offset=offset, restaurant_id=restaurant_id, supplier_id=supplier_id, status=status)
-        if current_user_id is None:
-            return orders, total
-        filtered: list[Order] = []
-        for o in orders:
-            owns_restaurant = await check_restaurant_ownership(self.session, current_role or "", current_user_id, o.buyer_restaurant_id)
-            owns_supplier = await check_supplier_ownership(self.session, current_role or "", current_user_id, o.supplier_id)
-            if owns_restaurant or owns_supplier:
-                filtered.append(o)
-        return filtered, len(filtered)
-
-    async def confirm_order(self, order_id: UUID, current_user_id: UUID, current_role: str) -> Order:
+        authz: Optional[AuthzContext] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+    ) -> tuple[list[Order], Optional[int], Optional[str]]:
+        member_user_id = _member_filter(authz)
+        if member_user_id is _NO_ORDERS:
+            return [], (0 if include_total else None), None
+        return await self.repo.list_all(
+            limit=limit,
+            offset=offset,
+            restaurant_id=restaurant_id,
+            supplier_id=supplier_id,
+            status=status,
+            member_user_id=member_user_id,
+            cursor=cursor,
+            include_total=include_total,
+        )
+
+    async def confirm_order(self, order_id: UUID, authz: AuthzContext) -> Order:
         order = await self.repo.get_by_id(order_id)
         if not order:
             raise NotFoundError("Order not found")
         # Supplier ownership required
-        owns = await check_supplier_ownership(self.session, current_role, current_user_id, order.supplier_id)
-        if not owns:
+        if not authz.owns_supplier(order.supplier_id):
             from fastapi import HTTPException, status
 
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden: supplier ownership required")
@@ -92,12 +162,11 @@ class OrderService:
             raise ConflictError("Invalid state transition")
         return await self.repo.set_status(order, OrderStatus.CONFIRMED)
 
-    async def deliver_order(self, order_id: UUID, current_user_id: UUID, current_role: str) -> Order:
+    async def deliver_order(self, order_id: UUID, authz: AuthzContext) -> Order:
         order = await self.repo.get_by_id(order_id)
         if not order:
             raise NotFoundError("Order not found")
-        owns = await check_supplier_ownership(self.session, current_role, current_user_id, order.supplier_id)
-        if not owns:
+        if not authz.owns_supplier(order.supplier_id):
             from fastapi import HTTPException, status
 
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden: supplier ownership required")
@@ -113,8 +182,8 @@ class OrderService:
         await self.session.refresh(order)
         return order
 
-    async def get_receipt_json(self, order_id: UUID, current_user_id: UUID, current_role: str) -> dict:
-        order = await self.get_order(order_id, current_user_id, current_role)
+    async def get_receipt_json(self, order_id: UUID, authz: AuthzContext) -> dict:
+        order = await self.get_order(order_id, authz)
         # Build derived receipt JSON
         return {
             "order_id": order.id,
@@ -126,8 +195,8 @@ class OrderService:
             "created_at": order.created_at,
         }
 
-    async def get_invoice_json(self, order_id: UUID, current_user_id: UUID, current_role: str) -> dict:
-        order = await self.get_order(order_id, current_user_id, current_role)
+    async def get_invoice_json(self, order_id: UUID, authz: AuthzContext) -> dict:
+        order = await self.get_order(order_id, authz)
         return {
             "order_id": order.id,
             "supplier_id": order.supplier_id,
@@ -0,0 +1,225 @@
+"""Bulk product import: streamed JSON Lines / CSV parsing, chunked validation and upsert."""
+import csv
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Optional, Union
+from uuid import UUID, uuid4
+
+import orjson
+from pydantic import ValidationError as PydanticValidationError
+
+from app.core.errors import ValidationError
+from app.core.ownership import AuthzContext
+from app.domain.products.repository import ProductRepository
+from app.domain.products.schemas import ProductCreate
+
+JSONL = "jsonl"
+CSV = "csv"
+
+# Content-Type (without parameters) -> format
+CONTENT_TYPES = {
+    "application/x-ndjson": JSONL,
+    "application/jsonl": JSONL,
+    "application/json-lines": JSONL,
+    "text/csv": CSV,
+    "application/csv": CSV,
+}
+
+
+class RowError(Exception):
+    """A record that could not be parsed."""
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a streamed body into decoded lines without buffering it whole."""
+    remainder = b""
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        lines = (remainder + chunk).split(b"\n")
+        remainder = lines.pop()
+        for line in lines:
+            yield line.decode("utf-8-sig").rstrip("\r")
+    if remainder:
+        yield remainder.decode("utf-8-sig").rstrip("\r")
+
+
+async def iter_records(
+    chunks: AsyncIterator[bytes], fmt: str
+) -> AsyncIterator[tuple[int, Union[dict[str, Any], RowError]]]:
+    """
+    Yield (line number, record dict or RowError) for each non-blank record.
+
+    CSV needs a header row; a quoted field may span lines, and its record is
+    numbered by its first line. Empty CSV fields are omitted so schema
+    defaults apply.
+    """
+    if fmt == JSONL:
+        line_no = 0
+        async for line in iter_lines(chunks):
+            line_no += 1
+            if not line.strip():
+                continue
+            try:
+                record = orjson.loads(line)
+            except orjson.JSONDecodeError as exc:
+                yield line_no, RowError(f"Invalid JSON: {exc}")
+                continue
+            if not isinstance(record, dict):
+                yield line_no, RowError("Expected a JSON object")
+                continue
+            yield line_no, record
+        return
+
+    header: Optional[list[str]] = None
+    pending: list[str] = []
+    line_no = start_line = 0
+    async for line in iter_lines(chunks):
+        line_no += 1
+        if not pending:
+            start_line = line_no
+        pending.append(line)
+        text = "\n".join(pending)
+        if text.count('"') % 2:
+            # Inside a quoted field that continues on the next line
+            continue
+        pending = []
+        if not text.strip():
+            continue
+        try:
+            values = next(csv.reader([text]))
+        except csv.Error as exc:
+            yield start_line, RowError(f"Invalid CSV: {exc}")
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield start_line, RowError(f"Expected {len(header)} fields, got {len(values)}")
+            continue
+        yield start_line, {name: value for name, value in zip(header, values) if value != ""}
+    if pending:
+        yield start_line, RowError("Unterminated quoted field")
+
+
+@dataclass
+class BulkImportReport:
+    """Outcome of a bulk import; errors are capped at max_errors entries."""
+
+    max_errors: int
+    received: int = 0
+    inserted: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: list[dict[str, Any]] = field(default_factory=list)
+
+    def fail(self, line: int, error: str, sku: Optional[str] = None) -> None:
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "sku": sku, "error": error})
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "received": self.received,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+class ProductBulkImporter:
+    """
+    Validate records in chunks and upsert each chunk by SKU.
+
+    Every chunk costs one SELECT (which SKUs exist, and whose they are) and
+    one batched INSERT ... ON CONFLICT (sku) DO UPDATE per set of columns
+    the rows carry, and commits on its own, so a failure late in a large
+    upload keeps the earlier chunks. Re-importing an existing SKU updates
+    only the columns given; omitted ones keep their stored values. A SKU
+    owned by another supplier is reported, never overwritten; re-importing a
+    soft-deleted SKU restores it. Within one upload the first occurrence of a
+    SKU wins and later ones are reported.
+    """
+
+    def __init__(
+        self,
+        repository: ProductRepository,
+        authz: AuthzContext,
+        batch_size: int,
+        max_rows: int,
+        max_errors: int,
+        default_supplier_id: Optional[UUID] = None,
+    ):
+        self.repository = repository
+        self.authz = authz
+        self.batch_size = batch_size
+        self.max_rows = max_rows
+        self.default_supplier_id = default_supplier_id
+        self.report = BulkImportReport(max_errors=max_errors)
+        self._seen_skus: dict[str, int] = {}
+
+    async def run(self, records: AsyncIterator[tuple[int, Union[dict[str, Any], RowError]]]) -> BulkImportReport:
+        batch: list[tuple[int, ProductCreate]] = []
+        async for line, record in records:
+            self.report.received += 1
+            if self.report.received > self.max_rows:
+                raise ValidationError(f"Bulk import is limited to {self.max_rows} rows per request")
+            product = self._validate(line, record)
+            if product is None:
+                continue
+            batch.append((line, product))
+            if len(batch) >= self.batch_size:
+                await self._flush(batch)
+                batch = []
+        if batch:
+            await self._flush(batch)
+        return self.report
+
+    def _validate(self, line: int, record: Union[dict[str, Any], RowError]) -> Optional[ProductCreate]:
+        if isinstance(record, RowError):
+            self.report.fail(line, str(record))
+            return None
+        sku = record.get("sku")
+        if self.default_supplier_id is not None:
+            record.setdefault("supplier_id", self.default_supplier_id)
+        try:
+            product = ProductCreate.model_validate(record)
+        except PydanticValidationError as exc:
+            message = "; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()
+            )
+            self.report.fail(line, message, sku if isinstance(sku, str) else None)
+            return None
+        if not self.authz.owns_supplier(product.supplier_id):
+            self.report.fail(line, "Forbidden: not owner of supplier", product.sku)
+            return None
+        first_line = self._seen_skus.setdefault(product.sku, line)
+        if first_line != line:
+            self.report.fail(line, f"Duplicate SKU in upload (first on line {first_line})", product.sku)
+            return None
+        return product
+
+    async def _flush(self, batch: list[tuple[int, ProductCreate]]) -> None:
+        owners = await self.repository.sku_owners([product.sku for _, product in batch])
+        lines = {}
+        rows = []
+        for line, product in batch:
+            owner = owners.get(product.sku)
+            if owner is not None and owner != product.supplier_id:
+                self.report.fail(line, "SKU belongs to another supplier", product.sku)
+                continue
+            lines[product.sku] = line
+            # Only the fields the row gave, so an update never resets omitted columns to defaults
+            rows.append({"id": uuid4(), **product.model_dump(exclude_unset=True)})
+        if not rows:
+            return
+        written = await self.repository.upsert_many(rows)
+        for row in rows:
+            if row["sku"] not in written:
+                # Claimed by another supplier between the SELECT and the INSERT
+                self.report.fail(lines[row["sku"]], "SKU belongs to another supplier", row["sku"])
+            elif row["sku"] in owners:
+                self.report.updated += 1
+            else:
+                self.report.inserted += 1
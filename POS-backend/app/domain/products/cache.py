@@ -0,0 +1,124 @@
+"""Product catalog read cache with versioned-key invalidation."""
+import hashlib
+import logging
+from typing import Any, Iterable, Optional
+from uuid import UUID
+
+import orjson
+
+from app.core.cache import MemoryCacheBackend, RedisCacheBackend
+from app.core.config import settings
+from app.core.metrics import iris_catalog_cache_total
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogCacheEntry:
+    """
+    Result of a catalog cache lookup, pinned to the key it was looked up under.
+
+    The key embeds the versions read before the database query, so a write
+    that lands while the query runs leaves the stored entry unreachable
+    rather than serving pre-write rows under the new version.
+    """
+
+    __slots__ = ("cache", "key", "value")
+
+    def __init__(self, cache: "CatalogCache", key: Optional[str], value: Optional[Any]):
+        self.cache = cache
+        self.key = key
+        self.value = value
+
+    async def store(self, payload: Any) -> None:
+        if self.key:
+            await self.cache.backend.set(
+                self.key, orjson.dumps(payload, option=orjson.OPT_UTC_Z), self.cache.ttl_seconds
+            )
+
+
+class CatalogCache:
+    """
+    Cache for product listings, search results and single products.
+
+    Every key embeds the current catalog version. Product writes bump the
+    version instead of deleting keys, so all earlier entries become
+    unreachable at once and age out through their TTL. Values are stored as
+    orjson bytes and returned as JSON-ready dicts.
+
+    Orders only change stock, so they bump narrower stock versions instead:
+    one per product (single products), one per supplier (listings and
+    searches filtered by supplier) and one for the whole catalog (unfiltered
+    listings and searches). Each key embeds the stock version of its scope.
+    """
+
+    VERSION_KEY = "catalog:version"
+    STOCK_KEY = "catalog:stock"
+
+    def __init__(self, backend: Any, ttl_seconds: float):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    async def lookup_list(self, params: dict[str, Any]) -> CatalogCacheEntry:
+        return await self._lookup("list", self._params_digest(params), self._scope_key(params))
+
+    async def lookup_search(self, params: dict[str, Any]) -> CatalogCacheEntry:
+        return await self._lookup("search", self._params_digest(params), self._scope_key(params))
+
+    async def lookup_product(self, product_id: UUID) -> CatalogCacheEntry:
+        return await self._lookup("product", str(product_id), f"{self.STOCK_KEY}:product:{product_id}")
+
+    async def invalidate(self) -> None:
+        """Bump the catalog version so no cached listing or product is served again."""
+        if not self.enabled:
+            return
+        try:
+            await self.backend.incr(self.VERSION_KEY)
+        except Exception:
+            logger.error("Catalog cache invalidation failed; entries expire after their TTL", exc_info=True)
+
+    async def invalidate_stock(self, product_ids: Iterable[UUID], supplier_ids: Iterable[UUID]) -> None:
+        """Hide cached entries that show stock of the given products (and their suppliers)."""
+        if not self.enabled:
+            return
+        keys = [self.STOCK_KEY]
+        keys += [f"{self.STOCK_KEY}:product:{product_id}" for product_id in product_ids]
+        keys += [f"{self.STOCK_KEY}:supplier:{supplier_id}" for supplier_id in supplier_ids]
+        try:
+            await self.backend.incr_many(keys)
+        except Exception:
+            logger.error("Catalog stock invalidation failed; entries expire after their TTL", exc_info=True)
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+    def _scope_key(self, params: dict[str, Any]) -> str:
+        supplier_id = params.get("supplier_id")
+        return f"{self.STOCK_KEY}:supplier:{supplier_id}" if supplier_id else self.STOCK_KEY
+
+    async def _lookup(self, kind: str, suffix: str, stock_key: str) -> CatalogCacheEntry:
+        if not self.enabled:
+            return CatalogCacheEntry(self, None, None)
+        versions = await self.backend.get_counters([self.VERSION_KEY, stock_key])
+        if versions is None:
+            return CatalogCacheEntry(self, None, None)
+        key = f"catalog:{versions[0]}.{versions[1]}:{kind}:{suffix}"
+        raw = await self.backend.get(key)
+        iris_catalog_cache_total.labels(kind=kind, result="hit" if raw is not None else "miss").inc()
+        return CatalogCacheEntry(self, key, orjson.loads(raw) if raw is not None else None)
+
+    @staticmethod
+    def _params_digest(params: dict[str, Any]) -> str:
+        raw = orjson.dumps(params, option=orjson.OPT_SORT_KEYS)
+        return hashlib.sha256(raw).hexdigest()
+
+
+catalog_cache = CatalogCache(
+    RedisCacheBackend(settings.REDIS_URL)
+    if settings.REDIS_URL
+    else MemoryCacheBackend(settings.CATALOG_CACHE_MAX_ENTRIES, settings.CATALOG_CACHE_TTL_SECONDS),
+    ttl_seconds=settings.CATALOG_CACHE_TTL_SECONDS,
+)
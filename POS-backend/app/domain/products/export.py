@@ -0,0 +1,54 @@
+"""Catalog export encoding: batches of product dicts to NDJSON or CSV bytes."""
+import csv
+import io
+from datetime import datetime
+from typing import Any, AsyncIterator, Sequence
+
+import orjson
+
+from app.core.conditional import as_utc
+
+NDJSON = "ndjson"
+CSV = "csv"
+
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    NDJSON: ("application/x-ndjson", "ndjson"),
+    CSV: ("text/csv; charset=utf-8", "csv"),
+}
+
+# Naive timestamps are UTC (see conditional.as_utc); both formats spell them with "Z"
+_NDJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return as_utc(value).isoformat().replace("+00:00", "Z")
+    return value
+
+
+async def encode_export(
+    batches: AsyncIterator[list[dict[str, Any]]], fields: Sequence[str], fmt: str
+) -> AsyncIterator[bytes]:
+    """
+    Yield one bytes chunk per batch (CSV starts with a header row).
+
+    CSV output uses the column names POST /products/bulk expects, so an
+    export can be edited and re-imported.
+    """
+    if fmt == NDJSON:
+        async for batch in batches:
+            yield b"".join(orjson.dumps(row, option=_NDJSON_OPTIONS) + b"\n" for row in batch)
+        return
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(fields)
+    yield buffer.getvalue().encode("utf-8")
+    async for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_csv_value(row[name]) for name in fields] for row in batch)
+        yield buffer.getvalue().encode("utf-8")
@@ -46,14 +46,18 @@ class Product(BaseModel):
     active: Mapped[bool] = mapped_column(default=True, index=True)
     
     # Relationships
-    supplier: Mapped["Supplier"] = relationship("Supplier", back_populates="products", lazy="selectin")
-    cart_items: Mapped[list["CartItem"]] = relationship("CartItem", back_populates="product", lazy="selectin")
+    supplier: Mapped["Supplier"] = relationship("Supplier", back_populates="products", lazy="raise")
+    cart_items: Mapped[list["CartItem"]] = relationship("CartItem", back_populates="product", lazy="raise")
     
     # Indexes and constraints
     __table_args__ = (
         UniqueConstraint("sku", name="uq_products_sku"),
         Index("idx_products_supplier_active", "supplier_id", "active"),
+        Index("idx_products_created_id", "created_at", "id"),
+        Index("idx_products_updated_id", "updated_at", "id"),
         # Trigram GIN index is created via Alembic migration (idx_products_search)
+        # search_vector tsvector column, its GIN index and lower(sku) index are created via
+        # Alembic migration and used by products.search; not mapped here
         CheckConstraint("price_cents >= 0", name="ck_products_price_cents"),
         CheckConstraint("stock_qty >= 0", name="ck_products_stock_qty"),
         CheckConstraint("tax_rate >= 0 AND tax_rate <= 100", name="ck_products_tax_rate"),
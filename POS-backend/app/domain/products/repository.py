@@ -1,11 +1,28 @@
-"""Product repository with filters and trigram search."""
-from typing import Optional
+"""Product repository with filters and ranked search."""
+from datetime import datetime
+from typing import Any, AsyncIterator, Optional, Sequence
 from uuid import UUID
 
-from sqlalchemy import func, select, text
+from sqlalchemy import Select, func, null, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.errors import ValidationError
+from app.core.pagination import count_rows, keyset_page, listing_version, split_page
+from app.core.projection import RowProjection
+from app.domain.products.cache import catalog_cache
 from app.domain.products.models import Product
+from app.domain.products.schemas import ProductResponse
+from app.domain.products.search import normalize_query, search_condition, search_rank
+from app.domain.products.suggest import suggest_index
+
+
+# Columns of ProductResponse, selected as plain rows for read-only listings
+PRODUCT_ROWS = RowProjection(Product, ProductResponse)
+
+# Columns a bulk import row may overwrite on an existing SKU
+UPSERT_COLUMNS = ("name", "unit", "price_cents", "tax_rate", "stock_qty", "availability_status", "active")
 
 
 class ProductRepository:
@@ -18,7 +35,9 @@ class ProductRepository:
         product = Product(**kwargs)
         self.session.add(product)
         await self.session.commit()
+        await catalog_cache.invalidate()
         await self.session.refresh(product)
+        suggest_index.upsert(product)
         return product
 
     async def get_by_id(self, product_id: UUID) -> Optional[Product]:
@@ -29,39 +48,205 @@ class ProductRepository:
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def list_all(
+    async def get_row(self, product_id: UUID) -> Optional[Any]:
+        """Fetch one product as a PRODUCT_ROWS row (no ORM object)."""
+        stmt = select(*PRODUCT_ROWS.columns).where(
+            Product.id == product_id,
+            Product.deleted_at.is_(None),
+        )
+        result = await self.session.execute(stmt)
+        return result.first()
+
+    async def get_prices(self, product_ids: Sequence[UUID]) -> dict[UUID, Any]:
+        """(price_cents, tax_rate) rows of live products by ID, in one SELECT."""
+        stmt = select(Product.id, Product.price_cents, Product.tax_rate).where(
+            Product.id.in_(product_ids),
+            Product.deleted_at.is_(None),
+        )
+        return {row.id: row for row in (await self.session.execute(stmt)).all()}
+
+    async def get_version(self, product_id: UUID) -> Optional[datetime]:
+        """updated_at of a product, or None if it does not exist (conditional GETs)."""
+        stmt = select(Product.updated_at).where(
+            Product.id == product_id,
+            Product.deleted_at.is_(None),
+        )
+        return (await self.session.execute(stmt)).scalar_one_or_none()
+
+    def _filtered_query(
         self,
-        limit: int = 50,
-        offset: int = 0,
         supplier_id: Optional[UUID] = None,
         active: Optional[bool] = None,
         q: Optional[str] = None,
-    ) -> tuple[list[Product], int]:
-        """List products with filters, pagination, and trigram search."""
-        base_query = select(Product).where(Product.deleted_at.is_(None))
+        columns: Optional[Sequence[Any]] = None,
+    ) -> Select:
+        """Unpaginated product listing query shared by list_all and list_version."""
+        base_query = (select(*columns) if columns else select(Product)).where(Product.deleted_at.is_(None))
 
         if supplier_id is not None:
             base_query = base_query.where(Product.supplier_id == supplier_id)
         if active is not None:
             base_query = base_query.where(Product.active == active)
         if q:
-            # Use trigram similarity on concatenated name and sku
-            # Requires pg_trgm extension and a GIN/GIST index per migration
-            base_query = base_query.where(
-                text("(name || ' ' || sku) % :q")
-            ).params(q=q)
+            # Word-prefix (tsvector GIN) or trigram match on name and sku; see products.search
+            base_query = base_query.where(search_condition(q))
+        return base_query
+
+    async def list_version(
+        self,
+        supplier_id: Optional[UUID] = None,
+        active: Optional[bool] = None,
+        q: Optional[str] = None,
+    ) -> tuple[int, Optional[datetime]]:
+        """(count, max(updated_at)) of the filtered listing, for list ETags."""
+        return await listing_version(
+            self.session, self._filtered_query(supplier_id=supplier_id, active=active, q=q), Product
+        )
+
+    async def list_all(
+        self,
+        limit: int = 50,
+        offset: int = 0,
+        supplier_id: Optional[UUID] = None,
+        active: Optional[bool] = None,
+        q: Optional[str] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        columns: Optional[Sequence[Any]] = None,
+    ) -> tuple[list[Any], Optional[int], Optional[str]]:
+        """
+        List products with filters, pagination, and trigram search.
+
+        With columns, only those columns are selected and plain rows are
+        returned instead of tracked ORM objects (read-only listings).
+
+        Returns:
+            Tuple of (products list, total count or None, next page cursor)
+        """
+        if q and cursor:
+            raise ValidationError("Cursor pagination is not supported with search; use offset")
+        base_query = self._filtered_query(supplier_id=supplier_id, active=active, q=q, columns=columns)
 
-        count_query = select(func.count()).select_from(base_query.subquery())
-        total = (await self.session.execute(count_query)).scalar_one()
+        total = await count_rows(self.session, base_query) if include_total else None
 
         if q:
-            # Order by similarity when searching
-            paginated = base_query.order_by(text("similarity(name || ' ' || sku, :q) DESC")).limit(limit).offset(offset).params(q=q)
-        else:
-            paginated = base_query.order_by(Product.created_at.desc()).limit(limit).offset(offset)
+            # Order by relevance when searching
+            paginated = base_query.order_by(search_rank(q).desc(), Product.id).limit(limit).offset(offset)
+            result = await self.session.execute(paginated)
+            products = result.all() if columns else result.scalars().all()
+            return list(products), total, None
 
-        products = (await self.session.execute(paginated)).scalars().all()
-        return list(products), total
+        paginated = keyset_page(base_query, Product, limit=limit, offset=offset, cursor=cursor)
+        result = await self.session.execute(paginated)
+        products = result.all() if columns else result.scalars().all()
+        products, next_cursor = split_page(list(products), limit)
+        return products, total, next_cursor
+
+    async def stream_rows(
+        self,
+        batch_size: int,
+        supplier_id: Optional[UUID] = None,
+        active: Optional[bool] = None,
+        updated_since: Optional[datetime] = None,
+    ) -> AsyncIterator[Sequence[Any]]:
+        """
+        Yield batches of PRODUCT_ROWS rows in (updated_at, id) order from a server-side cursor.
+
+        Only batch_size rows are held at a time however large the catalog is.
+        The order follows idx_products_updated_id, so the last row's updated_at
+        is a safe updated_since for the next incremental export.
+        """
+        stmt = self._filtered_query(supplier_id=supplier_id, active=active, columns=PRODUCT_ROWS.columns)
+        if updated_since is not None:
+            stmt = stmt.where(Product.updated_at >= updated_since)
+        stmt = stmt.order_by(Product.updated_at, Product.id).execution_options(yield_per=batch_size)
+        result = await self.session.stream(stmt)
+        try:
+            async for partition in result.partitions():
+                yield partition
+        finally:
+            await result.close()
+
+    async def search(
+        self,
+        q: str,
+        limit: int,
+        supplier_id: Optional[UUID] = None,
+        active: Optional[bool] = None,
+    ) -> list[Any]:
+        """
+        Top-K ranked search as PRODUCT_ROWS rows plus a trailing rank column, best first.
+
+        A single-token query equal to a SKU (case-insensitive) short-circuits to
+        that product alone with rank None. No count query is run.
+        """
+        q = normalize_query(q)
+        if not q:
+            return []
+        filters = [Product.deleted_at.is_(None)]
+        if supplier_id is not None:
+            filters.append(Product.supplier_id == supplier_id)
+        if active is not None:
+            filters.append(Product.active == active)
+
+        if " " not in q:
+            # Served by idx_products_sku_lower
+            sku_stmt = (
+                select(*PRODUCT_ROWS.columns, null().label("rank"))
+                .where(func.lower(Product.sku) == q.lower(), *filters)
+                .limit(1)
+            )
+            row = (await self.session.execute(sku_stmt)).first()
+            if row is not None:
+                return [row]
+
+        rank = search_rank(q).label("rank")
+        stmt = (
+            select(*PRODUCT_ROWS.columns, rank)
+            .where(search_condition(q), *filters)
+            .order_by(rank.desc(), Product.id)
+            .limit(limit)
+        )
+        return list((await self.session.execute(stmt)).all())
+
+    async def sku_owners(self, skus: Sequence[str]) -> dict[str, UUID]:
+        """Map each existing SKU (soft-deleted included) to its supplier."""
+        stmt = select(Product.sku, Product.supplier_id).where(Product.sku.in_(skus))
+        return {sku: supplier_id for sku, supplier_id in (await self.session.execute(stmt)).all()}
+
+    async def upsert_many(self, rows: list[dict[str, Any]]) -> set[str]:
+        """
+        Insert or update products by SKU in batched statements and commit.
+
+        Existing rows are only updated when they belong to the same supplier
+        (and are restored if soft-deleted), and only in the columns a row
+        carries: an omitted stock_qty keeps the stored stock instead of
+        resetting it to the create default. Rows are batched by the columns
+        they carry, one statement per distinct set. Returns the SKUs actually
+        written. The catalog cache is not invalidated here; callers do it once
+        per import.
+        """
+        shapes: dict[frozenset[str], list[dict[str, Any]]] = {}
+        for row in rows:
+            shapes.setdefault(frozenset(row), []).append(row)
+
+        insert = sqlite_insert if self.session.bind.dialect.name == "sqlite" else pg_insert
+        written: set[str] = set()
+        for columns, shaped_rows in shapes.items():
+            stmt = insert(Product)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Product.sku],
+                set_={
+                    **{column: stmt.excluded[column] for column in UPSERT_COLUMNS if column in columns},
+                    "deleted_at": None,
+                    "updated_at": func.now(),
+                },
+                where=Product.supplier_id == stmt.excluded.supplier_id,
+            ).returning(Product.sku)
+            # Executemany form: one cached compiled statement, batched by insertmanyvalues
+            written.update((await self.session.execute(stmt, shaped_rows)).scalars().all())
+        await self.session.commit()
+        return written
 
     async def update(self, product: Product, **kwargs) -> Product:
         for key, value in kwargs.items():
@@ -75,7 +260,9 @@ class ProductRepository:
             .values(updated_at=datetime.now(timezone.utc))
         )
         await self.session.commit()
+        await catalog_cache.invalidate()
         await self.session.refresh(product)
+        suggest_index.upsert(product)
         return product
 
     async def delete(self, product: Product) -> None:
@@ -87,6 +274,8 @@ class ProductRepository:
             .values(deleted_at=datetime.now(timezone.utc))
         )
         await self.session.commit()
+        await catalog_cache.invalidate()
+        suggest_index.remove(product.id)
 
 
 
@@ -52,9 +52,54 @@ class ProductResponse(BaseModel):
 class ProductListResponse(BaseModel):
     """Paginated product list response."""
     data: list[ProductResponse]
-    total: int
+    total: Optional[int]
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
 
 
+
+
+class ProductSearchHit(ProductResponse):
+    """Search result: a product with its relevance (None for an exact SKU match)."""
+    rank: Optional[float] = None
+
+
+class ProductSearchResponse(BaseModel):
+    """Top-K search results, best first (no total)."""
+    data: list[ProductSearchHit]
+    q: str
+    limit: int
+
+
+class ProductSuggestion(BaseModel):
+    """Autocomplete entry."""
+    id: UUID
+    name: str
+    sku: str
+    supplier_id: UUID
+
+
+class ProductSuggestResponse(BaseModel):
+    """Autocomplete suggestions for a typed prefix."""
+    data: list[ProductSuggestion]
+    q: str
+    limit: int
+
+
+class ProductBulkError(BaseModel):
+    """A rejected bulk import row (line is 1-based in the uploaded body)."""
+    line: int
+    sku: Optional[str]
+    error: str
+
+
+class ProductBulkResponse(BaseModel):
+    """Bulk import report."""
+    received: int
+    inserted: int
+    updated: int
+    failed: int
+    errors: list[ProductBulkError]
+    errors_truncated: bool
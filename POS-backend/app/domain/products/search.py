@@ -0,0 +1,74 @@
+"""
+Product search expressions: full-text prefix matching, trigram typo
+tolerance and ranking, used by ProductRepository.search and list_all(q=...).
+
+Backed by two Postgres indexes on products (see Alembic migrations):
+- idx_products_search_vector: GIN over the generated search_vector column,
+  setweight(name, 'A') || setweight(sku, 'B') with the 'simple' config
+- idx_products_search: trigram GIN over (name || ' ' || sku)
+
+search_vector is not mapped on the Product model so SQLite test databases
+can still create the table; queries reference it by name.
+"""
+import re
+from typing import Optional
+
+from sqlalchemy import ColumnElement, Float, String, bindparam, case, column, func, literal_column, or_
+
+from app.domain.products.models import Product
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Rank = ts_rank (name hits weigh more than SKU hits) + trigram similarity,
+# with a flat boost when the name starts with the query
+_NAME_PREFIX_BOOST = 1.0
+_SIMILARITY_WEIGHT = 0.5
+
+_search_vector = column("search_vector")
+_haystack = literal_column("(name || ' ' || sku)", type_=String)
+
+
+def normalize_query(q: str) -> str:
+    """Collapse whitespace; search treats 'Olive   Oil ' and 'olive oil' alike."""
+    return " ".join(q.split())
+
+
+def prefix_tsquery(q: str) -> Optional[str]:
+    """
+    Build a to_tsquery expression matching every word of q as a prefix
+    ('oli oi' -> 'oli:* & oi:*'). Only word characters are kept, so user
+    input cannot inject tsquery operators. None when q has no words.
+    """
+    tokens = _TOKEN_RE.findall(q.lower())
+    if not tokens:
+        return None
+    return " & ".join(f"{token}:*" for token in tokens)
+
+
+def search_condition(q: str) -> ColumnElement[bool]:
+    """Rows matching q by word prefix (tsvector) or approximately (trigram, typo tolerant)."""
+    q = normalize_query(q)
+    trigram = _haystack.op("%")(bindparam("search_q", q, type_=String))
+    tsquery = prefix_tsquery(q)
+    if tsquery is None:
+        return trigram
+    return or_(
+        _search_vector.op("@@")(func.to_tsquery("simple", bindparam("search_tsq", tsquery, type_=String))),
+        trigram,
+    )
+
+
+def search_rank(q: str) -> ColumnElement[float]:
+    """Relevance of a row for q; higher is better."""
+    q = normalize_query(q)
+    q_param = bindparam("search_q", q, type_=String)
+    rank = _SIMILARITY_WEIGHT * func.similarity(_haystack, q_param, type_=Float)
+    tsquery = prefix_tsquery(q)
+    if tsquery is not None:
+        tsq = func.to_tsquery("simple", bindparam("search_tsq", tsquery, type_=String))
+        rank = rank + func.ts_rank(_search_vector, tsq, type_=Float)
+    name_prefix = case(
+        (func.lower(Product.name).startswith(q.lower(), autoescape=True), _NAME_PREFIX_BOOST),
+        else_=0.0,
+    )
+    return rank + name_prefix
@@ -1,13 +1,19 @@
 """Product service with ownership checks and search."""
-from typing import Optional, TYPE_CHECKING
+from datetime import datetime
+from typing import AsyncIterator, Optional, TYPE_CHECKING
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.errors import NotFoundError
-from app.core.ownership import check_supplier_ownership
-from app.domain.products.repository import ProductRepository
+from app.core.config import settings
+from app.core.errors import NotFoundError, UnsupportedMediaTypeError
+from app.core.ownership import AuthzContext
+from app.domain.products.bulk import CONTENT_TYPES, ProductBulkImporter, iter_records
+from app.domain.products.cache import catalog_cache
+from app.domain.products.export import encode_export
+from app.domain.products.repository import PRODUCT_ROWS, ProductRepository
 from app.domain.products.schemas import ProductCreate, ProductUpdate
+from app.domain.products.suggest import suggest_index
 
 if TYPE_CHECKING:
     from app.domain.products.models import Product
@@ -23,26 +29,86 @@ class ProductService:
     async def create_product(
         self,
         data: ProductCreate,
-        current_account_id: UUID,
-        current_role: str,
+        authz: AuthzContext,
     ) -> "Product":
         # Ownership check for supplier
-        owns = await check_supplier_ownership(
-            self.session, current_role, current_account_id, data.supplier_id
-        )
-        if not owns:
+        if not authz.owns_supplier(data.supplier_id):
             from fastapi import HTTPException, status
 
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden: not owner of supplier")
 
         return await self.repository.create(**data.model_dump())
 
+    async def bulk_upsert_products(
+        self,
+        chunks: AsyncIterator[bytes],
+        content_type: str,
+        authz: AuthzContext,
+        supplier_id: Optional[UUID] = None,
+    ) -> dict:
+        """
+        Upsert products by SKU from a streamed JSON Lines or CSV body.
+
+        Rows are validated and written in chunks of BULK_IMPORT_BATCH_SIZE;
+        rejected rows are reported instead of failing the request. supplier_id
+        fills rows that leave it out. Caches are refreshed once at the end.
+        """
+        fmt = CONTENT_TYPES.get(content_type.split(";", 1)[0].strip().lower())
+        if fmt is None:
+            raise UnsupportedMediaTypeError(
+                f"Unsupported Content-Type {content_type!r}; use one of: {', '.join(CONTENT_TYPES)}"
+            )
+        importer = ProductBulkImporter(
+            self.repository,
+            authz,
+            batch_size=settings.BULK_IMPORT_BATCH_SIZE,
+            max_rows=settings.BULK_IMPORT_MAX_ROWS,
+            max_errors=settings.BULK_IMPORT_MAX_ERRORS,
+            default_supplier_id=supplier_id,
+        )
+        try:
+            report = await importer.run(iter_records(chunks, fmt))
+        finally:
+            # Chunks commit independently, so earlier ones may be written even on error
+            if importer.report.inserted or importer.report.updated:
+                await catalog_cache.invalidate()
+                suggest_index.schedule_refresh()
+        return report.as_dict()
+
     async def get_product(self, product_id: UUID) -> "Product":
         product = await self.repository.get_by_id(product_id)
         if not product:
             raise NotFoundError(f"Product with ID {product_id} not found")
         return product
 
+    async def get_product_data(self, product_id: UUID) -> dict:
+        """ProductResponse-shaped dict for a product, served from the catalog cache when possible."""
+        entry = await catalog_cache.lookup_product(product_id)
+        if entry.value is not None:
+            return entry.value
+        row = await self.repository.get_row(product_id)
+        if row is None:
+            raise NotFoundError(f"Product with ID {product_id} not found")
+        product = PRODUCT_ROWS.to_dicts([row])[0]
+        await entry.store(product)
+        return product
+
+    async def get_product_version(self, product_id: UUID) -> datetime:
+        """updated_at of a product without loading it (conditional GETs)."""
+        updated_at = await self.repository.get_version(product_id)
+        if updated_at is None:
+            raise NotFoundError(f"Product with ID {product_id} not found")
+        return updated_at
+
+    async def list_products_version(
+        self,
+        supplier_id: Optional[UUID] = None,
+        active: Optional[bool] = None,
+        q: Optional[str] = None,
+    ) -> tuple[int, Optional[datetime]]:
+        """(count, max(updated_at)) of the product listing, for list ETags."""
+        return await self.repository.list_version(supplier_id=supplier_id, active=active, q=q)
+
     async def list_products(
         self,
         limit: int = 50,
@@ -50,23 +116,126 @@ class ProductService:
         supplier_id: Optional[UUID] = None,
         active: Optional[bool] = None,
         q: Optional[str] = None,
-    ) -> tuple[list["Product"], int]:
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+    ) -> tuple[list["Product"], Optional[int], Optional[str]]:
         return await self.repository.list_all(
-            limit=limit, offset=offset, supplier_id=supplier_id, active=active, q=q
+            limit=limit,
+            offset=offset,
+            supplier_id=supplier_id,
+            active=active,
+            q=q,
+            cursor=cursor,
+            include_total=include_total,
         )
 
+    async def list_product_rows(
+        self,
+        limit: int = 50,
+        offset: int = 0,
+        supplier_id: Optional[UUID] = None,
+        active: Optional[bool] = None,
+        q: Optional[str] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+    ) -> tuple[list[dict], Optional[int], Optional[str]]:
+        """
+        Same listing as list_products, as ProductResponse-shaped dicts read from
+        projected columns. Pages are served from the catalog cache when possible.
+        """
+        cache_params = {
+            "limit": limit,
+            "offset": offset,
+            "supplier_id": supplier_id,
+            "active": active,
+            "q": q,
+            "cursor": cursor,
+            "include_total": include_total,
+        }
+        entry = await catalog_cache.lookup_list(cache_params)
+        if entry.value is not None:
+            return entry.value["data"], entry.value["total"], entry.value["next_cursor"]
+
+        rows, total, next_cursor = await self.repository.list_all(
+            limit=limit,
+            offset=offset,
+            supplier_id=supplier_id,
+            active=active,
+            q=q,
+            cursor=cursor,
+            include_total=include_total,
+            columns=PRODUCT_ROWS.columns,
+        )
+        products = PRODUCT_ROWS.to_dicts(rows)
+        await entry.store({"data": products, "total": total, "next_cursor": next_cursor})
+        return products, total, next_cursor
+
+    def export_products(
+        self,
+        fmt: str,
+        supplier_id: Optional[UUID] = None,
+        active: Optional[bool] = None,
+        updated_since: Optional[datetime] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream the catalog as NDJSON or CSV chunks, one per EXPORT_BATCH_SIZE rows.
+
+        Rows are read from a server-side cursor and never cached; the session
+        must stay open until the iterator is exhausted.
+        """
+        batches = self._export_batches(supplier_id=supplier_id, active=active, updated_since=updated_since)
+        return encode_export(batches, PRODUCT_ROWS.fields, fmt)
+
+    async def _export_batches(self, **filters) -> AsyncIterator[list[dict]]:
+        async for rows in self.repository.stream_rows(batch_size=settings.EXPORT_BATCH_SIZE, **filters):
+            yield PRODUCT_ROWS.to_dicts(rows)
+
+    async def search_products(
+        self,
+        q: str,
+        limit: int = 20,
+        supplier_id: Optional[UUID] = None,
+        active: Optional[bool] = None,
+    ) -> list[dict]:
+        """Ranked top-K search as ProductSearchHit-shaped dicts, served from the catalog cache when possible."""
+        cache_params = {"q": q, "limit": limit, "supplier_id": supplier_id, "active": active}
+        entry = await catalog_cache.lookup_search(cache_params)
+        if entry.value is not None:
+            return entry.value
+
+        rows = await self.repository.search(q, limit=limit, supplier_id=supplier_id, active=active)
+        hits = PRODUCT_ROWS.to_dicts(rows)
+        for hit, row in zip(hits, rows):
+            hit["rank"] = row.rank
+        await entry.store(hits)
+        return hits
+
+    async def suggest_products(
+        self,
+        q: str,
+        limit: int = 10,
+        supplier_id: Optional[UUID] = None,
+    ) -> list[dict]:
+        """
+        Autocomplete from the in-process prefix index (no database round trip).
+        Until the index has been built, falls back to ranked search over active products.
+        """
+        if suggest_index.ready:
+            return suggest_index.suggest(q, limit=limit, supplier_id=supplier_id)
+        hits = await self.search_products(q=q, limit=limit, supplier_id=supplier_id, active=True)
+        return [
+            {"id": hit["id"], "name": hit["name"], "sku": hit["sku"], "supplier_id": hit["supplier_id"]}
+            for hit in hits
+        ]
+
     async def update_product(
         self,
         product_id: UUID,
         data: ProductUpdate,
-        current_account_id: UUID,
-        current_role: str,
+        authz: AuthzContext,
     ) -> "Product":
         product = await self.get_product(product_id)
-        owns = await check_supplier_ownership(
-            self.session, current_role, current_account_id, product.supplier_id
-        )
-        if not owns:
+        if not authz.owns_supplier(product.supplier_id):
             from fastapi import HTTPException, status
 
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden: not owner of supplier")
@@ -77,14 +246,10 @@ class ProductService:
     async def delete_product(
         self,
         product_id: UUID,
-        current_account_id: UUID,
-        current_role: str,
+        authz: AuthzContext,
     ) -> None:
         product = await self.get_product(product_id)
-        owns = await check_supplier_ownership(
-            self.session, current_role, current_account_id, product.supplier_id
-        )
-        if not owns:
+        if not authz.owns_supplier(product.supplier_id):
             from fastapi import HTTPException, status
 
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden: not owner of supplier")
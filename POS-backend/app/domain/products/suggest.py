@@ -0,0 +1,230 @@
+"""In-process prefix index over active product names and SKUs for autocomplete."""
+import asyncio
+import logging
+import re
+import sys
+from bisect import bisect_left
+from operator import itemgetter
+from typing import AbstractSet, Any, Callable, NamedTuple, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.domain.products.models import Product
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+# Upper bound for the keys starting with a prefix: bisect_left(keys, prefix + _MAX_CHAR)
+_MAX_CHAR = "\U0010ffff"
+_NOTHING: AbstractSet[UUID] = frozenset()
+
+
+def _words(text: str) -> list[str]:
+    # Interned: the catalog vocabulary is small, so keys share one string per word
+    return [sys.intern(word) for word in _WORD_RE.findall(text.lower())]
+
+
+class _Entry(NamedTuple):
+    name: str
+    sku: str
+    supplier_id: UUID
+    keys: tuple[str, ...]
+
+
+class SuggestIndex:
+    """
+    Sorted (key, product_id) arrays searched with bisect.
+
+    Keys are the lowercased words of each active product's name plus its
+    SKU. A query matches a product when every query word is a prefix of one
+    of its keys; the range for the longest query word is scanned and the
+    remaining words are checked against the candidate's keys. Scans stop
+    after max_scan entries so very short prefixes stay cheap.
+
+    The main arrays are rebuilt from the database at startup and every
+    refresh_seconds (picking up writes made by other processes). Writes in
+    this process (ProductRepository create/update/delete) go to a small
+    sorted delta plus a set of products whose main-array keys are stale, so
+    an update never shifts the large arrays.
+    """
+
+    def __init__(self, refresh_seconds: float = 300, max_scan: int = 2000):
+        self.refresh_seconds = refresh_seconds
+        self.max_scan = max_scan
+        self._keys: list[str] = []
+        self._ids: list[UUID] = []
+        self._delta_keys: list[str] = []
+        self._delta_ids: list[UUID] = []
+        self._stale: set[UUID] = set()
+        self._entries: dict[UUID, _Entry] = {}
+        self._session_factory: Optional[Callable[[], Any]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._refresh_lock = asyncio.Lock()
+        self._scheduled: Optional[asyncio.Task] = None
+        # Writes seen while a rebuild is loading rows; replayed onto the new arrays
+        self._pending: Optional[list[tuple[UUID, Optional[_Entry]]]] = None
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def suggest(self, q: str, limit: int, supplier_id: Optional[UUID] = None) -> list[dict[str, Any]]:
+        """Up to limit {id, name, sku, supplier_id} dicts whose keys match every word of q as a prefix."""
+        entries = self._entries
+        results: list[dict[str, Any]] = []
+        seen: set[UUID] = set()
+
+        def scan(keys: list[str], ids: list[UUID], stale: AbstractSet[UUID], prefix: str, others: list[str]) -> None:
+            start = bisect_left(keys, prefix)
+            end = min(bisect_left(keys, prefix + _MAX_CHAR, start), start + self.max_scan)
+            for product_id in ids[start:end]:
+                if product_id in seen or product_id in stale:
+                    continue
+                seen.add(product_id)
+                entry = entries[product_id]
+                if supplier_id is not None and entry.supplier_id != supplier_id:
+                    continue
+                if others and not all(any(key.startswith(token) for key in entry.keys) for token in others):
+                    continue
+                results.append(
+                    {"id": product_id, "name": entry.name, "sku": entry.sku, "supplier_id": entry.supplier_id}
+                )
+                if len(results) >= limit:
+                    return
+
+        searches = []
+        raw = q.strip().lower()
+        if raw and not any(c.isspace() for c in raw) and not _WORD_RE.fullmatch(raw):
+            # "sku-00" only matches whole SKU keys; word splitting would lose the punctuation
+            searches.append((raw, []))
+        tokens = _WORD_RE.findall(raw)
+        if tokens:
+            longest = max(tokens, key=len)
+            searches.append((longest, [token for token in tokens if token is not longest]))
+
+        for prefix, others in searches:
+            scan(self._keys, self._ids, self._stale, prefix, others)
+            if len(results) < limit and self._delta_keys:
+                scan(self._delta_keys, self._delta_ids, _NOTHING, prefix, others)
+            if len(results) >= limit:
+                break
+        return results
+
+    def upsert(self, product: Product) -> None:
+        """Apply a created or updated product; inactive or deleted products are removed."""
+        if not product.active or product.deleted_at is not None:
+            self.remove(product.id)
+            return
+        self._apply(product.id, self._entry(product.name, product.sku, product.supplier_id))
+
+    def schedule_refresh(self) -> None:
+        """Rebuild in the background (after bulk writes too large for the delta)."""
+        if self.ready and self._session_factory is not None:
+            self._scheduled = asyncio.create_task(self._refresh_quietly())
+
+    def remove(self, product_id: UUID) -> None:
+        self._apply(product_id, None)
+
+    def _apply(self, product_id: UUID, entry: Optional[_Entry]) -> None:
+        if not self.ready and self._pending is None:
+            # Never built (disabled, or not serving HTTP): nothing to keep current
+            return
+        if self._pending is not None:
+            self._pending.append((product_id, entry))
+        # Main-array keys of this product are superseded by the delta from now on
+        self._stale.add(product_id)
+        if self._entries.pop(product_id, None) is not None and product_id in self._delta_ids:
+            kept = [(key, pid) for key, pid in zip(self._delta_keys, self._delta_ids) if pid != product_id]
+            self._delta_keys = [key for key, _ in kept]
+            self._delta_ids = [pid for _, pid in kept]
+        if entry is not None:
+            self._entries[product_id] = entry
+            for key in entry.keys:
+                i = bisect_left(self._delta_keys, key)
+                self._delta_keys.insert(i, key)
+                self._delta_ids.insert(i, product_id)
+
+    @staticmethod
+    def _entry(name: str, sku: str, supplier_id: UUID) -> _Entry:
+        keys = dict.fromkeys(_words(name))
+        keys[sys.intern(sku.lower())] = None
+        return _Entry(name, sku, supplier_id, tuple(keys))
+
+    @classmethod
+    def _build(cls, rows: list[Any]) -> tuple[list[str], list[UUID], dict[UUID, _Entry]]:
+        entries = {row.id: cls._entry(row.name, row.sku, row.supplier_id) for row in rows}
+        # Sort on the key alone: comparing UUIDs for equal keys is slow and order among them is irrelevant
+        pairs = sorted(
+            ((key, product_id) for product_id, entry in entries.items() for key in entry.keys),
+            key=itemgetter(0),
+        )
+        return [key for key, _ in pairs], [product_id for _, product_id in pairs], entries
+
+    def _swap(self, keys: list[str], ids: list[UUID], entries: dict[UUID, _Entry]) -> None:
+        self._keys, self._ids, self._entries = keys, ids, entries
+        self._delta_keys, self._delta_ids, self._stale = [], [], set()
+        self.ready = True
+
+    def load(self, rows: list[Any]) -> None:
+        """Replace the index with rows of (id, name, sku, supplier_id), synchronously."""
+        self._swap(*self._build(rows))
+
+    async def refresh(self) -> None:
+        """Rebuild the index from the database and swap it in."""
+        if self._session_factory is None:
+            raise RuntimeError("SuggestIndex.start() has not been called")
+        async with self._refresh_lock:
+            await self._rebuild()
+
+    async def _rebuild(self) -> None:
+        self._pending = []
+        try:
+            async with self._session_factory() as session:
+                stmt = select(Product.id, Product.name, Product.sku, Product.supplier_id).where(
+                    Product.active.is_(True), Product.deleted_at.is_(None)
+                )
+                rows = (await session.execute(stmt)).all()
+            # Sorting millions of keys would stall the event loop
+            built = await asyncio.to_thread(self._build, rows)
+            pending, self._pending = self._pending, None
+            self._swap(*built)
+            for product_id, entry in pending:
+                self._apply(product_id, entry)
+        finally:
+            self._pending = None
+
+    def start(self, session_factory: Callable[[], Any]) -> None:
+        """Start the build-and-refresh loop on the running event loop."""
+        self._session_factory = session_factory
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Cancel the refresh loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _refresh_quietly(self) -> None:
+        try:
+            await self.refresh()
+        except Exception:
+            # Keep serving the previous index; retry on the next tick
+            logger.warning("Product suggest index refresh failed", exc_info=True)
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await self._refresh_quietly()
+            await asyncio.sleep(self.refresh_seconds)
+
+
+suggest_index = SuggestIndex(
+    refresh_seconds=settings.SUGGEST_INDEX_REFRESH_SECONDS,
+    max_scan=settings.SUGGEST_MAX_SCAN,
+)
@@ -34,25 +34,26 @@ class Restaurant(BaseModel):
     
     # Relationships
     members: Mapped[list["RestaurantMember"]] = relationship(
-        "RestaurantMember", back_populates="restaurant", lazy="selectin"
+        "RestaurantMember", back_populates="restaurant", lazy="raise"
     )
     carts: Mapped[list["Cart"]] = relationship(
-        "Cart", back_populates="restaurant", lazy="selectin"
+        "Cart", back_populates="restaurant", lazy="raise"
     )
     orders: Mapped[list["Order"]] = relationship(
-        "Order", back_populates="restaurant", lazy="selectin"
+        "Order", back_populates="restaurant", lazy="raise"
     )
     menu_items: Mapped[list["RestaurantMenuItem"]] = relationship(
-        "RestaurantMenuItem", back_populates="restaurant", lazy="selectin", cascade="all, delete-orphan"
+        "RestaurantMenuItem", back_populates="restaurant", lazy="raise", cascade="all, delete-orphan"
     )
     supplier_connections: Mapped[list["SupplierConnection"]] = relationship(
-        "SupplierConnection", back_populates="restaurant", lazy="selectin", cascade="all, delete-orphan"
+        "SupplierConnection", back_populates="restaurant", lazy="raise", cascade="all, delete-orphan"
     )
     
     # Indexes
     __table_args__ = (
         Index("idx_restaurants_active", "active"),
         Index("idx_restaurants_city", "city"),
+        Index("idx_restaurants_created_id", "created_at", "id"),
     )
     
     def __repr__(self):
@@ -76,8 +77,8 @@ class RestaurantMember(BaseModel):
     role: Mapped[str] = mapped_column(String(20), nullable=False, default="staff")
     
     # Relationships
-    user: Mapped["User"] = relationship("User", back_populates="restaurant_memberships", lazy="selectin")
-    restaurant: Mapped["Restaurant"] = relationship("Restaurant", back_populates="members", lazy="selectin")
+    user: Mapped["User"] = relationship("User", back_populates="restaurant_memberships", lazy="raise")
+    restaurant: Mapped["Restaurant"] = relationship("Restaurant", back_populates="members", lazy="raise")
     
     # Unique constraint: one account can have one membership per restaurant
     __table_args__ = (
@@ -1,11 +1,19 @@
 """Restaurant repository for data access operations."""
-from typing import Optional
+from datetime import datetime
+from typing import Any, Optional, Sequence
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pagination import count_rows, keyset_page, listing_version, split_page
+from app.core.projection import RowProjection
 from app.domain.restaurants.models import Restaurant
+from app.domain.restaurants.schemas import RestaurantResponse
+
+
+# Columns of RestaurantResponse, selected as plain rows for read-only listings
+RESTAURANT_ROWS = RowProjection(Restaurant, RestaurantResponse)
 
 
 class RestaurantRepository:
@@ -31,34 +39,65 @@ class RestaurantRepository:
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_version(self, restaurant_id: UUID) -> Optional[datetime]:
+        """Get updated_at of a restaurant, or None if it does not exist (conditional GETs)."""
+        stmt = select(Restaurant.updated_at).where(
+            Restaurant.id == restaurant_id,
+            Restaurant.deleted_at.is_(None),
+        )
+        return (await self.session.execute(stmt)).scalar_one_or_none()
+
+    def _filtered_query(
+        self,
+        active: Optional[bool] = None,
+        city: Optional[str] = None,
+        columns: Optional[Sequence[Any]] = None,
+    ) -> Select:
+        """Build the unpaginated listing query shared by list_all and list_version."""
+        base_query = (select(*columns) if columns else select(Restaurant)).where(Restaurant.deleted_at.is_(None))
+
+        if active is not None:
+            base_query = base_query.where(Restaurant.active == active)
+        if city:
+            base_query = base_query.where(Restaurant.city == city)
+        return base_query
+
+    async def list_version(
+        self,
+        active: Optional[bool] = None,
+        city: Optional[str] = None,
+    ) -> tuple[int, Optional[datetime]]:
+        """Get (count, max(updated_at)) of the filtered listing, for list ETags."""
+        return await listing_version(self.session, self._filtered_query(active=active, city=city), Restaurant)
+
     async def list_all(
         self,
         limit: int = 50,
         offset: int = 0,
         active: Optional[bool] = None,
         city: Optional[str] = None,
-    ) -> tuple[list[Restaurant], int]:
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        columns: Optional[Sequence[Any]] = None,
+    ) -> tuple[list[Any], Optional[int], Optional[str]]:
         """
-        List restaurants with pagination and optional filters.
+        List restaurants with offset or cursor pagination and optional filters.
+
+        With columns, only those columns are selected and plain rows are
+        returned instead of tracked ORM objects (read-only listings).
 
         Returns:
-            Tuple of (restaurants list, total count)
+            Tuple of (restaurants list, total count or None, next page cursor)
         """
-        base_query = select(Restaurant).where(Restaurant.deleted_at.is_(None))
-
-        if active is not None:
-            base_query = base_query.where(Restaurant.active == active)
-        if city:
-            base_query = base_query.where(Restaurant.city == city)
+        base_query = self._filtered_query(active=active, city=city, columns=columns)
 
-        count_query = select(func.count()).select_from(base_query.subquery())
-        total_result = await self.session.execute(count_query)
-        total = total_result.scalar_one()
+        total = await count_rows(self.session, base_query) if include_total else None
 
-        paginated = base_query.limit(limit).offset(offset).order_by(Restaurant.created_at.desc())
+        paginated = keyset_page(base_query, Restaurant, limit=limit, offset=offset, cursor=cursor)
         result = await self.session.execute(paginated)
-        restaurants = result.scalars().all()
-        return list(restaurants), total
+        rows = result.all() if columns else result.scalars().all()
+        restaurants, next_cursor = split_page(list(rows), limit)
+        return restaurants, total, next_cursor
 
     async def update(self, restaurant: Restaurant, **kwargs) -> Restaurant:
         """Update restaurant fields and persist."""
@@ -42,9 +42,10 @@ class RestaurantResponse(BaseModel):
 class RestaurantListResponse(BaseModel):
     """Paginated response for restaurants list."""
     data: list[RestaurantResponse]
-    total: int
+    total: Optional[int]
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
 
 
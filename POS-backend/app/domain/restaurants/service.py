@@ -1,11 +1,12 @@
 """Restaurant service containing business logic."""
+from datetime import datetime
 from typing import Optional, TYPE_CHECKING
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.errors import NotFoundError
-from app.domain.restaurants.repository import RestaurantRepository
+from app.domain.restaurants.repository import RESTAURANT_ROWS, RestaurantRepository
 from app.domain.restaurants.schemas import RestaurantCreate, RestaurantUpdate
 
 if TYPE_CHECKING:
@@ -29,15 +30,55 @@ class RestaurantService:
             raise NotFoundError(f"Restaurant with ID {restaurant_id} not found")
         return restaurant
 
+    async def get_restaurant_version(self, restaurant_id: UUID) -> datetime:
+        """Fetch a restaurant's updated_at without loading the row (conditional GETs)."""
+        updated_at = await self.repository.get_version(restaurant_id)
+        if updated_at is None:
+            raise NotFoundError(f"Restaurant with ID {restaurant_id} not found")
+        return updated_at
+
+    async def list_restaurants_version(
+        self,
+        active: Optional[bool] = None,
+        city: Optional[str] = None,
+    ) -> tuple[int, Optional[datetime]]:
+        """(count, max(updated_at)) of the restaurant listing, for list ETags."""
+        return await self.repository.list_version(active=active, city=city)
+
     async def list_restaurants(
         self,
         limit: int = 50,
         offset: int = 0,
         active: Optional[bool] = None,
         city: Optional[str] = None,
-    ) -> tuple[list["Restaurant"], int]:
-        """List restaurants with pagination and filters."""
-        return await self.repository.list_all(limit=limit, offset=offset, active=active, city=city)
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+    ) -> tuple[list["Restaurant"], Optional[int], Optional[str]]:
+        """List restaurants with offset or cursor pagination and filters."""
+        return await self.repository.list_all(
+            limit=limit, offset=offset, active=active, city=city, cursor=cursor, include_total=include_total
+        )
+
+    async def list_restaurant_rows(
+        self,
+        limit: int = 50,
+        offset: int = 0,
+        active: Optional[bool] = None,
+        city: Optional[str] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+    ) -> tuple[list[dict], Optional[int], Optional[str]]:
+        """Same listing as list_restaurants, as RestaurantResponse-shaped dicts read from projected columns."""
+        rows, total, next_cursor = await self.repository.list_all(
+            limit=limit,
+            offset=offset,
+            active=active,
+            city=city,
+            cursor=cursor,
+            include_total=include_total,
+            columns=RESTAURANT_ROWS.columns,
+        )
+        return RESTAURANT_ROWS.to_dicts(rows), total, next_cursor
 
     async def update_restaurant(
         self,
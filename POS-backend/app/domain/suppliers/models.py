@@ -41,19 +41,20 @@ class Supplier(BaseModel):
     
     # Relationships
     members: Mapped[list["SupplierMember"]] = relationship(
-        "SupplierMember", back_populates="supplier", lazy="selectin"
+        "SupplierMember", back_populates="supplier", lazy="raise"
     )
     products: Mapped[list["Product"]] = relationship(
-        "Product", back_populates="supplier", lazy="selectin"
+        "Product", back_populates="supplier", lazy="raise"
     )
     orders: Mapped[list["Order"]] = relationship(
-        "Order", back_populates="supplier", lazy="selectin"
+        "Order", back_populates="supplier", lazy="raise"
     )
     
     # Indexes
     __table_args__ = (
         Index("idx_suppliers_active", "active"),
         Index("idx_suppliers_city", "city"),
+        Index("idx_suppliers_created_id", "created_at", "id"),
     )
     
     def __repr__(self):
@@ -77,8 +78,8 @@ class SupplierMember(BaseModel):
     role: Mapped[str] = mapped_column(String(20), nullable=False, default=MemberRole.STAFF)
     
     # Relationships
-    user: Mapped["User"] = relationship("User", back_populates="supplier_memberships", lazy="selectin")
-    supplier: Mapped["Supplier"] = relationship("Supplier", back_populates="members", lazy="selectin")
+    user: Mapped["User"] = relationship("User", back_populates="supplier_memberships", lazy="raise")
+    supplier: Mapped["Supplier"] = relationship("Supplier", back_populates="members", lazy="raise")
     
     # Unique constraint: one account can have one membership per supplier
     __table_args__ = (
@@ -1,14 +1,22 @@
 """Supplier repository for data access layer."""
-from typing import Optional
+from datetime import datetime
+from typing import Any, Optional, Sequence
 from uuid import UUID
 
-from sqlalchemy import select, func
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pagination import count_rows, keyset_page, listing_version, split_page
+from app.core.projection import RowProjection
 from app.domain.suppliers.models import Supplier
+from app.domain.suppliers.schemas import SupplierResponse
 from app.db.base import BaseModel
 
 
+# Columns of SupplierResponse, selected as plain rows for read-only listings
+SUPPLIER_ROWS = RowProjection(Supplier, SupplierResponse)
+
+
 class SupplierRepository:
     """Repository for supplier data access operations."""
     
@@ -32,36 +40,61 @@ class SupplierRepository:
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
     
+    async def get_version(self, supplier_id: UUID) -> Optional[datetime]:
+        """Get updated_at of a supplier, or None if it does not exist (conditional GETs)."""
+        stmt = select(Supplier.updated_at).where(
+            Supplier.id == supplier_id,
+            Supplier.deleted_at.is_(None)
+        )
+        return (await self.session.execute(stmt)).scalar_one_or_none()
+    
+    def _filtered_query(
+        self,
+        active: Optional[bool] = None,
+        columns: Optional[Sequence[Any]] = None,
+    ) -> Select:
+        """Build the unpaginated listing query shared by list_all and list_version."""
+        base_query = (select(*columns) if columns else select(Supplier)).where(Supplier.deleted_at.is_(None))
+        
+        # Apply filters
+        if active is not None:
+            base_query = base_query.where(Supplier.active == active)
+        return base_query
+    
+    async def list_version(self, active: Optional[bool] = None) -> tuple[int, Optional[datetime]]:
+        """Get (count, max(updated_at)) of the filtered listing, for list ETags."""
+        return await listing_version(self.session, self._filtered_query(active=active), Supplier)
+    
     async def list_all(
         self,
         limit: int = 50,
         offset: int = 0,
-        active: Optional[bool] = None
-    ) -> tuple[list[Supplier], int]:
+        active: Optional[bool] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        columns: Optional[Sequence[Any]] = None,
+    ) -> tuple[list[Any], Optional[int], Optional[str]]:
         """
-        List all suppliers with pagination.
+        List all suppliers with offset or cursor pagination.
+        
+        With columns, only those columns are selected and plain rows are
+        returned instead of tracked ORM objects (read-only listings).
         
         Returns:
-            Tuple of (suppliers list, total count)
+            Tuple of (suppliers list, total count or None, next page cursor)
         """
-        # Build base query
-        base_query = select(Supplier).where(Supplier.deleted_at.is_(None))
-        
-        # Apply filters
-        if active is not None:
-            base_query = base_query.where(Supplier.active == active)
+        base_query = self._filtered_query(active=active, columns=columns)
         
-        # Get total count
-        count_query = select(func.count()).select_from(base_query.subquery())
-        total_result = await self.session.execute(count_query)
-        total = total_result.scalar_one()
+        # Get total count (optional)
+        total = await count_rows(self.session, base_query) if include_total else None
         
         # Get paginated results
-        paginated_query = base_query.limit(limit).offset(offset).order_by(Supplier.created_at.desc())
+        paginated_query = keyset_page(base_query, Supplier, limit=limit, offset=offset, cursor=cursor)
         result = await self.session.execute(paginated_query)
-        suppliers = result.scalars().all()
+        rows = result.all() if columns else result.scalars().all()
+        suppliers, next_cursor = split_page(list(rows), limit)
         
-        return list(suppliers), total
+        return suppliers, total, next_cursor
     
     async def update(self, supplier: Supplier, **kwargs) -> Supplier:
         """Update supplier fields."""
@@ -48,8 +48,9 @@ class SupplierResponse(BaseModel):
 class SupplierListResponse(BaseModel):
     """Response schema for paginated supplier list."""
     data: list[SupplierResponse]
-    total: int
+    total: Optional[int]
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
 
@@ -1,10 +1,11 @@
 """Supplier service for business logic."""
+from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.domain.suppliers.repository import SupplierRepository
+from app.domain.suppliers.repository import SUPPLIER_ROWS, SupplierRepository
 from app.domain.suppliers.schemas import SupplierCreate, SupplierUpdate
 from app.core.errors import NotFoundError
 
@@ -29,14 +30,48 @@ class SupplierService:
             raise NotFoundError(f"Supplier with ID {supplier_id} not found")
         return supplier
     
+    async def get_supplier_version(self, supplier_id: UUID) -> datetime:
+        """Get a supplier's updated_at without loading the row (conditional GETs)."""
+        updated_at = await self.repository.get_version(supplier_id)
+        if updated_at is None:
+            raise NotFoundError(f"Supplier with ID {supplier_id} not found")
+        return updated_at
+    
+    async def list_suppliers_version(self, active: Optional[bool] = None) -> tuple[int, Optional[datetime]]:
+        """Get (count, max(updated_at)) of the supplier listing, for list ETags."""
+        return await self.repository.list_version(active=active)
+    
     async def list_suppliers(
         self,
         limit: int = 50,
         offset: int = 0,
-        active: Optional[bool] = None
-    ) -> tuple[list["Supplier"], int]:
-        """List suppliers with pagination."""
-        return await self.repository.list_all(limit=limit, offset=offset, active=active)
+        active: Optional[bool] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+    ) -> tuple[list["Supplier"], Optional[int], Optional[str]]:
+        """List suppliers with offset or cursor pagination."""
+        return await self.repository.list_all(
+            limit=limit, offset=offset, active=active, cursor=cursor, include_total=include_total
+        )
+    
+    async def list_supplier_rows(
+        self,
+        limit: int = 50,
+        offset: int = 0,
+        active: Optional[bool] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+    ) -> tuple[list[dict], Optional[int], Optional[str]]:
+        """Same listing as list_suppliers, as SupplierResponse-shaped dicts read from projected columns."""
+        rows, total, next_cursor = await self.repository.list_all(
+            limit=limit,
+            offset=offset,
+            active=active,
+            cursor=cursor,
+            include_total=include_total,
+            columns=SUPPLIER_ROWS.columns,
+        )
+        return SUPPLIER_ROWS.to_dicts(rows), total, next_cursor
     
     async def update_supplier(
         self,
@@ -52,10 +52,10 @@ class User(BaseModel):
     
     # Relationships
     supplier_memberships: Mapped[list["SupplierMember"]] = relationship(
-        "SupplierMember", back_populates="user", lazy="selectin"
+        "SupplierMember", back_populates="user", lazy="raise"
     )
     restaurant_memberships: Mapped[list["RestaurantMember"]] = relationship(
-        "RestaurantMember", back_populates="user", lazy="selectin"
+        "RestaurantMember", back_populates="user", lazy="raise"
     )
     
     def __repr__(self):
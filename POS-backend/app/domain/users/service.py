@@ -8,6 +8,7 @@ from clerk_backend_api.models.user import User as ClerkUser
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.security import invalidate_cached_user
 from app.domain.users.repository import UserRepository
 from app.domain.users.schemas import UserResponse
 
@@ -69,6 +70,7 @@ class UserService:
             clerk_user_id=clerk_user_id,
             role=role
         )
+        self.invalidate_user_cache(email)
         
         return UserResponse.model_validate(user)
     
@@ -86,4 +88,16 @@ class UserService:
         if not user:
             return None
         return UserResponse.model_validate(user)
-
+    
+    @staticmethod
+    def invalidate_user_cache(email: str) -> None:
+        """
+        Drop the cached auth lookup for a user.
+        
+        Must be called whenever a user's role changes or the user is deleted,
+        so authenticated requests stop seeing the old (user_id, role).
+        
+        Args:
+            email: User email address
+        """
+        invalidate_cached_user(email)
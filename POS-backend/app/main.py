@@ -10,18 +10,23 @@ from app.api.v1 import products as products_router
 from app.api.v1 import carts as carts_router
 from app.api.v1 import orders as orders_router
 from app.api.v1 import integrations as integrations_router
-from app.core.database import get_db, AsyncSessionLocal, engine
+from app.core.database import get_db, AsyncSessionLocal, ReadSessionLocal, engine, primary_pins
 from app.core.errors import (
     ConflictError,
     NotFoundError,
+    UnsupportedMediaTypeError,
     ValidationError,
     app_error_handler,
     general_error_handler,
 )
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.core.middleware import RequestIDMiddleware, JSONAccessLogMiddleware
-from app.core.metrics import metrics_middleware
+from app.core.idempotency import IdempotentReplay, idempotency_store, idempotent_replay_handler
+from app.core.responses import ORJSONResponse
+from app.core.middleware import ObservabilityMiddleware, stop_access_logger
+from app.core.security import clerk_jwks
+from app.domain.products.cache import catalog_cache
+from app.domain.products.suggest import suggest_index
 
 # Create FastAPI app
 app = FastAPI(
@@ -29,7 +34,8 @@ app = FastAPI(
     description="Backend API for Iris marketplace - supplier-restaurant automation platform",
     version="1.0.0",
     docs_url="/docs",           # OpenAPI Swagger UI
-    openapi_url="/openapi.json"  # OpenAPI JSON spec
+    openapi_url="/openapi.json",  # OpenAPI JSON spec
+    default_response_class=ORJSONResponse,  # orjson instead of stdlib json for every route
 )
 # CORS
 origins = [o.strip() for o in settings.CORS_ORIGINS.split(",") if o.strip()] if settings.CORS_ORIGINS else ["*"]
@@ -41,17 +47,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Request ID + JSON access logging
-app.add_middleware(RequestIDMiddleware)
-app.add_middleware(JSONAccessLogMiddleware)
-
-# Prometheus metrics middleware (per MASTER_PROMPT_BACKEND.md §13)
-app.middleware("http")(metrics_middleware)
+# Request ID + Prometheus metrics (per MASTER_PROMPT_BACKEND.md §13) + JSON access logging
+app.add_middleware(ObservabilityMiddleware)
 
 # Register global error handlers
 app.add_exception_handler(NotFoundError, app_error_handler)
 app.add_exception_handler(ValidationError, app_error_handler)
 app.add_exception_handler(ConflictError, app_error_handler)
+app.add_exception_handler(UnsupportedMediaTypeError, app_error_handler)
+app.add_exception_handler(IdempotentReplay, idempotent_replay_handler)
 app.add_exception_handler(Exception, general_error_handler)
 
 # Register API routers
@@ -68,6 +72,51 @@ metrics_app = make_asgi_app()
 app.mount("/metrics", metrics_app)
 
 
+@app.on_event("startup")
+async def start_clerk_jwks_refresh():
+    """Keep Clerk signing keys warm so token verification stays networkless."""
+    if settings.AUTH_PROVIDER == "clerk" and settings.CLERK_API_KEY:
+        clerk_jwks.start()
+
+
+@app.on_event("shutdown")
+async def stop_clerk_jwks_refresh():
+    await clerk_jwks.stop()
+
+
+@app.on_event("startup")
+async def start_suggest_index():
+    """Build the product autocomplete index in the background and keep it refreshed."""
+    if settings.SUGGEST_INDEX_ENABLED:
+        suggest_index.start(ReadSessionLocal)
+
+
+@app.on_event("shutdown")
+async def stop_suggest_index():
+    await suggest_index.stop()
+
+
+@app.on_event("shutdown")
+async def close_catalog_cache():
+    await catalog_cache.close()
+
+
+@app.on_event("shutdown")
+async def close_idempotency_store():
+    await idempotency_store.close()
+
+
+@app.on_event("shutdown")
+async def close_primary_pins():
+    await primary_pins.close()
+
+
+@app.on_event("shutdown")
+def flush_access_log():
+    """Write out queued access log records before the process exits."""
+    stop_access_logger()
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
@@ -95,6 +144,7 @@ async def health_check():
         "size": getattr(pool, "size", lambda: None)() if hasattr(pool, "size") else None,
         "checkedin": getattr(pool, "checkedin", lambda: None)() if hasattr(pool, "checkedin") else None,
         "checkedout": getattr(pool, "checkedout", lambda: None)() if hasattr(pool, "checkedout") else None,
+        "overflow": getattr(pool, "overflow", lambda: None)() if hasattr(pool, "overflow") else None,
     }
 
     status_text = "healthy" if db_ok else "unhealthy"
@@ -26,6 +26,18 @@ task_soft_time_limit = 60 * 25  # 25 minutes soft limit
 worker_prefetch_multiplier = 1  # Disable prefetching for fair distribution
 worker_max_tasks_per_child = 1000  # Restart worker after 1000 tasks
 
+# Periodic tasks (celery beat)
+beat_schedule = {
+    "purge-expired-idempotency-keys": {
+        "task": "app.workers.maintenance.purge_expired_idempotency_keys",
+        "schedule": 60 * 15,  # Every 15 minutes
+    },
+    "abandon-stale-carts": {
+        "task": "app.workers.maintenance.abandon_stale_carts",
+        "schedule": 60 * 60,  # Hourly
+    },
+}
+
 # Result backend configuration
 result_expires = 3600  # Results expire after 1 hour
 
@@ -0,0 +1,158 @@
+"""Table maintenance worker: expire idempotency keys and abandon stale carts."""
+from prometheus_client import Counter, Gauge, Histogram
+from celery import shared_task
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional
+import asyncio
+import time
+
+from app.core.config import settings
+
+# Metrics for maintenance jobs; rows are counted as each batch commits
+maintenance_duration = Histogram(
+    "iris_maintenance_job_duration_seconds",
+    "Duration of table maintenance job runs in seconds",
+    ["job", "status"]
+)
+
+maintenance_rows = Counter(
+    "iris_maintenance_rows_total",
+    "Rows deleted or updated by table maintenance jobs",
+    ["job"]
+)
+
+maintenance_backlog = Gauge(
+    "iris_maintenance_backlog",
+    "1 when the last run stopped at MAINTENANCE_MAX_BATCHES with rows left over, else 0",
+    ["job"]
+)
+
+IDEMPOTENCY_KEYS_JOB = "idempotency_keys"
+STALE_CARTS_JOB = "stale_carts"
+
+
+async def run_batches(job: str, session: Any, step: Callable[[int], Awaitable[int]]) -> int:
+    """
+    Run `step(limit)` in committed batches until one comes back short.
+
+    Each batch is its own transaction, so locks are held for one bounded
+    statement and progress survives a killed run. Stops after
+    MAINTENANCE_MAX_BATCHES; the next scheduled run continues.
+
+    Returns:
+        Total rows affected
+    """
+    batch_size = settings.MAINTENANCE_BATCH_SIZE
+    total = 0
+    for _ in range(settings.MAINTENANCE_MAX_BATCHES):
+        count = await step(batch_size)
+        await session.commit()
+        total += count
+        maintenance_rows.labels(job=job).inc(count)
+        if count < batch_size:
+            maintenance_backlog.labels(job=job).set(0)
+            return total
+    maintenance_backlog.labels(job=job).set(1)
+    return total
+
+
+async def purge_idempotency_keys(session: Any, now: Optional[datetime] = None) -> int:
+    """Delete idempotency keys past their expiry or retention; returns rows deleted."""
+    from app.domain.orders.repository import OrderRepository
+
+    now = now or datetime.now(timezone.utc)
+    created_before = now - timedelta(days=settings.IDEMPOTENCY_KEY_RETENTION_DAYS)
+    repo = OrderRepository(session)
+    return await run_batches(
+        IDEMPOTENCY_KEYS_JOB, session, lambda limit: repo.purge_idempotency_keys(now, created_before, limit)
+    )
+
+
+async def abandon_carts(session: Any, now: Optional[datetime] = None) -> int:
+    """Mark open carts idle for CART_ABANDON_AFTER_DAYS as abandoned; returns carts marked."""
+    from app.domain.carts.repository import CartRepository
+
+    now = now or datetime.now(timezone.utc)
+    idle_before = now - timedelta(days=settings.CART_ABANDON_AFTER_DAYS)
+    repo = CartRepository(session)
+    return await run_batches(STALE_CARTS_JOB, session, lambda limit: repo.abandon_stale(idle_before, limit))
+
+
+def _run(job: str, fn: Callable[[Any], Awaitable[int]]) -> int:
+    """Run a maintenance coroutine on its own engine, observing duration metrics."""
+    start_time = time.time()
+    status = "success"
+
+    async def main() -> int:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+        from app.core.database import db_url, engine_options
+
+        # A fresh engine per run: pooled connections cannot outlive asyncio.run's loop
+        engine = create_async_engine(db_url, future=True, **engine_options(db_url, "maintenance", 1, 0))
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                return await fn(session)
+        finally:
+            await engine.dispose()
+
+    try:
+        return asyncio.run(main())
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        duration = time.time() - start_time
+        maintenance_duration.labels(job=job, status=status).observe(duration)
+
+
+@shared_task
+def purge_expired_idempotency_keys() -> int:
+    """
+    Delete idempotency keys that can no longer be replayed.
+
+    Purpose:
+    - Remove store keys (app.core.idempotency) whose expires_at has passed
+    - Remove order-creation keys older than IDEMPOTENCY_KEY_RETENTION_DAYS
+    - Keep idempotency_keys (and its unique key index) from growing forever
+
+    Frequency: Every 15 minutes (celery beat)
+    Worker Module: workers/maintenance.py
+
+    Implementation Notes:
+    - Deletes in batches of MAINTENANCE_BATCH_SIZE rows, one commit each
+      (DELETE ... WHERE ctid IN (SELECT ctid ... LIMIT n FOR UPDATE SKIP LOCKED))
+    - At most MAINTENANCE_MAX_BATCHES per run; iris_maintenance_backlog shows a backlog
+
+    Returns:
+        Number of keys deleted
+
+    Raises:
+        Exception: If a batch fails (earlier batches stay committed)
+    """
+    return _run(IDEMPOTENCY_KEYS_JOB, purge_idempotency_keys)
+
+
+@shared_task
+def abandon_stale_carts() -> int:
+    """
+    Mark carts left open and untouched as abandoned.
+
+    Purpose:
+    - Move open carts idle for CART_ABANDON_AFTER_DAYS to status 'abandoned'
+    - Keep the open-cart working set (and idx_carts_restaurant_status) small
+
+    Frequency: Hourly (celery beat)
+    Worker Module: workers/maintenance.py
+
+    Implementation Notes:
+    - Updates in batches of MAINTENANCE_BATCH_SIZE carts, one commit each
+    - Carts locked by an item mutation or checkout are skipped (SKIP LOCKED)
+    - Abandoned carts reject further item changes and checkout, like converted ones
+
+    Returns:
+        Number of carts marked abandoned
+
+    Raises:
+        Exception: If a batch fails (earlier batches stay committed)
+    """
+    return _run(STALE_CARTS_JOB, abandon_carts)
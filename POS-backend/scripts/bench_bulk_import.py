@@ -0,0 +1,112 @@
+"""Throughput benchmark for the bulk product import.
+
+Usage (from POS-backend root):
+
+    PYTHONPATH=. python scripts/bench_bulk_import.py [rows] [database_url]
+
+Streams a generated JSON Lines body and then the same rows as CSV (every
+row now an update) through ProductService.bulk_upsert_products in 64 KiB
+chunks, like the request body of POST /api/v1/products/bulk. Defaults to a
+throwaway SQLite database; pass a postgresql+asyncpg URL (an empty database
+the script may create tables in) to measure against PostgreSQL.
+"""
+
+import asyncio
+import csv
+import io
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+import orjson
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.ownership import AuthzContext
+from app.db.base import Base
+from app.domain.users.models import User  # noqa: F401 - registers mappers
+from app.domain.restaurants.models import Restaurant  # noqa: F401
+from app.domain.carts.models import Cart  # noqa: F401
+from app.domain.orders.models import Order  # noqa: F401
+from app.domain.suppliers.models import Supplier
+from app.domain.products.models import Product
+from app.domain.products.service import ProductService
+
+CHUNK = 64 * 1024
+FIELDS = ["sku", "name", "unit", "price_cents", "tax_rate", "stock_qty"]
+
+
+def generate(count: int) -> list[dict]:
+    return [
+        {
+            "sku": f"BULK-{i:08d}",
+            "name": f"Bulk product {i}",
+            "unit": "kg",
+            "price_cents": 100 + i % 5000,
+            "tax_rate": 12,
+            "stock_qty": i % 100,
+        }
+        for i in range(count)
+    ]
+
+
+def jsonl_body(rows: list[dict]) -> bytes:
+    return b"".join(orjson.dumps(row) + b"\n" for row in rows)
+
+
+def csv_body(rows: list[dict]) -> bytes:
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=FIELDS)
+    writer.writeheader()
+    writer.writerows(rows)
+    return out.getvalue().encode("utf-8")
+
+
+async def chunked(body: bytes):
+    for start in range(0, len(body), CHUNK):
+        yield body[start:start + CHUNK]
+
+
+async def run_import(session_factory, body: bytes, content_type: str, supplier_id: uuid.UUID) -> tuple[dict, float]:
+    async with session_factory() as session:
+        start = time.perf_counter()
+        report = await ProductService(session).bulk_upsert_products(
+            chunks=chunked(body),
+            content_type=content_type,
+            authz=AuthzContext(user_id=None, role="admin"),
+            supplier_id=supplier_id,
+        )
+        return report, time.perf_counter() - start
+
+
+async def main(count: int, url: str | None) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(url or f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[Supplier.__table__, Product.__table__])
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        async with session_factory() as session:
+            supplier = Supplier(name="Bulk Supplier", contact_email="bulk@example.com", active=True)
+            session.add(supplier)
+            await session.commit()
+
+        rows = generate(count)
+        for label, body, content_type in (
+            ("JSON Lines (insert)", jsonl_body(rows), "application/x-ndjson"),
+            ("CSV (update)", csv_body(rows), "text/csv"),
+        ):
+            report, elapsed = await run_import(session_factory, body, content_type, supplier.id)
+            written = report["inserted"] + report["updated"]
+            print(
+                f"{label:<20} {written} rows ({report['failed']} failed) in {elapsed:.2f}s "
+                f"-> {written / elapsed:,.0f} rows/sec"
+            )
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        sys.argv[2] if len(sys.argv) > 2 else None,
+    ))
@@ -0,0 +1,100 @@
+"""Memory and throughput benchmark for the streamed catalog export.
+
+Usage (from POS-backend root):
+
+    PYTHONPATH=. python scripts/bench_export.py [rows ...] [--url database_url]
+
+For each catalog size (default 50,000 and 200,000 products) the catalog is
+generated in a throwaway SQLite database (or the given postgresql+asyncpg
+URL, an empty database the script may create tables in) and exported as
+NDJSON and CSV through ProductService.export_products, discarding the
+chunks like a client download would. Peak Python heap during the export
+(tracemalloc) should stay flat as the catalog grows.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.base import Base
+from app.domain.users.models import User  # noqa: F401 - registers mappers
+from app.domain.restaurants.models import Restaurant  # noqa: F401
+from app.domain.carts.models import Cart  # noqa: F401
+from app.domain.orders.models import Order  # noqa: F401
+from app.domain.suppliers.models import Supplier
+from app.domain.products.export import CSV, NDJSON
+from app.domain.products.models import Product
+from app.domain.products.service import ProductService
+
+
+async def build_catalog(engine, count: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all, tables=[Product.__table__, Supplier.__table__])
+        await conn.run_sync(Base.metadata.create_all, tables=[Supplier.__table__, Product.__table__])
+        supplier_id = uuid.uuid4()
+        await conn.execute(insert(Supplier), [
+            {"id": supplier_id, "name": "Export Supplier", "contact_email": "export@example.com", "active": True}
+        ])
+        for start in range(0, count, 10_000):
+            await conn.execute(insert(Product), [
+                {
+                    "id": uuid.uuid4(),
+                    "supplier_id": supplier_id,
+                    "name": f"Export product {i}",
+                    "sku": f"EXP-{i:08d}",
+                    "unit": "kg",
+                    "price_cents": 100 + i % 5000,
+                    "tax_rate": 12,
+                    "stock_qty": i % 100,
+                    "availability_status": "available",
+                    "active": True,
+                }
+                for i in range(start, min(start + 10_000, count))
+            ])
+
+
+async def export(session_factory, fmt: str) -> tuple[int, float, int]:
+    """Return (bytes, seconds, peak heap bytes)."""
+    size = 0
+    async with session_factory() as session:
+        tracemalloc.start()
+        start = time.perf_counter()
+        async for chunk in ProductService(session).export_products(fmt=fmt):
+            size += len(chunk)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return size, elapsed, peak
+
+
+async def main(counts: list[int], url: str | None) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(url or f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        print(f"{'rows':>9} {'format':<7} {'MiB out':>8} {'seconds':>8} {'rows/sec':>10} {'peak heap MiB':>14}")
+        for count in counts:
+            await build_catalog(engine, count)
+            for fmt in (NDJSON, CSV):
+                size, elapsed, peak = await export(session_factory, fmt)
+                print(
+                    f"{count:>9} {fmt:<7} {size / 2**20:8.1f} {elapsed:8.2f} "
+                    f"{count / elapsed:10,.0f} {peak / 2**20:14.1f}"
+                )
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    db_url = None
+    if "--url" in args:
+        i = args.index("--url")
+        db_url = args[i + 1]
+        del args[i:i + 2]
+    asyncio.run(main([int(arg) for arg in args] or [50_000, 200_000], db_url))
@@ -0,0 +1,122 @@
+"""Benchmark for the column-projected product list read path.
+
+Usage (from POS-backend root):
+
+    PYTHONPATH=. python scripts/bench_list_projection.py [products] [page_size]
+
+Seeds a throwaway SQLite database and serves the same product page two ways:
+- ORM: select(Product) -> ProductResponse.model_validate -> response_model
+  serialization (what GET /api/v1/products did before)
+- projected: ProductRepository.list_all(columns=...) -> RowProjection.to_dicts
+  -> ORJSONResponse
+
+Both include query execution; rows/sec is printed for each.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.responses import ORJSONResponse
+from app.db.base import Base
+from app.domain.users.models import User  # noqa: F401 - registers mappers
+from app.domain.restaurants.models import Restaurant  # noqa: F401
+from app.domain.carts.models import Cart  # noqa: F401
+from app.domain.orders.models import Order  # noqa: F401
+from app.domain.suppliers.models import Supplier
+from app.domain.products.models import Product
+from app.domain.products.repository import PRODUCT_ROWS, ProductRepository
+from app.domain.products.schemas import ProductListResponse, ProductResponse
+
+
+async def seed(session_factory: async_sessionmaker, count: int) -> None:
+    async with session_factory() as session:
+        supplier = Supplier(name="Bench Supplier", contact_email="bench@example.com", active=True)
+        session.add(supplier)
+        await session.flush()
+        session.add_all(
+            Product(
+                supplier_id=supplier.id,
+                name=f"Product {i}",
+                sku=f"SKU-{i:06d}-{uuid.uuid4().hex[:6]}",
+                unit="kg",
+                price_cents=100 + i,
+                tax_rate=12,
+                stock_qty=i % 50,
+                availability_status="available",
+                active=True,
+            )
+            for i in range(count)
+        )
+        await session.commit()
+
+
+async def orm_page(session: AsyncSession, limit: int) -> bytes:
+    products, total, next_cursor = await ProductRepository(session).list_all(limit=limit, include_total=False)
+    response = ProductListResponse(
+        data=[ProductResponse.model_validate(p) for p in products],
+        total=total,
+        limit=limit,
+        offset=0,
+        next_cursor=next_cursor,
+    )
+    # FastAPI re-validates the returned model against response_model, then encodes it
+    validated = ProductListResponse.model_validate(response, from_attributes=True)
+    return json.dumps(jsonable_encoder(validated.model_dump(mode="json"))).encode("utf-8")
+
+
+async def projected_page(session: AsyncSession, limit: int) -> bytes:
+    rows, total, next_cursor = await ProductRepository(session).list_all(
+        limit=limit, include_total=False, columns=PRODUCT_ROWS.columns
+    )
+    payload = {
+        "data": PRODUCT_ROWS.to_dicts(rows),
+        "total": total,
+        "limit": limit,
+        "offset": 0,
+        "next_cursor": next_cursor,
+    }
+    return ORJSONResponse(payload).body
+
+
+async def measure(session_factory: async_sessionmaker, page, limit: int, pages: int) -> float:
+    """Return rows/sec over `pages` page loads, each in a fresh session."""
+    start = time.perf_counter()
+    for _ in range(pages):
+        async with session_factory() as session:
+            await page(session, limit)
+    return pages * limit / (time.perf_counter() - start)
+
+
+async def main(count: int, limit: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[Supplier.__table__, Product.__table__])
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        await seed(session_factory, count)
+
+        pages = max(1, count // limit)
+        await measure(session_factory, orm_page, limit, 3)
+        await measure(session_factory, projected_page, limit, 3)
+        orm = await measure(session_factory, orm_page, limit, pages)
+        projected = await measure(session_factory, projected_page, limit, pages)
+        await engine.dispose()
+
+    print(f"page size {limit}, {pages} pages")
+    print(f"ORM + model_validate:      {orm:10.0f} rows/sec")
+    print(f"projected rows + orjson:   {projected:10.0f} rows/sec ({projected / orm:.1f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 100,
+    ))
@@ -0,0 +1,102 @@
+"""Micro-benchmark for the request observability middleware.
+
+Usage (from POS-backend root):
+
+    PYTHONPATH=. python scripts/bench_middleware.py [requests]
+
+Runs a trivial endpoint in-process (httpx ASGITransport, no network) behind:
+- the previous stack: two BaseHTTPMiddleware classes plus an
+  @app.middleware("http") function, each wrapping the response in its own task
+- the single pure-ASGI ObservabilityMiddleware
+
+and prints the mean per-request time of each. Access logging is silenced so
+the numbers reflect middleware overhead rather than stdout writes.
+"""
+
+import asyncio
+import logging
+import sys
+import time
+import uuid
+
+import httpx
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.metrics import record_request
+from app.core.middleware import ObservabilityMiddleware, get_access_logger
+
+
+class LegacyRequestIDMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        request_id = str(uuid.uuid4())
+        request.state.request_id = request_id
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+
+class LegacyAccessLogMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app):
+        super().__init__(app)
+        self.logger = get_access_logger()
+
+    async def dispatch(self, request: Request, call_next):
+        start = time.perf_counter()
+        response = await call_next(request)
+        self.logger.info(
+            f"{request.method} {request.url.path} {response.status_code} "
+            f"{int((time.perf_counter() - start) * 1000)}"
+        )
+        return response
+
+
+async def legacy_metrics_middleware(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    record_request(request.method, request.url.path, response.status_code, time.perf_counter() - start)
+    return response
+
+
+def build_app(stack: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    if stack == "legacy":
+        app.add_middleware(LegacyRequestIDMiddleware)
+        app.add_middleware(LegacyAccessLogMiddleware)
+        app.middleware("http")(legacy_metrics_middleware)
+    elif stack == "asgi":
+        app.add_middleware(ObservabilityMiddleware)
+    return app
+
+
+async def run(app: FastAPI, requests: int) -> float:
+    """Return the mean seconds per request."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(min(200, requests)):
+            await client.get("/ping")
+        start = time.perf_counter()
+        for _ in range(requests):
+            await client.get("/ping")
+        return (time.perf_counter() - start) / requests
+
+
+async def main(requests: int) -> None:
+    logging.disable(logging.INFO)
+    bare = await run(build_app("none"), requests)
+    legacy = await run(build_app("legacy"), requests)
+    current = await run(build_app("asgi"), requests)
+
+    print(f"requests per run:        {requests}")
+    print(f"no middleware:           {bare * 1e6:8.1f} us/request")
+    print(f"BaseHTTPMiddleware x3:   {legacy * 1e6:8.1f} us/request (+{(legacy - bare) * 1e6:.1f})")
+    print(f"ObservabilityMiddleware: {current * 1e6:8.1f} us/request (+{(current - bare) * 1e6:.1f})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
@@ -0,0 +1,101 @@
+"""Latency benchmark for the in-process product autocomplete index.
+
+Usage (from POS-backend root):
+
+    PYTHONPATH=. python scripts/bench_suggest.py [products] [queries]
+
+Builds a SuggestIndex over generated product names (default 500,000) and
+times suggest() for keystroke-style prefixes (1-6 characters, one or two
+words). Prints build time, p50/p99 query latency and the cost of an
+incremental upsert.
+"""
+
+import random
+import sys
+import time
+import uuid
+from types import SimpleNamespace
+
+from app.domain.products.suggest import SuggestIndex
+
+ADJECTIVES = [
+    "organic", "fresh", "frozen", "smoked", "dried", "roasted", "pickled", "raw",
+    "sliced", "whole", "ground", "crushed", "salted", "unsalted", "spicy", "sweet",
+    "wild", "aged", "young", "mild",
+]
+NOUNS = [
+    "chicken", "chickpeas", "chili", "cheddar", "cherry", "chocolate", "olive", "oil",
+    "tomato", "basil", "salmon", "shrimp", "butter", "cream", "milk", "yogurt",
+    "potato", "onion", "garlic", "pepper", "rice", "flour", "sugar", "coffee",
+    "tea", "lemon", "lime", "orange", "apple", "beef", "pork", "lamb", "tuna",
+    "mushroom", "spinach", "carrot", "cucumber", "mozzarella", "parmesan", "honey",
+]
+BRANDS = [f"brand{n}" for n in range(2000)]
+
+
+def generate(count: int, suppliers: list[uuid.UUID]) -> list[SimpleNamespace]:
+    rng = random.Random(42)
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(),
+            name=f"{rng.choice(BRANDS).title()} {rng.choice(ADJECTIVES).title()} {rng.choice(NOUNS)} {i % 997}",
+            sku=f"SKU-{i:08d}",
+            supplier_id=rng.choice(suppliers),
+            active=True,
+            deleted_at=None,
+        )
+        for i in range(count)
+    ]
+
+
+def keystroke_queries(count: int) -> list[str]:
+    rng = random.Random(7)
+    queries = []
+    for _ in range(count):
+        word = rng.choice(ADJECTIVES + NOUNS + BRANDS)
+        prefix = word[: rng.randint(1, min(6, len(word)))]
+        if rng.random() < 0.3:
+            prefix = f"{rng.choice(ADJECTIVES)} {prefix}"
+        elif rng.random() < 0.1:
+            prefix = f"sku-{rng.randint(0, 99999):05d}"
+        queries.append(prefix)
+    return queries
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def main(count: int, query_count: int) -> None:
+    suppliers = [uuid.uuid4() for _ in range(50)]
+    products = generate(count, suppliers)
+
+    index = SuggestIndex()
+    start = time.perf_counter()
+    index.load(products)
+    print(f"built index over {count} products in {time.perf_counter() - start:.2f}s")
+
+    for label, supplier_id in (("any supplier", None), ("one supplier", suppliers[0])):
+        timings = []
+        for q in keystroke_queries(query_count):
+            start = time.perf_counter()
+            index.suggest(q, limit=10, supplier_id=supplier_id)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        print(f"suggest ({label}): p50 {percentile(timings, 0.5):.3f} ms, p99 {percentile(timings, 0.99):.3f} ms")
+
+    timings = []
+    for product in products[:200]:
+        product.name = f"{product.name} renamed"
+        start = time.perf_counter()
+        index.upsert(product)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    print(f"incremental upsert: p50 {percentile(timings, 0.5):.3f} ms, p99 {percentile(timings, 0.99):.3f} ms")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 500_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20_000,
+    )
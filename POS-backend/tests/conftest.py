@@ -1,11 +1,18 @@
 import os
+from uuid import uuid4
+
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.main import app
-from app.core.database import AsyncSessionLocal
+from app.core.database import AsyncSessionLocal, get_db, get_read_db
+from app.db.base import Base
+from app.domain.carts.models import Cart, CartStatus
+from app.domain.products.models import Product
+from app.domain.suppliers.models import Supplier
 
 
 @pytest_asyncio.fixture
@@ -27,3 +34,118 @@ def auth_headers_admin() -> dict:
     return {}
 
 
+
+
+class QueryCounter:
+    """Collects the SQL statements sent to the database while active."""
+
+    def __init__(self):
+        self.statements: list[str] = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@pytest.fixture
+def count_queries(memory_engine):
+    """Count statements emitted on memory_engine (behind memory_client) during a test."""
+    counter = QueryCounter()
+    event.listen(memory_engine.sync_engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(memory_engine.sync_engine, "before_cursor_execute", counter)
+
+
+@pytest_asyncio.fixture
+async def memory_engine():
+    """In-memory SQLite engine with the full schema (Base.metadata.create_all)."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def memory_sessions(memory_engine):
+    """Session factory on memory_engine; like AsyncSessionLocal, objects stay loaded after commit."""
+    return async_sessionmaker(memory_engine, expire_on_commit=False)
+
+
+@pytest_asyncio.fixture
+async def memory_session(memory_sessions):
+    async with memory_sessions() as session:
+        yield session
+
+
+@pytest_asyncio.fixture
+async def memory_client(memory_sessions):
+    """Client for the app with its primary and read sessions served from memory_engine."""
+    async def memory_db():
+        async with memory_sessions() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = memory_db
+    app.dependency_overrides[get_read_db] = memory_db
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as ac:
+            yield ac
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_read_db, None)
+
+
+@pytest.fixture
+def make_supplier(memory_session):
+    """Factory for committed, active suppliers."""
+    async def make(**fields) -> Supplier:
+        tag = uuid4().hex[:8]
+        fields.setdefault("name", f"Supplier {tag}")
+        fields.setdefault("contact_email", f"{tag}@example.com")
+        fields.setdefault("active", True)
+        supplier = Supplier(**fields)
+        memory_session.add(supplier)
+        await memory_session.commit()
+        return supplier
+
+    return make
+
+
+@pytest.fixture
+def make_products(memory_session):
+    """Factory for `count` committed products of a supplier; i-th price is 100 * (i + 1) cents."""
+    async def make(supplier: Supplier, count: int = 1, **fields) -> list[Product]:
+        tag = uuid4().hex[:8]
+        products = [
+            Product(**{
+                "supplier_id": supplier.id,
+                "name": f"Product {tag} {i}",
+                "sku": f"SKU-{tag}-{i}",
+                "unit": "kg",
+                "price_cents": 100 * (i + 1),
+                "tax_rate": 10,
+                "stock_qty": 100,
+                **fields,
+            })
+            for i in range(count)
+        ]
+        memory_session.add_all(products)
+        await memory_session.commit()
+        return products
+
+    return make
+
+
+@pytest.fixture
+def make_cart(memory_session):
+    """Factory for committed carts (open by default)."""
+    async def make(restaurant_id, status: str = CartStatus.OPEN) -> Cart:
+        cart = Cart(restaurant_id=restaurant_id, created_by_user_id=uuid4(), status=status)
+        memory_session.add(cart)
+        await memory_session.commit()
+        return cart
+
+    return make
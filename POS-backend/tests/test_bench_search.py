@@ -0,0 +1,38 @@
+"""Smoke test scripts/bench_search.py so it keeps working as the search code changes."""
+import importlib.util
+import inspect
+import os
+from pathlib import Path
+
+import pytest
+
+from app.domain.products.repository import ProductRepository
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "bench_search.py"
+
+
+@pytest.fixture(scope="module")
+def bench():
+    spec = importlib.util.spec_from_file_location("bench_search", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_script_matches_search_api(bench):
+    """The script calls ProductRepository.search(q, limit=...) and seeds SKUs in the queried format."""
+    assert "limit" in inspect.signature(ProductRepository.search).parameters
+    sku = dict(bench.QUERIES)["exact sku"]
+    assert sku == "SKU-" + sku.removeprefix("SKU-").zfill(8)
+    assert bench._sql_array(["a", "b"]) == "ARRAY['a', 'b']"
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not os.environ.get("BENCH_DATABASE_URL"), reason="needs BENCH_DATABASE_URL (PostgreSQL with pg_trgm)")
+async def test_script_runs_on_tiny_catalog(bench, capsys):
+    await bench.main(count=200, repeats=2)
+
+    out = capsys.readouterr().out
+    assert "generated 200 products" in out
+    for label, _ in bench.QUERIES:
+        assert label in out
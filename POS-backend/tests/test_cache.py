@@ -0,0 +1,44 @@
+"""Test the in-process TTL/LRU cache."""
+from app.core import cache as cache_module
+from app.core.cache import TTLCache
+
+
+def test_lru_eviction():
+    """The least recently used entry is evicted when the cache is full."""
+    cache = TTLCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_ttl_expiry(monkeypatch):
+    """Entries stop being served once their TTL has elapsed."""
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = TTLCache(max_entries=10, ttl_seconds=5)
+    cache.set("user@example.com", ("id", "restaurant"))
+    cache.set("short", "value", ttl_seconds=1)
+
+    now[0] += 2
+    assert cache.get("short") is None
+    assert cache.get("user@example.com") == ("id", "restaurant")
+
+    now[0] += 4
+    assert cache.get("user@example.com") is None
+    assert len(cache) == 0
+
+
+def test_invalidate():
+    """Invalidated entries are dropped immediately."""
+    cache = TTLCache(max_entries=10, ttl_seconds=60)
+    cache.set("user@example.com", ("id", "restaurant"))
+    cache.invalidate("user@example.com")
+    cache.invalidate("missing@example.com")
+
+    assert cache.get("user@example.com") is None
@@ -0,0 +1,155 @@
+"""Test batched cart item operations."""
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy import event, select, update
+
+from app.core.errors import ConflictError, NotFoundError
+from app.core.ownership import AuthzContext
+from app.domain.carts.models import Cart, CartItem, CartStatus
+from app.domain.carts.schemas import CartItemsBatch
+from app.domain.carts.service import CartService
+from app.domain.carts.totals import line_amounts
+
+RESTAURANT_ID = uuid4()
+OWNER = AuthzContext(user_id=uuid4(), role="restaurant", restaurant_ids=frozenset({RESTAURANT_ID}))
+
+
+@pytest.fixture
+def session(memory_session):
+    return memory_session
+
+
+@pytest_asyncio.fixture
+async def catalog(make_supplier, make_products):
+    return await make_products(await make_supplier(), count=40)
+
+
+@pytest_asyncio.fixture
+async def cart(make_cart):
+    return await make_cart(RESTAURANT_ID)
+
+
+def _batch(*operations) -> CartItemsBatch:
+    return CartItemsBatch.model_validate({"operations": list(operations)})
+
+
+@pytest.mark.asyncio
+async def test_full_cart_in_constant_statements(memory_engine, session, catalog, cart):
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(memory_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        _, items = await CartService(session).apply_item_batch(
+            cart.id,
+            _batch(*[{"op": "add", "product_id": str(product.id), "qty": 2} for product in catalog]).operations,
+            OWNER,
+        )
+    finally:
+        event.remove(memory_engine.sync_engine, "before_cursor_execute", listener)
+
+    assert len(items) == 40
+    assert {item.unit_price_cents for item in items} == {product.price_cents for product in catalog}
+    # cart (+ ownership), prices, insert, cart totals, final item list; the insert is batched
+    assert len([s for s in statements if not s.startswith(("BEGIN", "COMMIT"))]) <= 5, statements
+
+
+@pytest.mark.asyncio
+async def test_mixed_operations(session, catalog, cart):
+    service = CartService(session)
+    _, first = await service.apply_item_batch(cart.id, _batch(
+        {"op": "add", "product_id": str(catalog[0].id), "qty": 1},
+        {"op": "add", "product_id": str(catalog[1].id), "qty": 1},
+    ).operations, OWNER)
+    keep, drop = sorted(first, key=lambda item: item.unit_price_cents)
+
+    _, items = await service.apply_item_batch(cart.id, _batch(
+        {"op": "update", "item_id": str(keep.id), "qty": 5},
+        {"op": "remove", "item_id": str(drop.id)},
+        {"op": "add", "product_id": str(catalog[2].id), "qty": 3},
+    ).operations, OWNER)
+    assert sorted((item.product_id, float(item.qty)) for item in items) == sorted(
+        [(catalog[0].id, 5.0), (catalog[2].id, 3.0)]
+    )
+
+
+@pytest.mark.asyncio
+async def test_totals_written_once_per_batch(memory_engine, session, catalog, cart):
+    service = CartService(session)
+    _, first = await service.apply_item_batch(cart.id, _batch(
+        *[{"op": "add", "product_id": str(product.id), "qty": 1} for product in catalog[:4]]
+    ).operations, OWNER)
+    a, b, c, d = sorted(first, key=lambda item: item.unit_price_cents)
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(memory_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        cart, items = await service.apply_item_batch(cart.id, _batch(
+            {"op": "update", "item_id": str(a.id), "qty": 2.5},
+            {"op": "update", "item_id": str(b.id), "qty": 3},
+            {"op": "remove", "item_id": str(c.id)},
+            {"op": "update", "item_id": str(a.id), "qty": 1.5},
+            {"op": "add", "product_id": str(catalog[4].id), "qty": 0.333},
+        ).operations, OWNER)
+    finally:
+        event.remove(memory_engine.sync_engine, "before_cursor_execute", listener)
+
+    assert len([s for s in statements if s.startswith("UPDATE carts")]) == 1, statements
+    amounts = [line_amounts(item.unit_price_cents, item.qty, item.tax_rate) for item in items]
+    assert (cart.subtotal_cents, cart.tax_cents, cart.line_count) == (
+        sum(subtotal for subtotal, _ in amounts), sum(tax for _, tax in amounts), 4
+    )
+    stored = (await session.execute(
+        select(Cart.subtotal_cents, Cart.tax_cents, Cart.line_count).where(Cart.id == cart.id)
+    )).one()
+    assert tuple(stored) == (cart.subtotal_cents, cart.tax_cents, 4)
+    assert {item.id for item in items} >= {a.id, b.id, d.id}
+
+
+@pytest.mark.asyncio
+async def test_invalid_operation_rejects_whole_batch(session, catalog, cart):
+    service = CartService(session)
+    cart_id, product_id = cart.id, catalog[0].id  # objects expire on rollback
+    with pytest.raises(NotFoundError, match=r"operations\[1\]"):
+        await service.apply_item_batch(cart_id, _batch(
+            {"op": "add", "product_id": str(product_id), "qty": 1},
+            {"op": "add", "product_id": str(uuid4()), "qty": 1},
+        ).operations, OWNER)
+    await session.rollback()
+
+    with pytest.raises(NotFoundError, match=r"operations\[0\]"):
+        await service.apply_item_batch(cart_id, _batch({"op": "remove", "item_id": str(uuid4())}).operations, OWNER)
+    await session.rollback()
+
+    items = (await session.execute(select(CartItem).where(CartItem.cart_id == cart_id))).scalars().all()
+    assert items == []
+
+
+@pytest.mark.asyncio
+async def test_ownership_and_status_checked(session, catalog, cart):
+    operations = _batch({"op": "add", "product_id": str(catalog[0].id), "qty": 1}).operations
+    cart_id = cart.id
+    stranger = AuthzContext(user_id=uuid4(), role="restaurant")
+    with pytest.raises(HTTPException) as exc_info:
+        await CartService(session).apply_item_batch(cart_id, operations, stranger)
+    assert exc_info.value.status_code == 403
+    await session.rollback()
+
+    await session.execute(update(Cart).where(Cart.id == cart_id).values(status=CartStatus.CONVERTED))
+    await session.commit()
+    with pytest.raises(ConflictError):
+        await CartService(session).apply_item_batch(cart_id, operations, OWNER)
+
+
+def test_batch_schema_validation():
+    with pytest.raises(PydanticValidationError):
+        _batch({"op": "add", "item_id": str(uuid4()), "qty": 1})
+    with pytest.raises(PydanticValidationError):
+        _batch({"op": "update", "item_id": str(uuid4()), "qty": 0})
+    with pytest.raises(PydanticValidationError):
+        CartItemsBatch.model_validate({"operations": []})
+    assert _batch({"op": "remove", "item_id": str(uuid4())}).operations[0].op == "remove"
@@ -0,0 +1,127 @@
+"""Test incrementally maintained cart totals."""
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import update
+
+from app.core.errors import NotFoundError
+from app.core.ownership import AuthzContext
+from app.domain.carts.models import Cart
+from app.domain.carts.schemas import CartItemsBatch, CartItemUpdate
+from app.domain.carts.service import CartService
+from app.domain.carts.totals import line_amounts
+from app.domain.orders.repository import OrderRepository
+from app.domain.orders.schemas import OrderCreate
+from app.domain.orders.service import OrderService
+
+RESTAURANT_ID = uuid4()
+OWNER = AuthzContext(user_id=uuid4(), role="restaurant", restaurant_ids=frozenset({RESTAURANT_ID}))
+
+
+def test_line_amounts_round_half_up():
+    assert line_amounts(199, 3, 10) == (597, 60)  # tax 59.7
+    assert line_amounts(250, 0.5, 10) == (125, 13)  # tax 12.5 rounds up
+    assert line_amounts(333, Decimal("1.500"), Decimal("7.00")) == (500, 35)  # 499.5 -> 500; 34.965 -> 35
+    assert line_amounts(101, 0.333, 0) == (34, 0)  # float qty taken at its printed value
+
+
+@pytest.fixture
+def session(memory_session):
+    return memory_session
+
+
+@pytest_asyncio.fixture
+async def products(make_supplier, make_products):
+    supplier = await make_supplier()
+    [flour] = await make_products(supplier, name="Flour", price_cents=199, tax_rate=10)
+    [oil] = await make_products(supplier, name="Oil", unit="L", price_cents=333, tax_rate=7)
+    return [flour, oil]
+
+
+@pytest_asyncio.fixture
+async def cart_id(make_cart):
+    return (await make_cart(RESTAURANT_ID)).id
+
+
+async def _totals(session, cart_id) -> tuple[int, int, int]:
+    cart = await CartService(session).get_cart(cart_id, OWNER)
+    await session.refresh(cart)
+    return cart.subtotal_cents, cart.tax_cents, cart.line_count
+
+
+@pytest.mark.asyncio
+async def test_single_item_mutations_maintain_totals(session, products, cart_id):
+    service = CartService(session)
+    flour = await service.add_item(cart_id, products[0].id, 3, OWNER)
+    oil = await service.add_item(cart_id, products[1].id, 1.5, OWNER)
+    assert await _totals(session, cart_id) == (597 + 500, 60 + 35, 2)
+
+    await service.update_item(cart_id, flour.id, CartItemUpdate(qty=1), OWNER)
+    assert await _totals(session, cart_id) == (199 + 500, 20 + 35, 2)
+
+    await service.delete_item(cart_id, oil.id, OWNER)
+    assert await _totals(session, cart_id) == (199, 20, 1)
+
+
+@pytest.mark.asyncio
+async def test_batch_maintains_totals_and_order_reuses_them(session, products, cart_id):
+    service = CartService(session)
+    batch = CartItemsBatch.model_validate({"operations": [
+        {"op": "add", "product_id": str(products[0].id), "qty": 3},
+        {"op": "add", "product_id": str(products[1].id), "qty": 1.5},
+        {"op": "add", "product_id": str(products[0].id), "qty": 2},
+    ]})
+    cart, items = await service.apply_item_batch(cart_id, batch.operations, OWNER)
+    assert (cart.subtotal_cents, cart.tax_cents, cart.line_count) == (597 + 500 + 398, 60 + 35 + 40, 3)
+
+    repo = OrderRepository(session)
+    quantities, summary = await repo._cart_quantities(cart_id)
+    assert summary == (cart.line_count, cart.subtotal_cents, cart.tax_cents)
+    assert quantities == {products[0].id: Decimal(5), products[1].id: Decimal("1.5")}
+    assert await repo._cart_line_totals(cart_id) == (cart.subtotal_cents, cart.tax_cents)
+
+    removed = next(item for item in items if float(item.qty) == 2)
+    batch = CartItemsBatch.model_validate({"operations": [{"op": "remove", "item_id": str(removed.id)}]})
+    cart, _ = await service.apply_item_batch(cart_id, batch.operations, OWNER)
+    assert (cart.subtotal_cents, cart.tax_cents, cart.line_count) == (597 + 500, 60 + 35, 2)
+
+    # A failed batch leaves the stored totals untouched
+    batch = CartItemsBatch.model_validate({"operations": [
+        {"op": "add", "product_id": str(products[0].id), "qty": 1},
+        {"op": "remove", "item_id": str(uuid4())},
+    ]})
+    with pytest.raises(NotFoundError):
+        await service.apply_item_batch(cart_id, batch.operations, OWNER)
+    await session.rollback()
+    assert await _totals(session, cart_id) == (597 + 500, 60 + 35, 2)
+
+
+@pytest.mark.asyncio
+async def test_line_totals_fallback_matches_stored_totals(session, products, cart_id):
+    service = CartService(session)
+    await service.add_item(cart_id, products[0].id, 0.5, OWNER)
+    await service.add_item(cart_id, products[1].id, 2.25, OWNER)
+    # Simulate drift from rows written without maintaining the totals
+    await session.execute(update(Cart).where(Cart.id == cart_id).values(subtotal_cents=0, tax_cents=0, line_count=0))
+    await session.commit()
+    subtotal, tax = await OrderRepository(session)._cart_line_totals(cart_id)
+    assert (subtotal, tax) == (
+        line_amounts(199, 0.5, 10)[0] + line_amounts(333, 2.25, 7)[0],
+        line_amounts(199, 0.5, 10)[1] + line_amounts(333, 2.25, 7)[1],
+    )
+
+
+@pytest.mark.asyncio
+async def test_order_recomputes_totals_that_drifted_with_same_line_count(session, products, cart_id):
+    service = CartService(session)
+    await service.add_item(cart_id, products[0].id, 3, OWNER)
+    await service.add_item(cart_id, products[1].id, 1.5, OWNER)
+    # Line count still matches, subtotal and tax do not
+    await session.execute(update(Cart).where(Cart.id == cart_id).values(subtotal_cents=1, tax_cents=0))
+    await session.commit()
+
+    data = OrderCreate(cart_id=cart_id, buyer_restaurant_id=RESTAURANT_ID, supplier_id=products[0].supplier_id)
+    order = await OrderService(session).create_order(data, "drifted-totals", OWNER)
+    assert (order.total_cents, order.tax_cents) == (597 + 500, 60 + 35)
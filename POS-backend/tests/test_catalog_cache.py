@@ -0,0 +1,93 @@
+"""Test the product catalog cache and its versioned invalidation."""
+import asyncio
+from uuid import uuid4
+
+from app.core.cache import MemoryCacheBackend
+from app.domain.products.cache import CatalogCache
+
+
+def _cache(ttl_seconds: float = 60) -> CatalogCache:
+    return CatalogCache(MemoryCacheBackend(max_entries=100, ttl_seconds=ttl_seconds), ttl_seconds=ttl_seconds)
+
+
+def test_list_cached_per_params():
+    """Listings are cached per parameter set."""
+    cache = _cache()
+    supplier_id = uuid4()
+    params = {"supplier_id": supplier_id, "active": True, "q": None, "cursor": None}
+    payload = {"data": [{"id": str(uuid4()), "price_cents": 100}], "total": 1, "next_cursor": None}
+
+    async def run():
+        await (await cache.lookup_list(params)).store(payload)
+        return (await cache.lookup_list(params)).value, (await cache.lookup_list({**params, "active": False})).value
+
+    hit, other = asyncio.run(run())
+    assert hit == payload
+    assert other is None
+
+
+def test_invalidate_hides_earlier_entries():
+    """A product write bumps the version, so neither lists nor products are served stale."""
+    cache = _cache()
+    product_id = uuid4()
+    params = {"supplier_id": None}
+
+    async def run():
+        await (await cache.lookup_product(product_id)).store({"price_cents": 100})
+        await (await cache.lookup_list(params)).store({"data": [], "total": 0, "next_cursor": None})
+        await cache.invalidate()
+        return (await cache.lookup_product(product_id)).value, (await cache.lookup_list(params)).value
+
+    assert asyncio.run(run()) == (None, None)
+
+
+def test_write_during_read_is_not_cached_under_new_version():
+    """Rows read before a concurrent write are stored under the version the read started with."""
+    cache = _cache()
+    product_id = uuid4()
+
+    async def run():
+        entry = await cache.lookup_product(product_id)
+        await cache.invalidate()  # price change lands while the DB read is in flight
+        await entry.store({"price_cents": 100})
+        return (await cache.lookup_product(product_id)).value
+
+    assert asyncio.run(run()) is None
+
+
+def test_stock_invalidation_is_scoped_to_products_and_suppliers():
+    """An order hides entries showing its products' stock and keeps the rest."""
+    cache = _cache()
+    ordered, other = uuid4(), uuid4()
+    ordered_supplier, other_supplier = uuid4(), uuid4()
+    lists = {
+        "all": {"supplier_id": None},
+        "ordered_supplier": {"supplier_id": ordered_supplier},
+        "other_supplier": {"supplier_id": other_supplier},
+    }
+
+    async def run():
+        for product_id in (ordered, other):
+            await (await cache.lookup_product(product_id)).store({"stock_qty": 5})
+        for params in lists.values():
+            await (await cache.lookup_list(params)).store({"data": [], "total": 0, "next_cursor": None})
+        await cache.invalidate_stock([ordered], [ordered_supplier])
+        products = {p: (await cache.lookup_product(p)).value is not None for p in (ordered, other)}
+        listed = {name: (await cache.lookup_list(params)).value is not None for name, params in lists.items()}
+        return products, listed
+
+    products, listed = asyncio.run(run())
+    assert products == {ordered: False, other: True}
+    assert listed == {"all": False, "ordered_supplier": False, "other_supplier": True}
+
+
+def test_zero_ttl_disables_cache():
+    """CATALOG_CACHE_TTL_SECONDS=0 turns the cache off."""
+    cache = _cache(ttl_seconds=0)
+    product_id = uuid4()
+
+    async def run():
+        await (await cache.lookup_product(product_id)).store({"price_cents": 100})
+        return (await cache.lookup_product(product_id)).value
+
+    assert asyncio.run(run()) is None
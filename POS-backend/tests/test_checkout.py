@@ -0,0 +1,184 @@
+"""Test multi-supplier checkout: one order per supplier in one transaction."""
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, select
+
+from app.api.v1 import orders as orders_api
+from app.core import idempotency
+from app.core.errors import AppError, ConflictError, app_error_handler
+from app.core.idempotency import IdempotentReplay, MemoryIdempotencyStore, idempotent_replay_handler
+from app.core.ownership import AuthzContext
+from app.core.security import get_current_user
+from app.domain.carts.models import Cart, CartStatus
+from app.domain.carts.schemas import CartItemsBatch
+from app.domain.carts.service import CartService
+from app.domain.orders.models import IdempotencyKey, Order
+from app.domain.orders.repository import scoped_idempotency_key
+from app.domain.orders.schemas import CheckoutCreate, OrderCreate
+from app.domain.orders.service import OrderService
+from app.domain.products.models import Product
+
+RESTAURANT_ID = uuid4()
+OWNER = AuthzContext(user_id=uuid4(), role="restaurant", restaurant_ids=frozenset({RESTAURANT_ID}))
+
+
+@pytest.fixture
+def session(memory_session):
+    return memory_session
+
+
+@pytest.fixture
+def mixed_cart(session, make_supplier, make_products, make_cart):
+    """Factory for an open cart holding 2 units of every product of `suppliers` suppliers."""
+    async def make(suppliers: int, products_per_supplier: int = 2, stock: int = 10):
+        products = []
+        for _ in range(suppliers):
+            products += await make_products(await make_supplier(), count=products_per_supplier, stock_qty=stock)
+        cart = await make_cart(RESTAURANT_ID)
+        batch = CartItemsBatch.model_validate(
+            {"operations": [{"op": "add", "product_id": str(product.id), "qty": 2} for product in products]}
+        )
+        cart, _ = await CartService(session).apply_item_batch(cart.id, batch.operations, OWNER)
+        return cart, products
+
+    return make
+
+
+async def _place(session, cart_id, key: str, authz: AuthzContext = OWNER, restaurant_id=RESTAURANT_ID):
+    # Checkout opens its own transaction; end the one left by earlier reads
+    await session.commit()
+    data = CheckoutCreate(cart_id=cart_id, buyer_restaurant_id=restaurant_id)
+    return await OrderService(session).checkout(data, key, authz)
+
+
+@pytest.mark.asyncio
+async def test_checkout_places_one_order_per_supplier(session, mixed_cart):
+    cart, products = await mixed_cart(suppliers=3)
+    cart_id, subtotal, tax = cart.id, cart.subtotal_cents, cart.tax_cents
+
+    orders, placed = await _place(session, cart_id, "checkout-1")
+    assert placed
+    assert len(orders) == 3
+    assert sorted(order.supplier_id for order in orders) == sorted({product.supplier_id for product in products})
+    assert all(order.cart_id == cart_id and order.created_at is not None for order in orders)
+    # 2 x 100 + 2 x 200 per supplier, 10% tax
+    assert {(order.total_cents, order.tax_cents) for order in orders} == {(600, 60)}
+    assert (sum(o.total_cents for o in orders), sum(o.tax_cents for o in orders)) == (subtotal, tax)
+
+    stock = (await session.execute(select(Product.stock_qty))).scalars().all()
+    assert stock == [8] * len(products)
+    assert (await session.execute(select(Cart.status).where(Cart.id == cart_id))).scalar_one() == CartStatus.CONVERTED
+
+    # A retry with the same key returns the same orders without placing new ones
+    retried, placed = await _place(session, cart_id, "checkout-1")
+    assert not placed
+    assert [order.id for order in retried] == [order.id for order in orders]
+
+
+@pytest.mark.asyncio
+async def test_checkout_round_trips_do_not_grow_with_suppliers(memory_engine, session, mixed_cart):
+    counts = []
+    for suppliers in (1, 5):
+        cart, _ = await mixed_cart(suppliers=suppliers)
+        statements = []
+        listener = lambda *args: statements.append(args[2])  # noqa: E731
+        event.listen(memory_engine.sync_engine, "before_cursor_execute", listener)
+        try:
+            orders, _ = await _place(session, cart.id, f"rt-{suppliers}")
+        finally:
+            event.remove(memory_engine.sync_engine, "before_cursor_execute", listener)
+        assert len(orders) == suppliers
+        counts.append(len([s for s in statements if not s.startswith(("BEGIN", "COMMIT"))]))
+    assert counts[0] == counts[1], counts
+
+
+@pytest.mark.asyncio
+async def test_short_stock_rolls_back_every_order(session, mixed_cart):
+    cart, products = await mixed_cart(suppliers=2, stock=10)
+    cart_id, short_id = cart.id, products[-1].id
+    await session.execute(Product.__table__.update().where(Product.id == short_id).values(stock_qty=1))
+    await session.commit()
+
+    with pytest.raises(ConflictError, match="Insufficient inventory"):
+        await _place(session, cart_id, "short")
+
+    assert (await session.execute(select(Order))).scalars().all() == []
+    assert (await session.execute(select(IdempotencyKey))).scalars().all() == []
+    assert (await session.execute(select(Cart.status).where(Cart.id == cart_id))).scalar_one() == CartStatus.OPEN
+    assert sorted((await session.execute(select(Product.stock_qty))).scalars().all()) == [1, 10, 10, 10]
+
+
+@pytest.mark.asyncio
+async def test_checkout_checks_cart_restaurant_and_state(session, mixed_cart):
+    cart, _ = await mixed_cart(suppliers=1)
+    cart_id = cart.id
+    other_restaurant = uuid4()
+    other_owner = AuthzContext(user_id=uuid4(), role="restaurant", restaurant_ids=frozenset({other_restaurant}))
+    with pytest.raises(ConflictError, match="Cart not open"):
+        await _place(session, cart_id, "foreign", other_owner, other_restaurant)
+
+    await session.rollback()
+    await _place(session, cart_id, "first")
+    with pytest.raises(ConflictError, match="Cart not open"):
+        await _place(session, cart_id, "second")
+
+
+@pytest.mark.asyncio
+async def test_checkout_endpoint_dispatches_one_event_per_order(session, mixed_cart, monkeypatch):
+    monkeypatch.setattr(idempotency, "idempotency_store", MemoryIdempotencyStore(max_entries=10))
+    cart, _ = await mixed_cart(suppliers=2)
+    await session.commit()
+    app = FastAPI()
+    app.add_exception_handler(AppError, app_error_handler)
+    app.add_exception_handler(IdempotentReplay, idempotent_replay_handler)
+    app.include_router(orders_api.router, prefix="/orders")
+    app.dependency_overrides[get_current_user] = lambda: {"sub": "owner", "role": "restaurant", "authz": OWNER}
+    app.dependency_overrides[orders_api.get_order_service] = lambda: OrderService(session)
+
+    body = {"cart_id": str(cart.id), "buyer_restaurant_id": str(RESTAURANT_ID)}
+    headers = {"Idempotency-Key": "api-checkout"}
+    with patch.object(orders_api, "dispatch_order_placed") as dispatch:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as client:
+            first = await client.post("/orders/checkout", json=body, headers=headers)
+            replay = await client.post("/orders/checkout", json=body, headers=headers)
+
+    assert first.status_code == replay.status_code == 201
+    data = first.json()
+    assert len(data["orders"]) == 2
+    assert data["total_cents"] == sum(order["total_cents"] for order in data["orders"]) == cart.subtotal_cents
+    assert sorted(call.args[0] for call in dispatch.call_args_list) == sorted(o["id"] for o in data["orders"])
+    assert replay.json() == data and replay.headers["Idempotent-Replayed"] == "true"
+
+
+@pytest.mark.asyncio
+async def test_key_reused_across_order_endpoints_places_both(session, mixed_cart):
+    """POST /orders and POST /orders/checkout claim their keys in separate scopes."""
+    single, products = await mixed_cart(suppliers=1)
+    single_id, supplier_id = single.id, products[0].supplier_id
+    mixed, _ = await mixed_cart(suppliers=2)
+
+    await session.commit()
+    data = OrderCreate(cart_id=single_id, buyer_restaurant_id=RESTAURANT_ID, supplier_id=supplier_id)
+    order = await OrderService(session).create_order(data, "shared-key", OWNER)
+    orders, placed = await _place(session, mixed.id, "shared-key")
+
+    assert placed and len(orders) == 2
+    assert order.id not in {o.id for o in orders}
+    keys = set((await session.execute(select(IdempotencyKey.key))).scalars())
+    assert keys == {"orders.create:shared-key", "orders.checkout:shared-key"}
+
+    # Each scope still replays its own order
+    await session.commit()
+    assert (await OrderService(session).create_order(data, "shared-key", OWNER)).id == order.id
+
+
+def test_scoped_key_fits_the_key_column():
+    long_key = "k" * 255
+    scoped = scoped_idempotency_key("orders.checkout", long_key)
+    assert len(scoped) <= 255 and scoped.startswith("orders.checkout:sha256:")
+    assert scoped != scoped_idempotency_key("orders.create", long_key)
+    assert scoped_idempotency_key("orders.create", "abc") == "orders.create:abc"
@@ -0,0 +1,56 @@
+"""Test ETag / Last-Modified evaluation for conditional GETs."""
+from datetime import datetime, timezone
+
+from starlette.requests import Request
+
+from app.core.conditional import as_utc, is_not_modified, make_etag, not_modified, validator_headers
+
+
+def _request(**headers: str) -> Request:
+    raw = [(name.replace("_", "-").lower().encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+UPDATED = datetime(2025, 1, 2, 3, 4, 5, 678000, tzinfo=timezone.utc)
+
+
+def test_etag_is_stable_across_datetime_and_string_forms():
+    """Cached ISO strings and naive SQLite datetimes version the same as aware datetimes."""
+    etag = make_etag("product", "abc", UPDATED)
+    assert etag.startswith('W/"')
+    assert make_etag("product", "abc", as_utc("2025-01-02T03:04:05.678Z")) == etag
+    assert make_etag("product", "abc", UPDATED.replace(tzinfo=None)) == etag
+    assert make_etag("product", "abc", datetime(2025, 1, 2, 3, 4, 6, tzinfo=timezone.utc)) != etag
+
+
+def test_if_none_match():
+    etag = make_etag("supplier", 1, UPDATED)
+    assert is_not_modified(_request(if_none_match=etag), etag)
+    # Weak comparison, lists and wildcard
+    assert is_not_modified(_request(if_none_match=etag.removeprefix("W/")), etag)
+    assert is_not_modified(_request(if_none_match=f'"other", {etag}'), etag)
+    assert is_not_modified(_request(if_none_match="*"), etag)
+    assert not is_not_modified(_request(if_none_match='W/"other"'), etag)
+    assert not is_not_modified(_request(), etag)
+
+
+def test_if_modified_since_only_without_if_none_match():
+    etag = make_etag("order", 1, UPDATED)
+    since = validator_headers(etag, UPDATED)["Last-Modified"]
+    assert since == "Thu, 02 Jan 2025 03:04:05 GMT"
+
+    assert is_not_modified(_request(if_modified_since=since), etag, UPDATED)
+    assert not is_not_modified(_request(if_modified_since="Thu, 02 Jan 2025 03:04:04 GMT"), etag, UPDATED)
+    assert not is_not_modified(_request(if_modified_since="garbage"), etag, UPDATED)
+    # Lists carry no Last-Modified; a stale ETag wins over a fresh date
+    assert not is_not_modified(_request(if_modified_since=since), etag)
+    assert not is_not_modified(_request(if_none_match='"stale"', if_modified_since=since), etag, UPDATED)
+
+
+def test_not_modified_response_has_no_body():
+    etag = make_etag("restaurant", 1, UPDATED)
+    response = not_modified(etag, UPDATED)
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == etag
+    assert response.headers["last-modified"] == "Thu, 02 Jan 2025 03:04:05 GMT"
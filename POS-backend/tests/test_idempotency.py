@@ -0,0 +1,158 @@
+"""Test Idempotency-Key reservation, replay and the store backends."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from pydantic import BaseModel
+from sqlalchemy import update
+
+from app.core import idempotency
+from app.core.errors import AppError, ConflictError, ValidationError, app_error_handler
+from app.core.idempotency import (
+    IdempotencyGuard,
+    IdempotencyRecord,
+    IdempotentReplay,
+    MemoryIdempotencyStore,
+    PostgresIdempotencyStore,
+    idempotent,
+    idempotent_replay_handler,
+)
+from app.core.ownership import AuthzContext
+from app.core.responses import ORJSONResponse
+from app.core.security import get_current_user
+from app.domain.orders.models import IdempotencyKey
+
+
+class Payment(BaseModel):
+    amount: int
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setattr(idempotency, "idempotency_store", MemoryIdempotencyStore(max_entries=100))
+    app = FastAPI()
+    app.add_exception_handler(AppError, app_error_handler)
+    app.add_exception_handler(IdempotentReplay, idempotent_replay_handler)
+    user = {"sub": "user-1", "authz": AuthzContext(user_id=uuid4())}
+    app.dependency_overrides[get_current_user] = lambda: user
+    app.state.calls = 0
+
+    @app.post("/payments", status_code=201)
+    async def pay(
+        data: Payment,
+        guard: IdempotencyGuard = Depends(idempotent("payments.create")),
+    ):
+        app.state.calls += 1
+        if data.amount < 0:
+            raise ConflictError("Declined")
+        await asyncio.sleep(0.05)
+        return await guard.save(ORJSONResponse({"call": app.state.calls, "amount": data.amount}, status_code=201))
+
+    @app.post("/strict")
+    async def strict(guard: IdempotencyGuard = Depends(idempotent("strict", required=True))):
+        return await guard.save(ORJSONResponse({"ok": True}))
+
+    return app
+
+
+@pytest_asyncio.fixture
+async def client(app):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as client:
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_retry_replays_stored_response(app, client):
+    headers = {"Idempotency-Key": "k-1"}
+    first = await client.post("/payments", json={"amount": 5}, headers=headers)
+    second = await client.post("/payments", json={"amount": 5}, headers=headers)
+    assert first.status_code == second.status_code == 201
+    assert second.json() == first.json() == {"call": 1, "amount": 5}
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert app.state.calls == 1
+
+    # Without a key every request runs
+    await client.post("/payments", json={"amount": 5})
+    assert app.state.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_key_reused_for_different_request(client):
+    headers = {"Idempotency-Key": "k-2"}
+    await client.post("/payments", json={"amount": 5}, headers=headers)
+    resp = await client.post("/payments", json={"amount": 6}, headers=headers)
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicate_waits_and_replays(app, client):
+    headers = {"Idempotency-Key": "k-3"}
+    first, second = await asyncio.gather(
+        client.post("/payments", json={"amount": 7}, headers=headers),
+        client.post("/payments", json={"amount": 7}, headers=headers),
+    )
+    assert app.state.calls == 1
+    assert first.json() == second.json()
+    assert {first.headers.get("Idempotent-Replayed"), second.headers.get("Idempotent-Replayed")} == {None, "true"}
+
+
+@pytest.mark.asyncio
+async def test_failed_request_releases_key(app, client):
+    headers = {"Idempotency-Key": "k-4"}
+    assert (await client.post("/payments", json={"amount": -1}, headers=headers)).status_code == 409
+    assert (await client.post("/payments", json={"amount": -1}, headers=headers)).status_code == 409
+    assert app.state.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_required_key(client):
+    assert (await client.post("/strict")).status_code == 409
+    assert (await client.post("/strict", headers={"Idempotency-Key": "k-5"})).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_in_progress_key_times_out():
+    store = MemoryIdempotencyStore(max_entries=10)
+    await store.reserve("key", "fp", lock_seconds=60)
+    guard = IdempotencyGuard(store, "test", key="key", fingerprint="fp")
+    with pytest.raises(ConflictError):
+        await guard.acquire(lock_seconds=60, wait_seconds=0.1)
+    with pytest.raises(ValidationError):
+        await IdempotencyGuard(store, "test", key="key", fingerprint="other").acquire(60, 0.1)
+
+
+@pytest.fixture
+def postgres_store(memory_sessions):
+    # The store's SQL also runs on SQLite (ON CONFLICT ... DO UPDATE ... WHERE)
+    return PostgresIdempotencyStore(memory_sessions), memory_sessions
+
+
+@pytest.mark.asyncio
+async def test_postgres_store_reserve_complete_release(postgres_store):
+    store, session_factory = postgres_store
+    assert await store.reserve("a", "fp", lock_seconds=60) is None
+    in_progress = await store.reserve("a", "fp", lock_seconds=60)
+    assert in_progress.fingerprint == "fp" and not in_progress.completed
+
+    record = IdempotencyRecord("fp", status_code=201, content_type="application/json", body=b'{"id": 1}')
+    await store.complete("a", record, ttl_seconds=60)
+    assert await store.reserve("a", "fp", lock_seconds=60) == record
+
+    # Completed keys are not released; in-progress ones are
+    await store.release("a")
+    assert (await store.reserve("a", "fp", lock_seconds=60)).completed
+    assert await store.reserve("b", "fp", lock_seconds=60) is None
+    await store.release("b")
+    assert await store.reserve("b", "fp", lock_seconds=60) is None
+
+    # An expired key is taken over by the next reservation
+    async with session_factory() as session:
+        past = datetime.now(timezone.utc) - timedelta(seconds=1)
+        await session.execute(update(IdempotencyKey).where(IdempotencyKey.key == "a").values(expires_at=past))
+        await session.commit()
+    assert await store.reserve("a", "new-fp", lock_seconds=60) is None
@@ -0,0 +1,97 @@
+"""Test the idempotency key expiry and stale cart maintenance jobs."""
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.domain.carts.models import Cart, CartStatus
+from app.domain.orders.models import IdempotencyKey
+from app.workers import maintenance
+
+NOW = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def session(memory_session):
+    return memory_session
+
+
+def _key(key: str, created_days_ago: int, expires_in: timedelta = None) -> IdempotencyKey:
+    return IdempotencyKey(
+        key=key,
+        created_at=NOW - timedelta(days=created_days_ago),
+        expires_at=NOW + expires_in if expires_in is not None else None,
+    )
+
+
+async def _remaining_keys(session) -> set[str]:
+    return set((await session.execute(select(IdempotencyKey.key))).scalars())
+
+
+@pytest.mark.asyncio
+async def test_purge_deletes_expired_and_retired_keys(session, monkeypatch):
+    monkeypatch.setattr(settings, "IDEMPOTENCY_KEY_RETENTION_DAYS", 30)
+    monkeypatch.setattr(settings, "MAINTENANCE_BATCH_SIZE", 2)
+    session.add_all([
+        _key("store-expired", 1, expires_in=timedelta(seconds=-1)),
+        _key("store-live", 1, expires_in=timedelta(hours=1)),
+        _key("store-old-but-live", 90, expires_in=timedelta(hours=1)),
+        _key("order-old", 31),
+        _key("order-recent", 29),
+        *[_key(f"bulk-{i}", 1, expires_in=timedelta(days=-1)) for i in range(3)],
+    ])
+    await session.commit()
+
+    assert await maintenance.purge_idempotency_keys(session, now=NOW) == 5
+    assert await _remaining_keys(session) == {"store-live", "store-old-but-live", "order-recent"}
+    assert await maintenance.purge_idempotency_keys(session, now=NOW) == 0
+
+
+@pytest.mark.asyncio
+async def test_run_stops_at_max_batches(session, monkeypatch):
+    monkeypatch.setattr(settings, "MAINTENANCE_BATCH_SIZE", 2)
+    monkeypatch.setattr(settings, "MAINTENANCE_MAX_BATCHES", 2)
+    session.add_all([_key(f"k-{i}", 1, expires_in=timedelta(seconds=-1)) for i in range(5)])
+    await session.commit()
+    rows = maintenance.maintenance_rows.labels(job=maintenance.IDEMPOTENCY_KEYS_JOB)
+    before = rows._value.get()
+
+    assert await maintenance.purge_idempotency_keys(session, now=NOW) == 4
+    assert rows._value.get() - before == 4
+    assert maintenance.maintenance_backlog.labels(job=maintenance.IDEMPOTENCY_KEYS_JOB)._value.get() == 1
+
+    # The next run finishes the backlog
+    assert await maintenance.purge_idempotency_keys(session, now=NOW) == 1
+    assert maintenance.maintenance_backlog.labels(job=maintenance.IDEMPOTENCY_KEYS_JOB)._value.get() == 0
+    assert await _remaining_keys(session) == set()
+
+
+@pytest.mark.asyncio
+async def test_abandon_only_stale_open_carts(session, monkeypatch):
+    monkeypatch.setattr(settings, "CART_ABANDON_AFTER_DAYS", 14)
+    carts = {
+        name: Cart(restaurant_id=uuid4(), created_by_user_id=uuid4(), status=status)
+        for name, status in [
+            ("stale", CartStatus.OPEN),
+            ("fresh", CartStatus.OPEN),
+            ("converted", CartStatus.CONVERTED),
+        ]
+    }
+    session.add_all(carts.values())
+    await session.commit()
+    ids = {name: cart.id for name, cart in carts.items()}
+    for name, idle_days in [("stale", 15), ("fresh", 13), ("converted", 60)]:
+        await session.execute(
+            update(Cart).where(Cart.id == ids[name]).values(updated_at=NOW - timedelta(days=idle_days))
+        )
+    await session.commit()
+
+    assert await maintenance.abandon_carts(session, now=NOW) == 1
+    statuses = dict((await session.execute(select(Cart.id, Cart.status))).all())
+    assert statuses == {
+        ids["stale"]: CartStatus.ABANDONED,
+        ids["fresh"]: CartStatus.OPEN,
+        ids["converted"]: CartStatus.CONVERTED,
+    }
@@ -0,0 +1,139 @@
+"""Test the pure-ASGI observability middleware."""
+import asyncio
+import io
+import json
+import logging
+import queue
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+from app.core.metrics import OVERFLOW_ENDPOINT, UNMATCHED_ENDPOINT, EndpointLabeler
+from app.core import middleware as middleware_module
+from app.core.middleware import (
+    BatchingQueueListener,
+    DeferredFlushStreamHandler,
+    JSONLineFormatter,
+    ObservabilityMiddleware,
+    should_log_access,
+)
+
+
+def _build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/echo")
+    async def echo(request: Request):
+        return {"request_id": request.state.request_id}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"{i}\n"
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/orders/{order_id}")
+    async def get_order(order_id: str):
+        return {"id": order_id}
+
+    @app.get("/suppliers/{supplier_id}")
+    async def get_supplier(supplier_id: str):
+        return {"id": supplier_id}
+
+    app.add_middleware(ObservabilityMiddleware)
+    return app
+
+
+def _label_after_request(app: FastAPI, labeler: EndpointLabeler, path: str) -> str:
+    """Route a request through the app and return the label for its final scope."""
+    seen = {}
+
+    async def capture(scope, receive, send):
+        await app(scope, receive, send)
+        if scope["type"] == "http":
+            seen["label"] = labeler.label(scope)
+
+    async def go():
+        transport = httpx.ASGITransport(app=capture)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await client.get(path)
+
+    asyncio.run(go())
+    return seen["label"]
+
+
+async def _get(app: FastAPI, path: str) -> httpx.Response:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get(path)
+
+
+def test_request_id_header_matches_request_state(caplog):
+    """The request ID is visible to handlers, returned as a header and logged."""
+    with caplog.at_level(logging.INFO, logger="access"):
+        response = asyncio.run(_get(_build_app(), "/echo"))
+
+    request_id = response.headers["X-Request-ID"]
+    assert response.json() == {"request_id": request_id}
+
+    entry = caplog.records[-1].msg
+    assert entry["request_id"] == request_id
+    assert entry["path"] == "/echo"
+    assert entry["status"] == 200
+
+
+def test_streaming_response_passes_through():
+    """Streaming bodies are forwarded unchanged."""
+    response = asyncio.run(_get(_build_app(), "/stream"))
+
+    assert response.status_code == 200
+    assert response.text == "0\n1\n2\n"
+    assert "X-Request-ID" in response.headers
+
+
+def test_endpoint_label_uses_route_template():
+    """Requests for different IDs share the route template label; unknown paths share one bucket."""
+    app = _build_app()
+    labeler = EndpointLabeler(max_labels=10)
+
+    assert _label_after_request(app, labeler, "/orders/1") == "/orders/{order_id}"
+    assert _label_after_request(app, labeler, "/orders/2") == "/orders/{order_id}"
+    assert _label_after_request(app, labeler, "/no/such/path/123") == UNMATCHED_ENDPOINT
+
+
+def test_endpoint_label_cardinality_cap():
+    """Templates beyond the cap collapse into the overflow label."""
+    app = _build_app()
+    labeler = EndpointLabeler(max_labels=1)
+
+    assert _label_after_request(app, labeler, "/orders/1") == "/orders/{order_id}"
+    assert _label_after_request(app, labeler, "/suppliers/1") == OVERFLOW_ENDPOINT
+    assert _label_after_request(app, labeler, "/orders/3") == "/orders/{order_id}"
+
+
+def test_queue_listener_writes_json_lines():
+    """Queued dict records are serialized by the listener thread, one JSON object per line."""
+    log_queue = queue.Queue()
+    stream = io.StringIO()
+    handler = DeferredFlushStreamHandler(stream)
+    handler.setFormatter(JSONLineFormatter())
+    listener = BatchingQueueListener(log_queue, handler, batch_size=2)
+    for i in range(3):
+        log_queue.put(logging.makeLogRecord({"msg": {"n": i}, "levelno": logging.INFO}))
+    listener.start()
+    listener.stop()
+
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == [{"n": 0}, {"n": 1}, {"n": 2}]
+
+
+def test_2xx_sampling(monkeypatch):
+    """Sampling only applies to successful responses."""
+    monkeypatch.setattr(middleware_module.settings, "ACCESS_LOG_SAMPLE_RATE_2XX", 0.0)
+
+    assert should_log_access(200) is False
+    assert should_log_access(404) is True
+    assert should_log_access(500) is True
@@ -0,0 +1,130 @@
+"""Test the set-wise product locking and stock decrement behind order placement."""
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.core.errors import ConflictError
+from app.core.ownership import AuthzContext
+from app.domain.carts.models import Cart, CartStatus
+from app.domain.carts.schemas import CartItemsBatch
+from app.domain.carts.service import CartService
+from app.domain.orders.models import IdempotencyKey, Order
+from app.domain.orders.repository import OrderRepository
+from app.domain.orders.schemas import OrderCreate
+from app.domain.orders.service import OrderService
+from app.domain.products.models import Product
+
+RESTAURANT_ID = uuid4()
+OWNER = AuthzContext(user_id=uuid4(), role="restaurant", restaurant_ids=frozenset({RESTAURANT_ID}))
+
+
+class _RecordingSession:
+    """Captures statements instead of running them, to inspect the PostgreSQL rendering."""
+
+    def __init__(self):
+        self.bind = SimpleNamespace(dialect=postgresql.dialect())
+        self.statements = []
+
+    async def execute(self, stmt, *args, **kwargs):
+        self.statements.append(stmt)
+        return SimpleNamespace(all=lambda: [])
+
+
+def _sql(stmt) -> str:
+    return " ".join(str(stmt.compile(dialect=postgresql.dialect())).split())
+
+
+async def _cart_with(session, make_cart, lines: dict) -> Cart:
+    cart = await make_cart(RESTAURANT_ID)
+    batch = CartItemsBatch.model_validate(
+        {"operations": [{"op": "add", "product_id": str(product.id), "qty": qty} for product, qty in lines.items()]}
+    )
+    cart, _ = await CartService(session).apply_item_batch(cart.id, batch.operations, OWNER)
+    return cart
+
+
+async def _place(session, cart: Cart, supplier_id, key: str) -> Order:
+    # Placement opens its own transaction; end the one left by earlier reads
+    await session.commit()
+    data = OrderCreate(cart_id=cart.id, buyer_restaurant_id=RESTAURANT_ID, supplier_id=supplier_id)
+    return await OrderService(session).create_order(data, key, OWNER)
+
+
+async def _stock(session) -> dict:
+    return dict((await session.execute(select(Product.id, Product.stock_qty))).all())
+
+
+@pytest.mark.asyncio
+async def test_multi_line_order_decrements_each_product(memory_session, make_supplier, make_products, make_cart):
+    supplier = await make_supplier()
+    a, b, c, untouched = await make_products(supplier, count=4, stock_qty=10)
+    cart = await _cart_with(memory_session, make_cart, {a: 1, b: 2, c: 3})
+
+    order = await _place(memory_session, cart, supplier.id, "multi-line")
+
+    assert order.status == "placed"
+    assert await _stock(memory_session) == {a.id: 9, b.id: 8, c.id: 7, untouched.id: 10}
+
+
+@pytest.mark.asyncio
+async def test_one_short_line_rejects_whole_order(memory_session, make_supplier, make_products, make_cart):
+    supplier = await make_supplier()
+    plenty, short = await make_products(supplier, count=2, stock_qty=10)
+    cart = await _cart_with(memory_session, make_cart, {plenty: 2, short: 3})
+    # The rollback expires loaded objects; keep the ids
+    cart_id, plenty_id, short_id = cart.id, plenty.id, short.id
+    await memory_session.execute(Product.__table__.update().where(Product.id == short_id).values(stock_qty=2))
+    await memory_session.commit()
+
+    with pytest.raises(ConflictError, match="Insufficient inventory"):
+        await _place(memory_session, cart, supplier.id, "short-line")
+
+    assert await _stock(memory_session) == {plenty_id: 10, short_id: 2}
+    assert (await memory_session.execute(select(Order))).scalars().all() == []
+    assert (await memory_session.execute(select(IdempotencyKey))).scalars().all() == []
+    status = (await memory_session.execute(select(Cart.status).where(Cart.id == cart_id))).scalar_one()
+    assert status == CartStatus.OPEN
+
+
+@pytest.mark.asyncio
+async def test_lock_products_skips_deleted_rows(memory_session, make_supplier, make_products):
+    supplier = await make_supplier()
+    live, deleted = await make_products(supplier, count=2, stock_qty=5)
+    await memory_session.execute(
+        Product.__table__.update().where(Product.id == deleted.id).values(deleted_at=Product.created_at)
+    )
+    await memory_session.commit()
+
+    locked = await OrderRepository(memory_session)._lock_products([live.id, deleted.id])
+    assert locked == {live.id: (5, supplier.id)}
+
+
+@pytest.mark.asyncio
+async def test_postgres_locks_in_one_ordered_select_for_update():
+    session = _RecordingSession()
+    await OrderRepository(session)._lock_products([uuid4(), uuid4()])
+
+    [stmt] = session.statements
+    sql = _sql(stmt)
+    assert sql.startswith("SELECT products.id, products.stock_qty, products.supplier_id FROM products")
+    assert sql.endswith("ORDER BY products.id FOR UPDATE")
+
+
+@pytest.mark.asyncio
+async def test_postgres_decrement_is_one_update_from_values():
+    session = _RecordingSession()
+    quantities = {uuid4(): Decimal("2"), uuid4(): Decimal("1.5"), uuid4(): Decimal("4")}
+    await OrderRepository(session)._decrement_stock(quantities)
+
+    [stmt] = session.statements
+    sql = _sql(stmt)
+    assert sql.startswith("UPDATE products SET stock_qty=(products.stock_qty - lines.qty)")
+    assert "FROM (VALUES" in sql and ") AS lines (product_id, qty)" in sql
+    assert sql.endswith("WHERE products.id = lines.product_id")
+    # One VALUES row per product, in id order like the row locks
+    params = list(stmt.compile(dialect=postgresql.dialect()).params.values())
+    assert params == [part for line in sorted(quantities.items()) for part in line]
@@ -1,4 +1,26 @@
+from unittest.mock import patch
+from uuid import uuid4
+
 import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, select
+
+from app.api.v1 import orders as orders_api
+from app.core import idempotency
+from app.core.database import get_db
+from app.core.errors import AppError, app_error_handler
+from app.core.idempotency import IdempotentReplay, MemoryIdempotencyStore, idempotent_replay_handler
+from app.core.ownership import AuthzContext, load_authz_context
+from app.core.security import create_local_jwt, settings as security_settings
+from app.domain.carts.schemas import CartItemsBatch
+from app.domain.carts.service import CartService
+from app.domain.orders.models import Order
+from app.domain.orders.service import OrderService
+from app.domain.restaurants.models import RestaurantMember
+from app.domain.suppliers.models import SupplierMember
+from app.domain.users.models import User
 
 
 @pytest.mark.asyncio
@@ -9,4 +31,140 @@ async def test_list_orders_requires_auth(client):
     assert resp.status_code in (200, 401, 403)
 
 
+async def _member(session, role: str, restaurant_ids=(), supplier_ids=()) -> User:
+    """A user with the given memberships."""
+    tag = uuid4().hex[:8]
+    user = User(email=f"{tag}@example.com", clerk_user_id=f"local-{tag}", role=role)
+    session.add(user)
+    await session.flush()
+    session.add_all([RestaurantMember(user_id=user.id, restaurant_id=r) for r in restaurant_ids])
+    session.add_all([SupplierMember(user_id=user.id, supplier_id=s) for s in supplier_ids])
+    await session.commit()
+    return user
+
+
+def _auth(user: User, key: str = None) -> dict:
+    headers = {"Authorization": f"Bearer {create_local_jwt(user.email, user.role)}"}
+    if key:
+        headers["Idempotency-Key"] = key
+    return headers
+
+
+@pytest_asyncio.fixture
+async def orders_client(memory_sessions, monkeypatch):
+    """The orders router with its real auth and session dependencies on the in-memory database."""
+    monkeypatch.setattr(security_settings, "APP_SECRET", "test-secret-with-at-least-32-bytes!")
+    monkeypatch.setattr(idempotency, "idempotency_store", MemoryIdempotencyStore(max_entries=100))
+    app = FastAPI()
+    app.add_exception_handler(AppError, app_error_handler)
+    app.add_exception_handler(IdempotentReplay, idempotent_replay_handler)
+    app.include_router(orders_api.router, prefix="/orders")
+
+    async def memory_db():
+        async with memory_sessions() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = memory_db
+    with patch.object(orders_api, "dispatch_order_placed"):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as client:
+            yield client
+
+
+@pytest_asyncio.fixture
+async def cart_of_member(memory_session, make_supplier, make_products, make_cart):
+    """A restaurant member with an open cart holding products of two suppliers."""
+    restaurant_id = uuid4()
+    user = await _member(memory_session, "restaurant", restaurant_ids=[restaurant_id])
+    suppliers = [await make_supplier(), await make_supplier()]
+    products = [p for s in suppliers for p in await make_products(s, count=2, stock_qty=10)]
+    cart = await make_cart(restaurant_id)
+    owner = await load_authz_context(memory_session, user.id, user.role)
+    batch = CartItemsBatch.model_validate(
+        {"operations": [{"op": "add", "product_id": str(p.id), "qty": 2} for p in products]}
+    )
+    await CartService(memory_session).apply_item_batch(cart.id, batch.operations, owner)
+    await memory_session.commit()
+    return user, restaurant_id, suppliers, cart
+
+
+@pytest.mark.asyncio
+async def test_member_places_order_through_auth_dependencies(orders_client, cart_of_member):
+    user, restaurant_id, suppliers, cart = cart_of_member
+    body = {"cart_id": str(cart.id), "buyer_restaurant_id": str(restaurant_id), "supplier_id": str(suppliers[0].id)}
+    resp = await orders_client.post("/orders", json=body, headers=_auth(user, "place-1"))
+    assert resp.status_code == 201, resp.text
+    assert resp.json()["cart_id"] == str(cart.id)
+
+
+@pytest.mark.asyncio
+async def test_member_checks_out_through_auth_dependencies(orders_client, cart_of_member, memory_session):
+    user, restaurant_id, suppliers, cart = cart_of_member
+    body = {"cart_id": str(cart.id), "buyer_restaurant_id": str(restaurant_id)}
+    resp = await orders_client.post("/orders/checkout", json=body, headers=_auth(user, "checkout-1"))
+    assert resp.status_code == 201, resp.text
+    assert sorted(order["supplier_id"] for order in resp.json()["orders"]) == sorted(str(s.id) for s in suppliers)
+    assert len((await memory_session.execute(select(Order.id))).all()) == 2
+
+
+@pytest_asyncio.fixture
+async def placed_orders(memory_session):
+    """One order for each (restaurant, supplier) pair of two restaurants and two suppliers."""
+    restaurants, suppliers = [uuid4(), uuid4()], [uuid4(), uuid4()]
+    orders = {
+        (r, s): Order(
+            cart_id=uuid4(), buyer_restaurant_id=restaurant_id, supplier_id=supplier_id,
+            created_by_account_id=uuid4(), total_cents=1000, tax_cents=100,
+        )
+        for r, restaurant_id in enumerate(restaurants)
+        for s, supplier_id in enumerate(suppliers)
+    }
+    memory_session.add_all(orders.values())
+    await memory_session.commit()
+    return restaurants, suppliers, {pair: str(order.id) for pair, order in orders.items()}
+
+
+async def _listed(orders_client, user: User) -> tuple[set[str], int]:
+    resp = await orders_client.get("/orders", headers=_auth(user))
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    return {order["id"] for order in body["data"]}, body["total"]
+
+
+@pytest.mark.asyncio
+async def test_members_list_only_their_orders(orders_client, placed_orders, memory_session):
+    restaurants, suppliers, ids = placed_orders
+    buyer = await _member(memory_session, "restaurant", restaurant_ids=[restaurants[0]])
+    seller = await _member(memory_session, "supplier", supplier_ids=[suppliers[1]])
+    both = await _member(memory_session, "restaurant", restaurant_ids=[restaurants[0]], supplier_ids=[suppliers[1]])
 
+    assert await _listed(orders_client, buyer) == ({ids[0, 0], ids[0, 1]}, 2)
+    assert await _listed(orders_client, seller) == ({ids[0, 1], ids[1, 1]}, 2)
+    # An order matching both memberships is listed once
+    assert await _listed(orders_client, both) == ({ids[0, 0], ids[0, 1], ids[1, 1]}, 3)
+
+    # Explicit filters narrow within the member's orders, never widen past them
+    resp = await orders_client.get("/orders", params={"supplier_id": str(suppliers[0])}, headers=_auth(seller))
+    assert resp.json()["data"] == [] and resp.json()["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_user_without_memberships_gets_empty_page(orders_client, placed_orders, memory_session):
+    loner = await _member(memory_session, "restaurant")
+    assert await _listed(orders_client, loner) == (set(), 0)
+
+
+@pytest.mark.asyncio
+async def test_unresolved_user_lists_nothing_without_a_query(placed_orders, memory_session, memory_engine):
+    """user_id None is the _NO_ORDERS sentinel: an empty page, no membership query to fail."""
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    unresolved = AuthzContext(user_id=None, role="restaurant")
+    service = OrderService(memory_session)
+    event.listen(memory_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        assert await service.list_orders(authz=unresolved) == ([], 0, None)
+        assert await service.list_orders(authz=unresolved, include_total=False) == ([], None, None)
+        assert await service.list_orders_version(authz=unresolved) == (0, None)
+    finally:
+        event.remove(memory_engine.sync_engine, "before_cursor_execute", listener)
+    assert statements == []
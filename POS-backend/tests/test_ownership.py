@@ -0,0 +1,39 @@
+"""Test request-scoped authorization context."""
+import pytest
+from uuid import uuid4
+
+from app.core.ownership import AuthzContext, load_authz_context
+
+
+def test_members_own_only_their_organizations():
+    """Membership checks are answered from the loaded id sets."""
+    supplier_id, restaurant_id = uuid4(), uuid4()
+    authz = AuthzContext(
+        user_id=uuid4(),
+        role="SUPPLIER",
+        supplier_ids=frozenset({supplier_id}),
+        restaurant_ids=frozenset({restaurant_id}),
+    )
+
+    assert authz.owns_supplier(supplier_id)
+    assert authz.owns_restaurant(restaurant_id)
+    assert not authz.owns_supplier(uuid4())
+    assert not authz.owns_restaurant(uuid4())
+
+
+def test_admin_bypasses_ownership():
+    """Admins own every supplier and restaurant."""
+    authz = AuthzContext(user_id=uuid4(), role="ADMIN")
+
+    assert authz.is_admin
+    assert authz.owns_supplier(uuid4())
+    assert authz.owns_restaurant(uuid4())
+
+
+@pytest.mark.asyncio
+async def test_admin_context_skips_membership_query():
+    """Loading an admin context never touches the database."""
+    authz = await load_authz_context(session=None, user_id=uuid4(), user_role="ADMIN")
+
+    assert authz.is_admin
+    assert authz.supplier_ids == frozenset()
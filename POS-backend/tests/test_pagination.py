@@ -0,0 +1,41 @@
+"""Test keyset pagination cursors."""
+import pytest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.core.errors import ValidationError
+from app.core.pagination import decode_cursor, encode_cursor, split_page
+
+
+def test_cursor_round_trip():
+    """Cursor decodes back to the exact (created_at, id) position."""
+    created_at = datetime(2025, 11, 3, 10, 12, 44, 118202, tzinfo=timezone.utc)
+    row_id = uuid4()
+
+    cursor = encode_cursor(created_at, row_id)
+
+    assert "|" not in cursor
+    assert decode_cursor(cursor) == (created_at, row_id)
+
+
+def test_invalid_cursor_rejected():
+    """Malformed cursors raise a 422 validation error."""
+    with pytest.raises(ValidationError):
+        decode_cursor("not-a-cursor")
+
+
+def test_split_page_emits_next_cursor_only_with_lookahead_row():
+    """Only a page with the extra look-ahead row gets a next cursor."""
+    rows = [
+        SimpleNamespace(created_at=datetime(2025, 1, 1, tzinfo=timezone.utc), id=uuid4())
+        for _ in range(3)
+    ]
+
+    items, next_cursor = split_page(rows, limit=2)
+    assert items == rows[:2]
+    assert decode_cursor(next_cursor) == (rows[1].created_at, rows[1].id)
+
+    items, next_cursor = split_page(rows, limit=3)
+    assert items == rows
+    assert next_cursor is None
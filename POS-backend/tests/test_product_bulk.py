@@ -0,0 +1,150 @@
+"""Test bulk product import parsing and the chunked upsert."""
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from app.core.errors import ValidationError
+from app.core.ownership import AuthzContext
+from app.domain.products.bulk import CSV, JSONL, ProductBulkImporter, RowError, iter_records
+from app.domain.products.models import Product
+from app.domain.products.repository import ProductRepository
+
+
+async def _chunks(body: bytes, size: int = 7):
+    # Small chunks so lines and quoted fields straddle chunk boundaries
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+async def _records(body: bytes, fmt: str) -> list:
+    return [record async for record in iter_records(_chunks(body), fmt)]
+
+
+@pytest.mark.asyncio
+async def test_jsonl_records_skip_blank_lines_and_report_bad_ones():
+    body = b'{"sku": "A-1"}\n\n[1, 2]\n{"sku": \n{"sku": "A-2"}'
+    records = await _records(body, JSONL)
+    assert [line for line, _ in records] == [1, 3, 4, 5]
+    assert records[0][1] == {"sku": "A-1"}
+    assert isinstance(records[1][1], RowError)
+    assert isinstance(records[2][1], RowError)
+    assert records[3][1] == {"sku": "A-2"}
+
+
+@pytest.mark.asyncio
+async def test_csv_records_handle_quoted_newlines_and_empty_fields():
+    body = b'\xef\xbb\xbfsku,name,stock_qty\r\nA-1,"Olive oil, ""extra""\nvirgin",\r\n\r\nA-2,Salt\nA-3,"open'
+    records = await _records(body, CSV)
+    assert records[0] == (2, {"sku": "A-1", "name": 'Olive oil, "extra"\nvirgin'})
+    assert records[1][0] == 5
+    assert str(records[1][1]) == "Expected 3 fields, got 2"
+    assert records[2][0] == 6
+    assert str(records[2][1]) == "Unterminated quoted field"
+
+
+async def _import(session, authz, records, supplier_id=None, batch_size=2, max_rows=100):
+    importer = ProductBulkImporter(
+        ProductRepository(session),
+        authz,
+        batch_size=batch_size,
+        max_rows=max_rows,
+        max_errors=10,
+        default_supplier_id=supplier_id,
+    )
+
+    async def numbered():
+        for line, record in enumerate(records, start=1):
+            yield line, record
+
+    return (await importer.run(numbered())).as_dict()
+
+
+def _row(sku: str, **overrides) -> dict:
+    return {"sku": sku, "name": f"Product {sku}", "unit": "kg", "price_cents": 100, "tax_rate": 12, **overrides}
+
+
+@pytest.mark.asyncio
+async def test_import_inserts_then_updates_by_sku(memory_session, make_supplier):
+    session = memory_session
+    supplier = await make_supplier()
+    authz = AuthzContext(user_id=uuid4(), role="supplier", supplier_ids=frozenset({supplier.id}))
+
+    report = await _import(session, authz, [_row("B-1"), _row("B-2"), _row("B-3")], supplier.id)
+    assert (report["inserted"], report["updated"], report["failed"]) == (3, 0, 0)
+
+    report = await _import(session, authz, [_row("B-1", price_cents=250), _row("B-4")], supplier.id)
+    assert (report["inserted"], report["updated"], report["failed"]) == (1, 1, 0)
+
+    prices = dict((await session.execute(select(Product.sku, Product.price_cents))).all())
+    assert prices == {"B-1": 250, "B-2": 100, "B-3": 100, "B-4": 100}
+
+
+@pytest.mark.asyncio
+async def test_reimport_keeps_omitted_columns(memory_session, make_supplier):
+    session = memory_session
+    supplier = await make_supplier()
+    authz = AuthzContext(user_id=uuid4(), role="supplier", supplier_ids=frozenset({supplier.id}))
+    await _import(
+        session, authz,
+        [_row("E-1", stock_qty=40, availability_status="limited", active=False), _row("E-2", stock_qty=7)],
+        supplier.id,
+    )
+
+    # A price-only feed: no stock, status or active columns. E-3 is new and takes the defaults.
+    report = await _import(
+        session, authz, [_row("E-1", price_cents=300), _row("E-2", stock_qty=9), _row("E-3")], supplier.id
+    )
+    assert (report["inserted"], report["updated"], report["failed"]) == (1, 2, 0)
+
+    rows = (await session.execute(
+        select(Product.sku, Product.price_cents, Product.stock_qty, Product.availability_status, Product.active)
+        .order_by(Product.sku)
+    )).all()
+    assert [tuple(row) for row in rows] == [
+        ("E-1", 300, 40, "limited", False),
+        ("E-2", 100, 9, "available", True),
+        ("E-3", 100, 0, "available", True),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_import_reports_rejected_rows(memory_session, make_supplier):
+    session = memory_session
+    mine = await make_supplier()
+    other = await make_supplier()
+    admin = AuthzContext(user_id=None, role="admin")
+    await _import(session, admin, [_row("TAKEN")], other.id)
+
+    authz = AuthzContext(user_id=uuid4(), role="supplier", supplier_ids=frozenset({mine.id}))
+    report = await _import(
+        session,
+        authz,
+        [
+            _row("C-1"),
+            _row("C-1"),
+            _row("TAKEN"),
+            _row("C-2", price_cents=-1),
+            _row("C-3", supplier_id=str(other.id)),
+            RowError("Invalid JSON"),
+        ],
+        mine.id,
+    )
+    assert (report["received"], report["inserted"], report["failed"]) == (6, 1, 5)
+    errors = {error["line"]: error for error in report["errors"]}
+    assert errors[2]["error"] == "Duplicate SKU in upload (first on line 1)"
+    assert errors[3]["error"] == "SKU belongs to another supplier"
+    assert errors[4]["sku"] == "C-2" and "price_cents" in errors[4]["error"]
+    assert errors[5]["error"] == "Forbidden: not owner of supplier"
+    assert errors[6] == {"line": 6, "sku": None, "error": "Invalid JSON"}
+
+    owner = (await session.execute(select(Product.supplier_id).where(Product.sku == "TAKEN"))).scalar_one()
+    assert owner == other.id
+
+
+@pytest.mark.asyncio
+async def test_import_row_limit(memory_session, make_supplier):
+    supplier = await make_supplier()
+    with pytest.raises(ValidationError):
+        await _import(memory_session, AuthzContext(user_id=None, role="admin"), [_row("D-1"), _row("D-2")],
+                      supplier.id, max_rows=1)
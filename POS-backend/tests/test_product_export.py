@@ -0,0 +1,77 @@
+"""Test the streamed catalog export."""
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import orjson
+import pytest
+import pytest_asyncio
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.domain.products.bulk import CSV as IMPORT_CSV, iter_records
+from app.domain.products.export import CSV, NDJSON
+from app.domain.products.models import Product
+from app.domain.products.repository import PRODUCT_ROWS
+from app.domain.products.service import ProductService
+
+BASE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest_asyncio.fixture
+async def session(memory_session, make_supplier):
+    supplier = await make_supplier()
+    for i in range(5):
+        memory_session.add(Product(
+            supplier_id=supplier.id, name=f'Product {i}, "quoted"', sku=f"EXP-{i}", unit="kg",
+            price_cents=100 + i, tax_rate=12.5, stock_qty=i, active=i != 4,
+        ))
+    await memory_session.commit()
+    # Distinct, known update times: EXP-0 oldest ... EXP-4 newest
+    for i in range(5):
+        await memory_session.execute(
+            update(Product).where(Product.sku == f"EXP-{i}").values(updated_at=BASE_TIME + timedelta(hours=i))
+        )
+    await memory_session.commit()
+    return memory_session
+
+
+async def _export(session, fmt: str, **filters) -> list[bytes]:
+    return [chunk async for chunk in ProductService(session).export_products(fmt=fmt, **filters)]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_export_streams_batches_in_update_order(session, monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+    chunks = await _export(session, NDJSON)
+    assert len(chunks) == 3
+    rows = [orjson.loads(line) for line in b"".join(chunks).splitlines()]
+    assert [row["sku"] for row in rows] == [f"EXP-{i}" for i in range(5)]
+    assert set(rows[0]) == set(PRODUCT_ROWS.fields)
+    assert rows[0]["tax_rate"] == 12.5
+    assert rows[0]["updated_at"] == "2025-01-01T00:00:00Z"
+
+
+@pytest.mark.asyncio
+async def test_export_filters(session):
+    since = BASE_TIME + timedelta(hours=2)
+    rows = [orjson.loads(line) for line in b"".join(await _export(session, NDJSON, updated_since=since)).splitlines()]
+    assert [row["sku"] for row in rows] == ["EXP-2", "EXP-3", "EXP-4"]
+
+    rows = [orjson.loads(line) for line in b"".join(await _export(session, NDJSON, active=True)).splitlines()]
+    assert len(rows) == 4
+
+    assert await _export(session, NDJSON, supplier_id=uuid4()) == []
+
+
+@pytest.mark.asyncio
+async def test_csv_export_reimports(session):
+    body = b"".join(await _export(session, CSV))
+    assert body.splitlines()[0].decode() == ",".join(PRODUCT_ROWS.fields)
+
+    async def chunks():
+        yield body
+
+    records = [record async for _, record in iter_records(chunks(), IMPORT_CSV)]
+    assert [record["sku"] for record in records] == [f"EXP-{i}" for i in range(5)]
+    assert records[0]["name"] == 'Product 0, "quoted"'
+    assert records[0]["updated_at"] == "2025-01-01T00:00:00Z"
@@ -0,0 +1,46 @@
+"""Test product search query building (tsvector prefix + trigram + ranking)."""
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.domain.products.models import Product
+from app.domain.products.search import normalize_query, prefix_tsquery, search_condition, search_rank
+
+
+def _sql(clause) -> str:
+    return str(select(Product.id).where(clause).compile(dialect=postgresql.dialect()))
+
+
+def test_prefix_tsquery_matches_every_word_as_prefix():
+    assert prefix_tsquery("Olive  Oi") == "olive:* & oi:*"
+    assert prefix_tsquery("SKU-0042") == "sku:* & 0042:*"
+
+
+def test_prefix_tsquery_strips_operators():
+    """tsquery syntax in user input is dropped rather than interpreted."""
+    assert prefix_tsquery("milk | !cream & (x):*") == "milk:* & cream:* & x:*"
+    assert prefix_tsquery("!&|()") is None
+
+
+def test_normalize_query_collapses_whitespace():
+    assert normalize_query("  olive   oil ") == "olive oil"
+
+
+def test_condition_uses_both_indexes():
+    sql = _sql(search_condition("chick"))
+    assert "search_vector @@ to_tsquery" in sql
+    assert "(name || ' ' || sku) %%" in sql
+
+
+def test_condition_without_words_falls_back_to_trigram():
+    sql = _sql(search_condition("--"))
+    assert "search_vector" not in sql
+    assert "(name || ' ' || sku) %%" in sql
+
+
+def test_rank_combines_text_rank_similarity_and_name_prefix():
+    compiled = select(search_rank("Chick").label("rank")).compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+    assert "ts_rank(search_vector" in sql
+    assert "similarity((name || ' ' || sku)" in sql
+    assert "lower(products.name) LIKE" in sql
+    assert compiled.params["lower_1"] == "chick"
@@ -0,0 +1,80 @@
+"""Test the in-process product autocomplete index."""
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.domain.products.suggest import SuggestIndex
+
+SUPPLIER_A = uuid4()
+SUPPLIER_B = uuid4()
+
+
+def _product(name: str, sku: str, supplier_id=SUPPLIER_A, active: bool = True):
+    return SimpleNamespace(id=uuid4(), name=name, sku=sku, supplier_id=supplier_id, active=active, deleted_at=None)
+
+
+def _index(*products) -> SuggestIndex:
+    index = SuggestIndex()
+    index.load(products)
+    return index
+
+
+def _names(results) -> list[str]:
+    return sorted(result["name"] for result in results)
+
+
+def test_prefix_matches_any_name_word():
+    index = _index(
+        _product("Organic Chicken Breast", "CH-1"),
+        _product("Chickpeas", "CP-1"),
+        _product("Olive Oil", "OL-1"),
+    )
+    assert _names(index.suggest("chi", limit=10)) == ["Chickpeas", "Organic Chicken Breast"]
+    assert _names(index.suggest("BREA", limit=10)) == ["Organic Chicken Breast"]
+    assert index.suggest("zzz", limit=10) == []
+    assert index.suggest("  ", limit=10) == []
+
+
+def test_every_word_must_match():
+    index = _index(_product("Smoked Salmon", "S-1"), _product("Smoked Ham", "S-2"), _product("Salmon Roe", "S-3"))
+    assert _names(index.suggest("smo sal", limit=10)) == ["Smoked Salmon"]
+
+
+def test_sku_prefix_with_punctuation():
+    index = _index(_product("Tomatoes", "TOM-0042"), _product("Tomato Paste", "TOM-0100"))
+    assert _names(index.suggest("tom-0", limit=10)) == ["Tomato Paste", "Tomatoes"]
+    assert _names(index.suggest("TOM-004", limit=10)) == ["Tomatoes"]
+
+
+def test_limit_and_supplier_filter():
+    index = _index(*[_product(f"Cheese {i}", f"C-{i}", SUPPLIER_A if i % 2 else SUPPLIER_B) for i in range(10)])
+    assert len(index.suggest("chee", limit=3)) == 3
+    results = index.suggest("chee", limit=10, supplier_id=SUPPLIER_B)
+    assert len(results) == 5
+    assert {result["supplier_id"] for result in results} == {SUPPLIER_B}
+
+
+def test_incremental_updates():
+    butter = _product("Butter", "B-1")
+    index = _index(butter)
+
+    butter.name = "Salted Butter"
+    index.upsert(butter)
+    assert _names(index.suggest("salt", limit=10)) == ["Salted Butter"]
+    assert len(index.suggest("butt", limit=10)) == 1
+
+    cream = _product("Cream", "CR-1")
+    index.upsert(cream)
+    assert _names(index.suggest("cre", limit=10)) == ["Cream"]
+
+    butter.active = False
+    index.upsert(butter)
+    index.remove(cream.id)
+    assert index.suggest("butt", limit=10) == []
+    assert index.suggest("cre", limit=10) == []
+    assert len(index) == 0
+
+
+def test_updates_before_first_build_are_ignored():
+    index = SuggestIndex()
+    index.upsert(_product("Milk", "M-1"))
+    assert len(index) == 0
@@ -0,0 +1,43 @@
+"""Test that projected list rows serialize exactly like the response schemas."""
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+from app.core.projection import RowProjection
+from app.core.responses import ORJSONResponse
+from app.domain.products.models import Product
+from app.domain.products.schemas import ProductResponse
+
+
+def test_projected_row_matches_pydantic_json():
+    """A Numeric/UTC row serializes to the same JSON as ProductResponse."""
+    projection = RowProjection(Product, ProductResponse)
+    now = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    values = {
+        "id": uuid4(),
+        "supplier_id": uuid4(),
+        "name": "Tomatoes",
+        "sku": "TOM-1",
+        "unit": "kg",
+        "price_cents": 1250,
+        "tax_rate": Decimal("12.00"),
+        "stock_qty": 7,
+        "availability_status": "available",
+        "active": True,
+        "created_at": now,
+        "updated_at": now,
+    }
+    row = tuple(values[name] for name in projection.fields)
+
+    projected = json.loads(ORJSONResponse(projection.to_dicts([row])).body)
+    expected = json.loads(ProductResponse(**values).model_dump_json())
+
+    assert projected == [expected]
+
+
+def test_projection_selects_response_columns():
+    """Only the response schema's columns are selected, in schema order."""
+    projection = RowProjection(Product, ProductResponse)
+
+    assert [column.key for column in projection.columns] == list(ProductResponse.model_fields)
@@ -0,0 +1,148 @@
+"""Statement budgets per endpoint, guarding against N+1 and implicit eager loads.
+
+Runs against the in-memory schema (memory_client), not the configured database.
+Budgets are measured over seeded rows whose related rows (cart items, orders,
+members) grow with the catalog, so a loader that follows them shows up as
+extra statements.
+"""
+from uuid import uuid4
+
+import pytest
+
+from app.core import security
+from app.core.cache import MemoryCacheBackend
+from app.core.security import create_local_jwt
+from app.domain.carts.models import CartItem, CartStatus
+from app.domain.orders.models import Order
+from app.domain.products import service as product_service
+from app.domain.products.cache import CatalogCache
+from app.domain.restaurants.models import Restaurant, RestaurantMember
+from app.domain.suppliers.models import SupplierMember
+from app.domain.users.models import User
+
+
+# (path, max statements); update deliberately when an endpoint needs more.
+# Authenticated paths spend 2 statements on the caller: user lookup + memberships.
+QUERY_BUDGETS = [
+    ("/api/v1/products", 2),  # version (count + max(updated_at), doubling as the total) + page
+    ("/api/v1/products?include_total=false", 1),  # page only: no total, no If-None-Match
+    ("/api/v1/suppliers?include_total=false", 1),
+    ("/api/v1/restaurants?include_total=false", 1),
+    ("/api/v1/products/{product}", 1),
+    ("/api/v1/suppliers", 2),
+    ("/api/v1/suppliers/{supplier}", 1),
+    ("/api/v1/restaurants", 2),
+    ("/api/v1/restaurants/{restaurant}", 1),
+    ("/api/v1/carts/{cart}", 3),  # caller + cart
+    ("/api/v1/orders", 4),  # caller + version + page
+    ("/api/v1/orders?include_total=false", 3),
+    ("/api/v1/orders/{order}", 3),  # caller + order
+]
+
+
+@pytest.fixture
+def seed(monkeypatch, memory_session, make_supplier, make_products, make_cart):
+    """
+    Factory for a supplier with `rows` products, and a restaurant with `rows`
+    members and `rows` carts, each cart holding every product and placing one
+    order. Returns the ids to budget against and a member's auth headers.
+    """
+    monkeypatch.setattr(security.settings, "APP_SECRET", "test-secret-with-at-least-32-bytes!")
+    # Measure the database path, not the process-wide catalog cache
+    monkeypatch.setattr(product_service, "catalog_cache", CatalogCache(MemoryCacheBackend(1, 0), ttl_seconds=0))
+    security.user_cache.clear()
+    security.token_cache.clear()
+
+    async def make(rows: int) -> tuple[dict, dict]:
+        supplier = await make_supplier()
+        products = await make_products(supplier, count=rows)
+        restaurant = Restaurant(name=f"Restaurant {uuid4().hex[:8]}", contact_email="kitchen@example.com")
+        memory_session.add(restaurant)
+        await memory_session.commit()
+
+        users = [User(email=f"{uuid4().hex[:8]}@example.com", clerk_user_id=f"local-{uuid4().hex}") for _ in range(rows)]
+        memory_session.add_all(users)
+        await memory_session.flush()
+        memory_session.add_all([RestaurantMember(user_id=u.id, restaurant_id=restaurant.id) for u in users])
+        memory_session.add_all([SupplierMember(user_id=u.id, supplier_id=supplier.id) for u in users])
+        await memory_session.commit()
+
+        carts = [await make_cart(restaurant.id) for _ in range(rows)]
+        memory_session.add_all([
+            CartItem(cart_id=cart.id, product_id=p.id, qty=1, unit_price_cents=p.price_cents, tax_rate=p.tax_rate)
+            for cart in carts
+            for p in products
+        ])
+        orders = [
+            Order(
+                cart_id=cart.id, buyer_restaurant_id=restaurant.id, supplier_id=supplier.id,
+                created_by_account_id=users[0].id, total_cents=1000, tax_cents=100,
+            )
+            for cart in carts
+        ]
+        memory_session.add_all(orders)
+        for cart in carts[1:]:
+            cart.status = CartStatus.CONVERTED
+        await memory_session.commit()
+
+        ids = {
+            "product": products[0].id,
+            "supplier": supplier.id,
+            "restaurant": restaurant.id,
+            "cart": carts[0].id,
+            "order": orders[0].id,
+        }
+        headers = {"Authorization": f"Bearer {create_local_jwt(users[0].email, users[0].role)}"}
+        return ids, headers
+
+    return make
+
+
+async def _count(memory_client, count_queries, path: str, headers: dict) -> int:
+    count_queries.statements.clear()
+    resp = await memory_client.get(path, headers=headers)
+    assert resp.status_code == 200, resp.text
+    return count_queries.count
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path,budget", QUERY_BUDGETS)
+async def test_endpoint_query_budget(memory_client, count_queries, seed, path, budget):
+    """Each endpoint stays within its budget, and its count does not grow with related rows."""
+    few_ids, few_headers = await seed(rows=1)
+    many_ids, many_headers = await seed(rows=6)
+
+    few = await _count(memory_client, count_queries, path.format(**few_ids), few_headers)
+    many = await _count(memory_client, count_queries, path.format(**many_ids), many_headers)
+    assert many <= budget, "\n\n".join(count_queries.statements)
+    assert many == few, "\n\n".join(count_queries.statements)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/api/v1/products", "/api/v1/suppliers", "/api/v1/restaurants"])
+async def test_not_modified_list_skips_page_query(memory_client, count_queries, path):
+    """A matching If-None-Match is answered from the version query alone."""
+    first = await memory_client.get(path)
+    assert first.status_code == 200
+    count_queries.statements.clear()
+
+    resp = await memory_client.get(path, headers={"If-None-Match": first.headers["ETag"]})
+    assert resp.status_code == 304
+    assert resp.headers["ETag"] == first.headers["ETag"]
+    assert count_queries.count <= 1, "\n\n".join(count_queries.statements)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/api/v1/products", "/api/v1/suppliers", "/api/v1/restaurants"])
+async def test_unconditional_list_without_total_skips_version_query(memory_client, count_queries, path):
+    """Without If-None-Match or a total to report, the version aggregate is not run."""
+    resp = await memory_client.get(path, params={"include_total": "false"})
+    assert resp.status_code == 200
+    assert resp.json()["total"] is None
+    assert "etag" not in resp.headers
+    assert count_queries.count <= 1, "\n\n".join(count_queries.statements)
+
+    # A conditional request versions the set even without a total
+    resp = await memory_client.get(path, params={"include_total": "false"}, headers={"If-None-Match": '"stale"'})
+    assert resp.status_code == 200
+    assert "etag" in resp.headers
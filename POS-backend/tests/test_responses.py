@@ -0,0 +1,51 @@
+"""Test the orjson / precompiled-serializer response classes."""
+import json
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from app.api.v1 import orders, products, restaurants, suppliers
+from app.core.responses import ModelJSONResponse, ORJSONResponse
+from app.domain.orders.schemas import OrderListResponse, OrderResponse
+
+
+def _openapi(default_response_class) -> dict:
+    app = FastAPI(default_response_class=default_response_class)
+    app.include_router(products.router, prefix="/api/v1/products")
+    app.include_router(suppliers.router, prefix="/api/v1/suppliers")
+    app.include_router(restaurants.router, prefix="/api/v1/restaurants")
+    app.include_router(orders.router, prefix="/api/v1/orders")
+    return app.openapi()
+
+
+def test_openapi_schema_unchanged_by_orjson_default():
+    """Switching the default response class does not alter the OpenAPI document."""
+    assert _openapi(ORJSONResponse) == _openapi(JSONResponse)
+
+
+def test_model_json_response_matches_pydantic_json():
+    """The precompiled serializer emits the same JSON as model_dump_json."""
+    now = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+    order = OrderResponse(
+        id=uuid4(),
+        cart_id=uuid4(),
+        buyer_restaurant_id=uuid4(),
+        supplier_id=uuid4(),
+        created_by_account_id=uuid4(),
+        status="placed",
+        total_cents=1000,
+        tax_cents=120,
+        payment_method="invoice",
+        paid_at=None,
+        delivered_at=now,
+        created_at=now,
+        updated_at=now,
+    )
+    body = OrderListResponse(data=[order], total=1, limit=50, offset=0)
+
+    response = ModelJSONResponse(body)
+
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == json.loads(body.model_dump_json())
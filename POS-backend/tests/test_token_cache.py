@@ -0,0 +1,115 @@
+"""Test verified-claims caching for local JWT validation and Clerk claim checks."""
+import jwt as pyjwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+
+from app.core import security
+
+
+@pytest.fixture
+def local_secret(monkeypatch):
+    monkeypatch.setattr(security.settings, "APP_SECRET", "test-secret-with-at-least-32-bytes!")
+    security.token_cache.clear()
+    yield "test-secret-with-at-least-32-bytes!"
+    security.token_cache.clear()
+
+
+def test_local_jwt_claims_cached_until_exp(local_secret, monkeypatch):
+    """A verified token is served from the cache without re-checking the signature."""
+    token = security.create_local_jwt("chef@example.com", "restaurant")
+    calls = []
+    real_decode = security.jwt.decode
+    monkeypatch.setattr(security.jwt, "decode", lambda *a, **kw: calls.append(1) or real_decode(*a, **kw))
+
+    first = security.validate_local_jwt(token)
+    first["authz"] = "request-specific"
+    second = security.validate_local_jwt(token)
+
+    assert len(calls) == 1
+    assert second["email"] == "chef@example.com"
+    assert "authz" not in second
+
+
+def test_invalid_local_jwt_not_cached(local_secret):
+    """Tokens failing verification are rejected every time."""
+    token = pyjwt.encode(
+        {"sub": "x@example.com", "exp": datetime.utcnow() + timedelta(minutes=5)},
+        "wrong-secret-with-at-least-32-bytes",
+        algorithm="HS256",
+    )
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc:
+            security.validate_local_jwt(token)
+        assert exc.value.status_code == 401
+    assert len(security.token_cache) == 0
+
+
+CLERK_ISSUER = "https://clerk.example.com"
+APP_ORIGIN = "https://app.example.com"
+
+
+@pytest.fixture
+def clerk_key(monkeypatch):
+    """A Clerk setup whose JWKS serves one RSA key; yields the private half for signing."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    async def get_key(kid):
+        return key.public_key() if kid == "clerk-kid" else None
+
+    monkeypatch.setattr(security.settings, "CLERK_API_KEY", "sk_test")
+    monkeypatch.setattr(security.settings, "CLERK_ISSUER", CLERK_ISSUER)
+    monkeypatch.setattr(security.settings, "CLERK_AUTHORIZED_PARTIES", f"{APP_ORIGIN}, https://admin.example.com")
+    monkeypatch.setattr(security.clerk_jwks, "get_key", get_key)
+    security.token_cache.clear()
+    yield key
+    security.token_cache.clear()
+
+
+def _clerk_token(key, **claims) -> str:
+    claims = {
+        "sub": "user_123",
+        "iss": CLERK_ISSUER,
+        "azp": APP_ORIGIN,
+        "exp": datetime.utcnow() + timedelta(minutes=5),
+        **claims,
+    }
+    claims = {name: value for name, value in claims.items() if value is not None}
+    return pyjwt.encode(claims, key, algorithm="RS256", headers={"kid": "clerk-kid"})
+
+
+@pytest.mark.asyncio
+async def test_clerk_jwt_accepted_for_issuer_and_authorized_party(clerk_key):
+    claims = await security.validate_clerk_jwt(_clerk_token(clerk_key))
+    assert (claims["sub"], claims["azp"]) == ("user_123", APP_ORIGIN)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("claims", [
+    {"iss": "https://attacker.example.com"},
+    {"iss": None},
+    {"azp": "https://attacker.example.com"},
+    {"azp": None},
+])
+async def test_clerk_jwt_rejects_wrong_issuer_or_party(clerk_key, claims):
+    with pytest.raises(HTTPException) as exc:
+        await security.validate_clerk_jwt(_clerk_token(clerk_key, **claims))
+    assert exc.value.status_code == 401
+    assert len(security.token_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_clerk_azp_check_skipped_without_authorized_parties(clerk_key, monkeypatch):
+    monkeypatch.setattr(security.settings, "CLERK_AUTHORIZED_PARTIES", "")
+    claims = await security.validate_clerk_jwt(_clerk_token(clerk_key, azp=None))
+    assert "azp" not in claims
+
+
+@pytest.mark.asyncio
+async def test_clerk_requires_configured_issuer(clerk_key, monkeypatch):
+    monkeypatch.setattr(security.settings, "CLERK_ISSUER", None)
+    with pytest.raises(HTTPException) as exc:
+        await security.validate_clerk_jwt(_clerk_token(clerk_key))
+    assert exc.value.status_code == 503
@@ -56,3 +56,15 @@ def test_ocr_task_discoverable():
     
     assert extract_invoice_lines is not None
 
+
+
+def test_maintenance_tasks_discoverable():
+    """Verify maintenance tasks are discoverable and scheduled."""
+    from app.workers.maintenance import abandon_stale_carts, purge_expired_idempotency_keys
+    
+    assert purge_expired_idempotency_keys.name in {
+        entry["task"] for entry in celery_app.conf.beat_schedule.values()
+    }
+    assert abandon_stale_carts.name in {
+        entry["task"] for entry in celery_app.conf.beat_schedule.values()
+    }